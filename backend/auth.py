@@ -1,36 +1,84 @@
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import HTTPException, status, Depends
+import hashlib
+import time
+from fastapi import HTTPException, Request, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from .database import get_db
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.ext.asyncio import AsyncSession
+from .database import get_db, get_async_db
 from .models import User
+from .cache import ResponseCache, MemoryCacheBackend
+from .hashing import get_pwd_context
 import os
 
 # 配置
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
-
-# 密码加密
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 已解码令牌和用户身份的缓存时间（秒），设为 0 关闭缓存
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
 
 # JWT Bearer
 security = HTTPBearer()
 
+# 令牌与用户身份缓存，条目按 "user:<id>" 打标签，用户被修改或删除时失效
+auth_cache = ResponseCache(
+    "auth",
+    AUTH_CACHE_TTL,
+    MemoryCacheBackend(AUTH_CACHE_MAX_ENTRIES, 16 * 1024 * 1024),
+)
+
+@dataclass(frozen=True)
+class Principal:
+    """已认证用户的身份信息（不持有数据库会话）"""
+    id: int
+    username: str
+    is_admin: bool
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            is_admin=bool(user.is_admin),
+            is_active=user.is_active is not False
+        )
+
+def invalidate_user(user_id: int):
+    """让某个用户的令牌和身份缓存失效"""
+    auth_cache.invalidate([f"user:{user_id}"])
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _on_user_changed(mapper, connection, target):
+    # 立即失效一次，提交后再失效一次，避免提交前被并发请求重新缓存旧数据
+    invalidate_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_user(user_id)
+
 def verify_password(plain_password, hashed_password):
     """验证密码"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     """获取密码哈希"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """创建访问令牌"""
+    from jose import jwt  # jose 连同 cryptography 导入约 100 ms，推迟到第一次签发或校验令牌时
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -47,29 +95,79 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
         detail="无效的认证凭据",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        return username
-    except JWTError:
+    token = credentials.credentials
+    
+    def decode():
+        from jose import JWTError, jwt
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            return None
+        if payload.get("sub") is None:
+            return None
+        return {"sub": payload["sub"], "uid": payload.get("uid"), "exp": payload.get("exp")}
+    
+    # 缓存键使用令牌的摘要，不在内存中保存原始令牌
+    key = "token:" + hashlib.sha256(token.encode()).hexdigest()
+    payload = auth_cache.get_or_set(key, decode, lambda p: [f"user:{p['uid'] or p['sub']}"])
+    if payload is None or (payload["exp"] is not None and payload["exp"] < time.time()):
         raise credentials_exception
+    return payload
 
 def get_current_user(
-    username: str = Depends(verify_token),
+    request: Request,
+    payload: dict = Depends(verify_token),
     db: Session = Depends(get_db)
-):
-    """获取当前用户"""
-    user = db.query(User).filter(User.username == username).first()
-    if user is None:
+) -> Principal:
+    """获取当前用户：令牌带 uid 时按主键查询，结果缓存为 Principal"""
+    principal = _check_principal(_lookup_principal(payload, db))
+    _remember_principal(request, principal)
+    return principal
+
+async def get_current_user_async(
+    request: Request,
+    payload: dict = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """get_current_user 的异步会话版本（DB_MODE=async）；缓存命中时不会占用连接"""
+    principal = _check_principal(await db.run_sync(lambda session: _lookup_principal(payload, session)))
+    _remember_principal(request, principal)
+    return principal
+
+def _remember_principal(request: Request, principal: Principal):
+    """记在请求的 state 上：本请求的读会话（get_read_db）和写会话都据此按用户维持写后读主库"""
+    request.state.user_id = principal.id
+    request.state.is_admin = principal.is_admin
+
+def _lookup_principal(payload: dict, db: Session) -> Optional[Principal]:
+    user_id = payload.get("uid")
+    if user_id is None:
+        # 兼容不带 uid 的旧令牌
+        return _load_principal(db, User.username == payload["sub"])
+    return auth_cache.get_or_set(
+        f"principal:{user_id}",
+        lambda: _load_principal(db, User.id == user_id),
+        lambda p: [f"user:{p.id}"]
+    )
+
+def _check_principal(principal: Optional[Principal]) -> Principal:
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="用户不存在"
         )
-    return user
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="用户已被禁用"
+        )
+    return principal
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)):
+def _load_principal(db: Session, criterion) -> Optional[Principal]:
+    user = db.query(User).filter(criterion).first()
+    return Principal.from_user(user) if user else None
+
+def get_current_admin_user(current_user: Principal = Depends(get_current_user)):
     """获取当前管理员用户"""
     if not current_user.is_admin:
         raise HTTPException(
@@ -86,3 +184,7 @@ def authenticate_user(db: Session, username: str, password: str):
     if not verify_password(password, user.hashed_password):
         return False
     return user
+
+def get_current_admin_user_async(current_user: Principal = Depends(get_current_user_async)):
+    """获取当前管理员用户（DB_MODE=async）"""
+    return get_current_admin_user(current_user)
@@ -0,0 +1 @@
+# 空文件，用于将 benchmarks 目录标记为 Python 包
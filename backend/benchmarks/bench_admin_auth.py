@@ -0,0 +1,47 @@
+
+"""
+管理接口认证开销基准测试：对比关闭 / 开启令牌与身份缓存时的单请求延迟
+
+用法：python -m backend.benchmarks.bench_admin_auth [-n 2000]
+"""
+import argparse
+
+from .common import AsgiClient, measure, prepare_database
+
+prepare_database()
+
+from ..auth import auth_cache  # noqa: E402
+from ..main import app  # noqa: E402
+from ..migrations import run_migrations  # noqa: E402
+
+ENDPOINTS = ["/api/admin/stats", "/api/admin/users", "/api/admin/cache"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="管理接口认证开销基准测试")
+    parser.add_argument("-n", type=int, default=2000, help="每个接口的请求次数")
+    args = parser.parse_args()
+
+    run_migrations()
+    client = AsgiClient(app)
+    credentials = {"username": "bench_admin", "email": "bench_admin@example.com", "password": "bench-password"}
+    client.request("POST", "/api/auth/register", json_body=credentials)
+    token = client.json("POST", "/api/auth/login", json_body=credentials)["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    ttl = auth_cache.ttl
+    results = {}
+    for label, cache_ttl in (("无缓存", 0), ("有缓存", ttl or 60)):
+        auth_cache.ttl = cache_ttl
+        auth_cache.clear()
+        for path in ENDPOINTS:
+            results[(path, label)] = measure(lambda: client.request("GET", path, headers=headers), args.n)
+    auth_cache.ttl = ttl
+
+    print(f"{'接口':<22}{'模式':<8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)")
+    for (path, label), stats in results.items():
+        print(f"{path:<22}{label:<8}{stats['mean_ms']:>10}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+JSON 序列化基准测试：对比 response_model 校验 + 标准 JSON 编码（当前路径）与按字段转字典 + orjson（快速路径）
+
+- 序列化：100 篇文章的列表，单独测量两种路径的 CPU 耗时
+- 接口：GET /api/articles/?limit=100 与 GET /api/articles/{id} 的单请求延迟
+
+用法：python -m backend.benchmarks.bench_json_serialization [-n 2000]
+"""
+import argparse
+from datetime import datetime, timedelta
+from typing import List
+
+from .common import AsgiClient, measure, prepare_database
+
+prepare_database()
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from ..controllers.article_controller import article_controller  # noqa: E402
+from ..database import SessionLocal  # noqa: E402
+from ..main import app  # noqa: E402
+from ..migrations import run_migrations  # noqa: E402
+from ..models import Article, User  # noqa: E402
+from ..responses import FastJSONResponse, orjson, to_dicts  # noqa: E402
+from ..schemas import ArticleListResponse  # noqa: E402
+
+ARTICLES = 100
+
+
+def seed(db) -> List[Article]:
+    """写入 100 篇已发布文章"""
+    author = db.query(User).filter(User.username == "bench_author").first()
+    if author is None:
+        author = User(username="bench_author", email="bench_author@example.com", hashed_password="x")
+        db.add(author)
+        db.flush()
+    now = datetime.utcnow()
+    for i in range(ARTICLES):
+        db.add(Article(
+            title=f"基准测试文章 {i}",
+            content="<p>正文</p>" * 50,
+            excerpt="这是一段文章摘要，用于测试列表序列化的开销。",
+            category="技术",
+            status="已发布",
+            author_id=author.id,
+            published_at=now - timedelta(minutes=i)
+        ))
+    db.commit()
+    return db.query(Article).filter(Article.status == "已发布").limit(ARTICLES).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 序列化基准测试")
+    parser.add_argument("-n", type=int, default=2000, help="每种情况的重复次数")
+    args = parser.parse_args()
+
+    run_migrations()
+    client = AsgiClient(app)
+    db = SessionLocal()
+    try:
+        articles = seed(db)
+        article_id = articles[0].id
+        adapter = TypeAdapter(List[ArticleListResponse])
+
+        def current_path():
+            # 与 FastAPI 处理 response_model 的方式相同：校验、转成 JSON 兼容对象，再用标准库编码
+            value = adapter.validate_python([ArticleListResponse.model_validate(a) for a in articles])
+            return JSONResponse(adapter.dump_python(value, mode="json"))
+
+        def fast_path():
+            return FastJSONResponse(to_dicts(articles, ArticleListResponse))
+
+        print(f"orjson: {'已安装' if orjson is not None else '未安装（快速路径使用标准库 json）'}")
+        print(f"{'场景':<34}{'模式':<8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)")
+        rows = [("序列化 100 篇文章", "当前", measure(current_path, args.n)),
+                ("序列化 100 篇文章", "快速", measure(fast_path, args.n))]
+
+        fast_json = article_controller.fast_json
+        for label, enabled in (("当前", False), ("快速", True)):
+            article_controller.fast_json = enabled
+            rows.append(("GET /api/articles/?limit=100", label, measure(
+                lambda: client.request("GET", "/api/articles/", params={"limit": 100}), args.n)))
+            rows.append((f"GET /api/articles/{article_id}", label, measure(
+                lambda: client.request("GET", f"/api/articles/{article_id}"), args.n)))
+        article_controller.fast_json = fast_json
+
+        for scene, label, stats in rows:
+            print(f"{scene:<34}{label:<8}{stats['mean_ms']:>10}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
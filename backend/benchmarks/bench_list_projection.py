@@ -0,0 +1,115 @@
+"""
+列表查询列投影基准测试：对比加载完整文章（含 content）与只加载列表所需列时，每页读取的字节数和延迟
+
+用法：python -m backend.benchmarks.bench_list_projection [--articles 300] [--content-kb 64] [-n 200]
+"""
+import argparse
+from datetime import datetime, timedelta
+
+from .common import measure, prepare_database
+
+prepare_database()
+
+from sqlalchemy import desc  # noqa: E402
+from sqlalchemy.orm import load_only  # noqa: E402
+
+from ..database import SessionLocal  # noqa: E402
+from ..migrations import run_migrations  # noqa: E402
+from ..models import Article, User  # noqa: E402
+from ..schemas import ArticleListResponse  # noqa: E402
+from ..services.article_service import LIST_COLUMNS, WITH_TAGS, ArticleService  # noqa: E402
+
+PAGE_SIZES = [10, 100]
+
+
+def seed(db, articles: int, content_kb: int):
+    """写入指定数量的长文章"""
+    author = User(username="bench_author", email="bench_author@example.com", hashed_password="x")
+    db.add(author)
+    db.flush()
+    paragraph = "<p>这是一段用于基准测试的长文章正文。Lorem ipsum dolor sit amet.</p>\n"
+    content = paragraph * (content_kb * 1024 // len(paragraph.encode()) + 1)
+    now = datetime.utcnow()
+    for i in range(articles):
+        db.add(Article(
+            title=f"基准测试文章 {i}",
+            content=content,
+            excerpt="基准测试文章摘要",
+            category="技术",
+            status="已发布",
+            author_id=author.id,
+            published_at=now - timedelta(minutes=i)
+        ))
+    db.commit()
+
+
+def full_query(db, limit: int):
+    """改动前的列表查询：加载完整的 Article（标签与服务层一样批量加载，只对比列投影）"""
+    return (
+        db.query(Article)
+        .options(WITH_TAGS)
+        .filter(Article.status == "已发布")
+        .order_by(desc(Article.published_at))
+        .limit(limit)
+    )
+
+
+def projected_query(db, limit: int):
+    """列投影后的列表查询（与 ArticleService 相同）"""
+    return (
+        db.query(Article)
+        .options(load_only(*LIST_COLUMNS), WITH_TAGS)
+        .filter(Article.status == "已发布")
+        .order_by(desc(Article.published_at))
+        .limit(limit)
+    )
+
+
+def fetched_bytes(db, query) -> int:
+    """在连接上执行查询生成的 SQL，累计结果集中各列值的字节数"""
+    total = 0
+    for row in db.connection().execute(query.statement):
+        for value in row:
+            if value is None:
+                continue
+            total += len(value.encode()) if isinstance(value, str) else len(str(value))
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="列表查询列投影基准测试")
+    parser.add_argument("--articles", type=int, default=300, help="文章数")
+    parser.add_argument("--content-kb", type=int, default=64, help="每篇文章正文大小（KB）")
+    parser.add_argument("-n", type=int, default=200, help="每种情况的查询次数")
+    args = parser.parse_args()
+
+    run_migrations()
+    db = SessionLocal()
+    try:
+        if db.query(Article).count() == 0:
+            seed(db, args.articles, args.content_kb)
+        service = ArticleService()
+
+        def run(build, limit):
+            def page():
+                db.expunge_all()
+                [ArticleListResponse.model_validate(a).model_dump() for a in build(db, limit).all()]
+            return page
+
+        print(f"{'每页':<6}{'模式':<8}{'读取字节':>14}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)")
+        for limit in PAGE_SIZES:
+            for label, build in (("完整加载", full_query), ("列投影", projected_query)):
+                size = fetched_bytes(db, build(db, limit))
+                stats = measure(run(build, limit), args.n)
+                print(f"{limit:<6}{label:<8}{size:>14}{stats['mean_ms']:>10}{stats['p50_ms']:>10}"
+                      f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+
+        # 服务层完整路径（不经过列表缓存）
+        stats = measure(lambda: service._serialize_list(service._query_published_articles(db, 0, 100)), args.n)
+        print(f"ArticleService 列表（每页 100，无缓存）: mean {stats['mean_ms']} ms, p95 {stats['p95_ms']} ms")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+启动耗时基准测试：在全新的子进程中测量导入 backend.main、lifespan 启动、首个请求和首次登录的耗时
+
+每轮启动一个新的 Python 进程（模块缓存、连接池都是冷的），输出各阶段耗时的中位数和最小值。
+--auto-migrate 对比启动时执行迁移（AUTO_MIGRATE=1）与只检查迁移状态的差别，
+--importtime 列出导入 backend.main 时累计耗时最多的模块。
+
+用法：python -m backend.benchmarks.bench_startup [-n 5] [--auto-migrate] [--importtime 15]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from .common import prepare_database
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CHILD_MODULE = "backend.benchmarks.bench_startup"
+
+ADMIN = {"username": "startup_admin", "email": "startup_admin@example.com", "password": "startup-password"}
+PHASES = ["import_ms", "startup_ms", "first_request_ms", "second_request_ms", "first_login_ms"]
+
+
+def elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def child():
+    """子进程：按顺序测量各阶段，结果以一行 JSON 写到标准输出"""
+    started = time.perf_counter()
+    from ..main import app
+    result = {"import_ms": elapsed_ms(started), "modules": len(sys.modules)}
+    result["heavy_modules_loaded"] = sorted(name for name in ("jose", "passlib", "cryptography") if name in sys.modules)
+
+    from .common import AsgiClient, AsgiLifespan
+
+    async def run():
+        client = AsgiClient(app)
+        started = time.perf_counter()
+        async with AsgiLifespan(app):
+            result["startup_ms"] = elapsed_ms(started)
+            for phase in ("first_request_ms", "second_request_ms"):
+                started = time.perf_counter()
+                status, _, _ = await client.arequest("GET", "/api/articles/")
+                result[phase] = elapsed_ms(started)
+                assert status == 200, status
+            started = time.perf_counter()
+            status, _, _ = await client.arequest(
+                "POST", "/api/auth/login", json_body={"username": ADMIN["username"], "password": ADMIN["password"]}
+            )
+            result["first_login_ms"] = elapsed_ms(started)
+            assert status == 200, status
+
+    asyncio.new_event_loop().run_until_complete(run())
+    print(json.dumps(result))
+
+
+def seed():
+    """应用迁移并创建登录用的用户（在父进程中执行一次，子进程只测量启动）"""
+    from ..database import SessionLocal
+    from ..hashing import get_pwd_context
+    from ..migrations import run_migrations
+    from ..models import User
+
+    run_migrations()
+    db = SessionLocal()
+    try:
+        if not db.query(User).filter(User.username == ADMIN["username"]).first():
+            db.add(User(
+                username=ADMIN["username"],
+                email=ADMIN["email"],
+                hashed_password=get_pwd_context().hash(ADMIN["password"]),
+            ))
+            db.commit()
+    finally:
+        db.close()
+
+
+def run_child(env: dict, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-m", CHILD_MODULE, "--child"]
+    process = subprocess.run(command, cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"子进程失败：\n{process.stderr[-2000:]}")
+    return process
+
+
+def top_imports(stderr: str, limit: int):
+    """解析 -X importtime 的输出，返回累计耗时最多的模块 [(毫秒, 模块名)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动耗时基准测试")
+    parser.add_argument("-n", type=int, default=5, help="启动次数")
+    parser.add_argument("--auto-migrate", action="store_true", help="子进程启动时执行迁移（AUTO_MIGRATE=1）")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="列出导入耗时最多的 N 个模块")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    os.environ.setdefault("BCRYPT_ROUNDS", "4")
+    url = prepare_database()
+    seed()
+    env = {**os.environ, "DATABASE_URL": url, "AUTO_MIGRATE": "1" if args.auto_migrate else "0"}
+
+    runs = [json.loads(run_child(env).stdout.strip().splitlines()[-1]) for _ in range(args.n)]
+    print(f"{args.n} 次冷启动，AUTO_MIGRATE={env['AUTO_MIGRATE']}，数据库 {url}")
+    print(f"{'阶段':<20}{'p50':>10}{'min':>10}{'max':>10}  (ms)")
+    for phase in PHASES:
+        samples = [run[phase] for run in runs]
+        print(f"{phase:<20}{statistics.median(samples):>10.1f}{min(samples):>10.1f}{max(samples):>10.1f}")
+    print(f"导入后已加载模块 {runs[-1]['modules']} 个，其中重量级依赖：{runs[-1]['heavy_modules_loaded'] or '无'}")
+
+    if args.importtime:
+        print(f"\n导入 backend.main 累计耗时最多的 {args.importtime} 个模块：")
+        for milliseconds, name in top_imports(run_child(env, importtime=True).stderr, args.importtime):
+            print(f"{milliseconds:>10.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
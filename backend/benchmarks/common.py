@@ -0,0 +1,164 @@
+
+"""
+基准测试公共工具
+
+- prepare_database：未设置 DATABASE_URL 时使用临时 SQLite 文件，必须在导入 backend 模块之前调用
+- AsgiClient：直接在进程内调用 ASGI 应用，不依赖额外的 HTTP 客户端库
+- AsgiLifespan：在进程内发送 lifespan 启动、关闭事件（启动后台刷新线程等）
+- summarize：汇总耗时样本
+"""
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+
+def prepare_database() -> str:
+    """设置基准测试使用的数据库，返回数据库 URL"""
+    if "DATABASE_URL" not in os.environ:
+        path = os.path.join(tempfile.mkdtemp(prefix="blog-bench-"), "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return os.environ["DATABASE_URL"]
+
+
+class AsgiClient:
+    """进程内 ASGI 客户端"""
+
+    def __init__(self, app):
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        json_body=None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        return self.loop.run_until_complete(self.arequest(method, path, params, json_body, headers))
+
+    async def arequest(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        json_body=None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """在当前事件循环中发送请求，可以并发调用"""
+        body = json.dumps(json_body).encode() if json_body is not None else b""
+        raw_headers = [(b"host", b"bench")]
+        if json_body is not None:
+            raw_headers.append((b"content-type", b"application/json"))
+        for name, value in (headers or {}).items():
+            raw_headers.append((name.lower().encode(), value.encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": urlencode(params or {}).encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+        }
+        return await self._call(scope, body)
+
+    async def _call(self, scope, body):
+        sent = False
+        response = {"status": 0, "headers": {}, "body": []}
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await asyncio.sleep(3600)
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {k.decode(): v.decode() for k, v in message.get("headers", [])}
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return response["status"], response["headers"], b"".join(response["body"])
+
+    def json(self, method: str, path: str, **kwargs):
+        status, _, body = self.request(method, path, **kwargs)
+        if status >= 400:
+            raise RuntimeError(f"{method} {path} -> {status}: {body[:200]!r}")
+        return json.loads(body) if body else None
+
+
+class AsgiLifespan:
+    """async with AsgiLifespan(app): 期间应用处于已启动状态"""
+
+    def __init__(self, app):
+        self.app = app
+        self._messages: Optional[asyncio.Queue] = None
+        self._task = None
+        self._events: Dict[str, asyncio.Event] = {}
+
+    async def __aenter__(self):
+        self._messages = asyncio.Queue()
+        self._events = {"startup": asyncio.Event(), "shutdown": asyncio.Event()}
+
+        replies: Dict[str, dict] = {}
+
+        async def send(message):
+            # lifespan.startup.complete / lifespan.startup.failed 等
+            stage = message["type"].split(".")[1]
+            replies[stage] = message
+            self._events[stage].set()
+
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}}
+        self._task = asyncio.ensure_future(self.app(scope, self._messages.get, send))
+        await self._messages.put({"type": "lifespan.startup"})
+        await self._events["startup"].wait()
+        if replies["startup"]["type"].endswith("failed"):
+            raise RuntimeError(replies["startup"].get("message") or "应用启动失败")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._messages.put({"type": "lifespan.shutdown"})
+        await self._events["shutdown"].wait()
+        await self._task
+
+
+def summarize(samples: List[float]) -> dict:
+    """耗时样本（秒）汇总为毫秒统计"""
+    ordered = sorted(samples)
+
+    def percentile(p):
+        return ordered[min(int(len(ordered) * p), len(ordered) - 1)] * 1000
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(percentile(0.50), 3),
+        "p95_ms": round(percentile(0.95), 3),
+        "p99_ms": round(percentile(0.99), 3),
+    }
+
+
+def measure(fn: Callable[[], object], n: int, warmup: int = 20) -> dict:
+    """重复调用 fn，返回耗时统计"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
@@ -0,0 +1,408 @@
+"""
+负载测试：在种子数据库上对博客 API 施加混合流量，统计每个接口的延迟分位数和吞吐量
+
+- inprocess 模式（默认）：在同一事件循环中并发调用 ASGI 应用（含 lifespan 启动、关闭），没有网络开销
+- uvicorn 模式：在子进程中启动 uvicorn，用标准库 http.client 的长连接发送请求
+- 流量组成见 SCENARIOS：文章列表、详情（浏览量 +1）、点赞、搜索、评论、管理员登录和统计
+- 结果（git 提交、配置、各接口的 p50/p95/p99 与吞吐量）写入 JSON，--compare 与之前的结果对比
+
+只依赖标准库和项目自身的依赖，可以离线运行。
+
+用法：
+    python -m backend.benchmarks.load_test [--mode inprocess|uvicorn] [--duration 20] [--concurrency 16]
+        [--articles 500] [--seed 42] [--output result.json] [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from .common import AsgiClient, AsgiLifespan, prepare_database, summarize
+
+prepare_database()
+
+from sqlalchemy import func  # noqa: E402
+
+from ..database import DB_MODE, SessionLocal, get_engine  # noqa: E402
+from ..hashing import get_pwd_context  # noqa: E402
+from ..init_db import SEED_CATEGORIES, SEED_WORDS, seed_synthetic  # noqa: E402
+from ..migrations import run_migrations  # noqa: E402
+from ..models import Article, User  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ADMIN = {"username": "bench_admin", "email": "bench_admin@example.com", "password": "bench-password"}
+CATEGORIES = [category for category, _ in SEED_CATEGORIES]
+WORDS = SEED_WORDS
+
+# (名称, 权重)：大致对应博客的读多写少流量
+SCENARIOS = [
+    ("list", 30),
+    ("detail", 30),
+    ("like", 8),
+    ("search", 10),
+    ("comments", 8),
+    ("admin_stats", 10),
+    ("admin_login", 4),
+]
+
+Request = Tuple[str, str, Optional[dict], Optional[dict], Optional[Dict[str, str]]]
+
+
+def seed(articles: int, seed_value: int) -> List[int]:
+    """写入管理员和合成数据（见 init_db --scale，已有足够的文章时跳过），返回已发布文章的 id"""
+    run_migrations()
+    db = SessionLocal()
+    try:
+        if db.query(User).filter(User.username == ADMIN["username"]).first() is None:
+            db.add(User(
+                username=ADMIN["username"],
+                email=ADMIN["email"],
+                hashed_password=get_pwd_context().hash(ADMIN["password"]),
+                is_admin=True
+            ))
+            db.commit()
+        existing = db.query(func.count(Article.id)).scalar()
+    finally:
+        db.close()
+
+    if existing < articles:
+        seed_synthetic(articles - existing, seed_value, verbose=False)
+
+    db = SessionLocal()
+    try:
+        return [row[0] for row in db.query(Article.id).filter(Article.status == "已发布").order_by(Article.id)]
+    finally:
+        db.close()
+
+
+class TrafficMix:
+    """按权重生成请求；每个 worker 使用独立的随机数生成器，同一 seed 下请求序列可复现"""
+
+    def __init__(self, article_ids: List[int], token: str, rng: random.Random):
+        self.article_ids = article_ids
+        self.auth = {"Authorization": f"Bearer {token}"}
+        self.rng = rng
+        self.names = [name for name, _ in SCENARIOS]
+        self.weights = [weight for _, weight in SCENARIOS]
+        self.builders: Dict[str, Callable[[], Request]] = {
+            "list": self.list_page,
+            "detail": self.detail,
+            "like": self.like,
+            "search": self.search,
+            "comments": self.comments,
+            "admin_stats": self.admin_stats,
+            "admin_login": self.admin_login,
+        }
+
+    def next(self) -> Tuple[str, Request]:
+        name = self.rng.choices(self.names, self.weights)[0]
+        return name, self.builders[name]()
+
+    def article_id(self) -> int:
+        # 前面的（较新的）文章更热
+        index = min(int(self.rng.expovariate(1 / 20)), len(self.article_ids) - 1)
+        return self.article_ids[-1 - index]
+
+    def list_page(self) -> Request:
+        params = {"skip": self.rng.choice([0, 0, 0, 10, 20]), "limit": 10}
+        if self.rng.random() < 0.3:
+            params["category"] = self.rng.choice(CATEGORIES)
+        return "GET", "/api/articles/", params, None, None
+
+    def detail(self) -> Request:
+        return "GET", f"/api/articles/{self.article_id()}", None, None, None
+
+    def like(self) -> Request:
+        return "POST", f"/api/articles/{self.article_id()}/like", None, None, None
+
+    def search(self) -> Request:
+        return "GET", "/api/articles/search", {"q": self.rng.choice(WORDS)}, None, None
+
+    def comments(self) -> Request:
+        return "GET", f"/api/comments/article/{self.article_id()}", None, None, None
+
+    def admin_stats(self) -> Request:
+        return "GET", "/api/admin/stats", None, None, self.auth
+
+    def admin_login(self) -> Request:
+        credentials = {"username": ADMIN["username"], "password": ADMIN["password"]}
+        return "POST", "/api/auth/login", None, credentials, None
+
+
+class InProcessTransport:
+    """直接调用 ASGI 应用"""
+
+    def __init__(self, app):
+        self.client = AsgiClient(app)
+
+    async def send(self, worker: int, request: Request) -> Tuple[int, bytes]:
+        method, path, params, body, headers = request
+        status, _, content = await self.client.arequest(method, path, params, body, headers)
+        return status, content
+
+
+class HttpTransport:
+    """每个 worker 一个 http.client 长连接，在线程池中执行阻塞 IO"""
+
+    def __init__(self, host: str, port: int, concurrency: int):
+        self.host = host
+        self.port = port
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="load")
+        self.connections: Dict[int, http.client.HTTPConnection] = {}
+
+    def _send(self, worker: int, request: Request) -> Tuple[int, bytes]:
+        method, path, params, body, headers = request
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        for attempt in range(2):
+            connection = self.connections.get(worker)
+            if connection is None:
+                connection = self.connections[worker] = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            try:
+                connection.request(method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, ConnectionError):
+                # 服务端关闭了长连接，重连一次
+                connection.close()
+                del self.connections[worker]
+                if attempt:
+                    raise
+        raise AssertionError("unreachable")
+
+    async def send(self, worker: int, request: Request) -> Tuple[int, bytes]:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self._send, worker, request)
+
+    async def close(self):
+        for connection in self.connections.values():
+            connection.close()
+        self.executor.shutdown(wait=True)
+
+
+async def login(transport, worker: int = 0) -> str:
+    status, body = await transport.send(worker, ("POST", "/api/auth/login", None, {
+        "username": ADMIN["username"], "password": ADMIN["password"]
+    }, None))
+    if status != 200:
+        raise RuntimeError(f"管理员登录失败: {status} {body[:200]!r}")
+    return json.loads(body)["access_token"]
+
+
+async def run_load(transport, article_ids: List[int], args) -> dict:
+    """预热后在 duration 秒内持续发送请求，返回每个接口的耗时样本和错误数"""
+    token = await login(transport)
+    samples: Dict[str, List[float]] = {name: [] for name, _ in SCENARIOS}
+    errors: Dict[str, int] = {name: 0 for name, _ in SCENARIOS}
+    recording = False
+
+    async def worker(index: int, deadline: float):
+        mix = TrafficMix(article_ids, token, random.Random(args.seed * 1000 + index))
+        while time.perf_counter() < deadline:
+            name, request = mix.next()
+            start = time.perf_counter()
+            try:
+                status, _ = await transport.send(index, request)
+            except Exception:
+                status = 599
+            elapsed = time.perf_counter() - start
+            if recording:
+                samples[name].append(elapsed)
+                if status >= 400:
+                    errors[name] += 1
+
+    if args.warmup > 0:
+        deadline = time.perf_counter() + args.warmup
+        await asyncio.gather(*(worker(i, deadline) for i in range(args.concurrency)))
+
+    recording = True
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(worker(i, deadline) for i in range(args.concurrency)))
+    return {"samples": samples, "errors": errors, "elapsed": time.perf_counter() - started}
+
+
+def report(raw: dict) -> dict:
+    """按接口汇总延迟分位数和吞吐量"""
+    elapsed = raw["elapsed"]
+    endpoints = {}
+    all_samples = []
+    for name, samples in raw["samples"].items():
+        if not samples:
+            continue
+        all_samples.extend(samples)
+        endpoints[name] = {
+            **summarize(samples),
+            "errors": raw["errors"][name],
+            "throughput_rps": round(len(samples) / elapsed, 2),
+        }
+    total = {
+        **summarize(all_samples),
+        "errors": sum(raw["errors"].values()),
+        "throughput_rps": round(len(all_samples) / elapsed, 2),
+    } if all_samples else {}
+    return {"elapsed_s": round(elapsed, 3), "endpoints": endpoints, "total": total}
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn(port: int, workers: int) -> subprocess.Popen:
+    """在子进程中启动 uvicorn，等待健康检查通过"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=REPO_ROOT,
+        env=os.environ.copy(),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn 启动失败，退出码 {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                connection.close()
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("等待 uvicorn 启动超时")
+
+
+async def run_inprocess(article_ids: List[int], args) -> dict:
+    from ..main import app
+
+    transport = InProcessTransport(app)
+    async with AsgiLifespan(app):
+        return await run_load(transport, article_ids, args)
+
+
+async def run_http(article_ids: List[int], args, port: int) -> dict:
+    transport = HttpTransport("127.0.0.1", port, args.concurrency)
+    try:
+        return await run_load(transport, article_ids, args)
+    finally:
+        await transport.close()
+
+
+def compare(current: dict, baseline: dict):
+    """打印与基线结果的差异"""
+    print(f"\n与基线 {baseline.get('git_revision')}（{baseline.get('timestamp')}）对比：")
+    print(f"{'接口':<14}{'p50':>26}{'p95':>26}{'p99':>26}{'rps':>26}")
+    rows = list(current["endpoints"].items()) + [("total", current["total"])]
+    for name, stats in rows:
+        old = baseline["endpoints"].get(name) if name != "total" else baseline.get("total")
+        if not old:
+            continue
+        cells = []
+        for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            change = (stats[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+            cells.append(f"{old[key]} → {stats[key]} ({change:+.0f}%)")
+        print(f"{name:<14}" + "".join(f"{cell:>26}" for cell in cells))
+
+
+def print_report(result: dict):
+    print(f"{'接口':<14}{'n':>8}{'err':>6}{'rps':>10}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)")
+    rows = list(result["endpoints"].items()) + [("total", result["total"])]
+    for name, stats in rows:
+        if not stats:
+            continue
+        print(
+            f"{name:<14}{stats['n']:>8}{stats['errors']:>6}{stats['throughput_rps']:>10}"
+            f"{stats['mean_ms']:>10}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="博客 API 负载测试")
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn"], default="inprocess", help="运行方式")
+    parser.add_argument("--duration", type=float, default=20, help="计入统计的压测时长（秒）")
+    parser.add_argument("--warmup", type=float, default=3, help="预热时长（秒），不计入统计")
+    parser.add_argument("--concurrency", type=int, default=16, help="并发 worker 数")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 模式下的服务进程数")
+    parser.add_argument("--articles", type=int, default=500, help="种子文章数")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子（种子数据和请求序列）")
+    parser.add_argument("-o", "--output", help="结果 JSON 路径，默认 load_test_<提交>_<时间>.json")
+    parser.add_argument("--compare", help="与之前保存的结果 JSON 对比")
+    args = parser.parse_args()
+
+    article_ids = seed(args.articles, args.seed)
+    if args.mode == "uvicorn":
+        port = free_port()
+        process = start_uvicorn(port, args.workers)
+        try:
+            raw = asyncio.run(run_http(article_ids, args, port))
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+    else:
+        raw = asyncio.run(run_inprocess(article_ids, args))
+
+    revision = git_revision()
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    result = {
+        "git_revision": revision,
+        "timestamp": timestamp,
+        "config": {
+            "mode": args.mode,
+            "db_mode": DB_MODE,
+            "database": get_engine().dialect.name,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "workers": args.workers if args.mode == "uvicorn" else None,
+            "articles": args.articles,
+            "seed": args.seed,
+            "mix": dict(SCENARIOS),
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        **report(raw),
+    }
+
+    print_report(result)
+    output = args.output or f"load_test_{revision or 'unknown'}_{timestamp}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n结果已保存到 {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
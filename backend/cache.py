@@ -0,0 +1,235 @@
+
+"""
+响应缓存
+
+- CacheBackend 定义后端接口；默认的 MemoryCacheBackend 是进程内 TTL + LRU 缓存，带条目数和内存上限
+- 多 worker 部署时可实现共享存储（如 Redis）的后端，通过 ResponseCache.configure_backend 替换
+- 每个条目可带若干标签，写操作按标签精确失效
+"""
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable
+
+# 配置
+ARTICLE_LIST_CACHE_TTL = float(os.getenv("ARTICLE_LIST_CACHE_TTL", "30"))
+ARTICLE_LIST_CACHE_MAX_ENTRIES = int(os.getenv("ARTICLE_LIST_CACHE_MAX_ENTRIES", "1024"))
+ARTICLE_LIST_CACHE_MAX_BYTES = int(os.getenv("ARTICLE_LIST_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+TAG_CLOUD_CACHE_TTL = float(os.getenv("TAG_CLOUD_CACHE_TTL", "300"))
+
+
+class CacheBackend:
+    """缓存后端接口"""
+
+    def get(self, key: str) -> Any:
+        """读取缓存，不存在或已过期时返回 None"""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()):
+        """写入缓存"""
+        raise NotImplementedError
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """删除带有任一标签的条目，返回删除的条目数"""
+        raise NotImplementedError
+
+    def clear(self):
+        """清空缓存"""
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        """后端自身的统计信息"""
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """进程内缓存：TTL 过期 + LRU 淘汰，限制条目数和估算的内存占用"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tags: Dict[str, set] = {}
+        self._bytes = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self._expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()):
+        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        if size > self.max_bytes:
+            return
+        tags = frozenset(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, size, tags)
+            self._bytes += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tags.get(tag, set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    def _remove(self, key: str):
+        _, _, size, tags = self._entries.pop(key)
+        self._bytes -= size
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class ResponseCache:
+    """带命中统计的缓存，缓存值必须可序列化（不要放 ORM 对象）
+
+    loader 执行期间发生的失效会让这次加载的结果不再写入：每次失效把时钟加一并记下标签被失效时的时钟，
+    加载结束时若它的任一标签在加载开始之后被失效（或缓存被清空），说明结果可能已过期，只返回不缓存。
+    """
+
+    def __init__(self, name: str, ttl: float, backend: CacheBackend):
+        self.name = name
+        self.ttl = ttl
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._clock = 0
+        self._cleared_at = 0
+        # 加载进行中被失效的标签 -> 失效时的时钟；没有加载进行中时清空
+        self._invalidated_at: Dict[str, int] = {}
+        self._loading = 0
+        self._lock = threading.Lock()
+        caches[name] = self
+
+    def configure_backend(self, backend: CacheBackend):
+        """替换缓存后端"""
+        self.backend = backend
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        return json.dumps(parts, ensure_ascii=False, default=str, separators=(",", ":"))
+
+    def get_or_set(self, key: str, loader: Callable[[], Any], tags: Any = ()) -> Any:
+        """命中时返回缓存值，否则调用 loader 计算并写入
+
+        tags 可以是标签列表，也可以是根据值计算标签的函数；loader 返回 None 时不缓存，ttl 不大于 0 时不使用缓存。
+        """
+        if self.ttl <= 0:
+            return loader()
+        value = self.backend.get(key)
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+                return value
+            self.misses += 1
+            started = self._clock
+            self._loading += 1
+        try:
+            value = loader()
+            entry_tags = tags(value) if callable(tags) and value is not None else tags
+            with self._lock:
+                stale = self._cleared_at > started or any(
+                    self._invalidated_at.get(tag, 0) > started for tag in entry_tags
+                )
+            if value is not None and not stale:
+                self.backend.set(key, value, self.ttl, entry_tags)
+            return value
+        finally:
+            with self._lock:
+                self._loading -= 1
+                if not self._loading:
+                    self._invalidated_at.clear()
+
+    def invalidate(self, tags: Iterable[str]):
+        """按标签失效"""
+        tags = list(tags)
+        with self._lock:
+            self._clock += 1
+            if self._loading:
+                for tag in tags:
+                    self._invalidated_at[tag] = self._clock
+        removed = self.backend.invalidate_tags(tags)
+        with self._lock:
+            self.invalidations += removed
+
+    def clear(self):
+        with self._lock:
+            self._clock += 1
+            self._cleared_at = self._clock
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses, invalidations = self.hits, self.misses, self.invalidations
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+            "invalidations": invalidations,
+            "ttl": self.ttl,
+            **self.backend.stats(),
+        }
+
+
+# 已注册的缓存，供运维统计使用
+caches: Dict[str, ResponseCache] = {}
+
+# 前台文章列表缓存
+article_list_cache = ResponseCache(
+    "article_list",
+    ARTICLE_LIST_CACHE_TTL,
+    MemoryCacheBackend(ARTICLE_LIST_CACHE_MAX_ENTRIES, ARTICLE_LIST_CACHE_MAX_BYTES),
+)
+
+# 标签云缓存：文章或标签写入时失效
+tag_cloud_cache = ResponseCache(
+    "tag_cloud",
+    TAG_CLOUD_CACHE_TTL,
+    MemoryCacheBackend(16, 1024 * 1024),
+)
@@ -1,23 +1,56 @@
 
-from fastapi import Depends
+from typing import List
+from fastapi import Depends, Query
 from sqlalchemy.orm import Session
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import User
-from ..schemas import StatsResponse
+from ..schemas import StatsResponse, CategoryStatsResponse, ArticleVisitorStats
 from ..services.admin_service import AdminService
+from ..responses import use_fast_json, fast_response
 from ..auth import get_current_admin_user
 
 class AdminController:
     def __init__(self):
+        self.fast_json = use_fast_json("admin")
         self.admin_service = AdminService()
     
     def get_dashboard_stats(
         self,
+        fresh: bool = Query(False),
         current_user: User = Depends(get_current_admin_user),
-        db: Session = Depends(get_db)
+        db: Session = Depends(get_read_db)
     ) -> StatsResponse:
         """获取仪表板统计数据"""
-        return self.admin_service.get_dashboard_stats(db)
+        stats = self.admin_service.get_dashboard_stats(db, fresh)
+        if self.fast_json:
+            return fast_response(stats)
+        return stats
+    
+    def get_category_stats(
+        self,
+        current_user: User = Depends(get_current_admin_user),
+        db: Session = Depends(get_read_db)
+    ) -> List[CategoryStatsResponse]:
+        """获取分类统计数据"""
+        return self.admin_service.get_category_stats(db)
+    
+    def get_article_visitors(
+        self,
+        article_id: int,
+        days: int = Query(30, ge=1, le=366),
+        current_user: User = Depends(get_current_admin_user),
+        db: Session = Depends(get_read_db)
+    ) -> ArticleVisitorStats:
+        """获取文章的独立访客统计"""
+        return self.admin_service.get_article_visitors(db, article_id, days)
+    
+    def reconcile_stats(
+        self,
+        current_user: User = Depends(get_current_admin_user),
+        db: Session = Depends(get_db)
+    ) -> dict:
+        """重算统计汇总表"""
+        return self.admin_service.reconcile_stats(db)
     
     def get_users(
         self,
@@ -27,5 +60,19 @@ class AdminController:
         """获取用户列表"""
         return self.admin_service.get_all_users(db)
 
+    def get_cache_stats(
+        self,
+        current_user: User = Depends(get_current_admin_user)
+    ) -> dict:
+        """获取缓存统计"""
+        return self.admin_service.get_cache_stats()
+
+    def get_pool_stats(
+        self,
+        current_user: User = Depends(get_current_admin_user)
+    ) -> dict:
+        """获取连接池统计"""
+        return self.admin_service.get_pool_stats()
+
 # 创建控制器实例
 admin_controller = AdminController()
@@ -1,36 +1,108 @@
 
-from typing import List, Optional
-from fastapi import Depends, Query
+from typing import List, Optional, Union
+from fastapi import Depends, Query, Request, Response
 from sqlalchemy.orm import Session
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import User
 from ..schemas import (
     ArticleCreate, 
     ArticleUpdate, 
     ArticleResponse, 
-    ArticleListResponse
+    ArticleListResponse,
+    SearchResultResponse,
+    TrendingArticleResponse,
+    ArticleCursorPage,
+    AdminArticleCursorPage
 )
 from ..services.article_service import ArticleService
 from ..auth import get_current_admin_user
+from ..visitors import visitor_fingerprint
+from ..http_cache import make_etag, is_conditional, is_not_modified, set_validators, not_modified_response
+from ..responses import use_fast_json, fast_response, serialize_page, to_dict
 
 class ArticleController:
     def __init__(self):
+        # 启用快速 JSON 时热点读接口直接返回编码好的响应，跳过 response_model 校验
+        self.fast_json = use_fast_json("articles")
         self.article_service = ArticleService()
     
     def get_articles(
         self,
+        request: Request,
+        response: Response,
         skip: int = Query(0, ge=0),
         limit: int = Query(10, ge=1, le=100),
         category: Optional[str] = None,
         search: Optional[str] = None,
-        db: Session = Depends(get_db)
-    ) -> List[ArticleListResponse]:
-        """获取文章列表（前台）"""
-        return self.article_service.get_published_articles(db, skip, limit, category, search)
+        cursor: Optional[str] = Query(None, description="游标分页：第一页传空字符串，之后传上一页返回的 next_cursor"),
+        tag: Optional[str] = Query(None, description="按标签名过滤"),
+        db: Session = Depends(get_read_db)
+    ) -> Union[List[ArticleListResponse], ArticleCursorPage]:
+        """获取文章列表（前台），支持 ETag / Last-Modified 条件请求"""
+        validators = self.article_service.get_list_validators(db)
+        last_modified = validators["last_modified"]
+        etag = make_etag(
+            "articles", last_modified, validators["count"],
+            cursor if cursor is not None else skip, limit, category, search, tag
+        )
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        
+        set_validators(response, etag, last_modified)
+        articles = self.article_service.get_published_articles(db, skip, limit, category, search, cursor, tag)
+        if self.fast_json:
+            # 列表缓存中已经是按响应字段生成的字典
+            return fast_response(articles, response)
+        return articles
+    
+    def search_articles(
+        self,
+        q: str = Query(..., min_length=1),
+        skip: int = Query(0, ge=0),
+        limit: int = Query(10, ge=1, le=100),
+        category: Optional[str] = None,
+        db: Session = Depends(get_read_db)
+    ) -> List[SearchResultResponse]:
+        """全文检索文章"""
+        results = self.article_service.search_articles(db, q, skip, limit, category)
+        if self.fast_json:
+            return fast_response([result.model_dump() for result in results])
+        return results
     
-    def get_article(self, article_id: int, db: Session = Depends(get_db)) -> ArticleResponse:
-        """获取单篇文章详情"""
-        return self.article_service.get_article_by_id(article_id, db)
+    def get_trending_articles(
+        self,
+        limit: int = Query(10, ge=1, le=100),
+        db: Session = Depends(get_read_db)
+    ) -> List[TrendingArticleResponse]:
+        """热门文章"""
+        articles = self.article_service.get_trending_articles(db, limit)
+        if self.fast_json:
+            return fast_response(articles)
+        return articles
+    
+    def get_article(
+        self,
+        article_id: int,
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_read_db)
+    ) -> ArticleResponse:
+        """获取单篇文章详情，支持 ETag / Last-Modified 条件请求"""
+        fingerprint = visitor_fingerprint(request)
+        if is_conditional(request):
+            # 先只查修改时间，命中时不加载正文，但仍然计入浏览量
+            last_modified = self.article_service.get_article_last_modified(article_id, db)
+            etag = make_etag("article", article_id, last_modified)
+            if is_not_modified(request, etag, last_modified):
+                self.article_service.record_view(article_id, fingerprint)
+                return not_modified_response(etag, last_modified)
+        
+        article = self.article_service.get_article_by_id(article_id, db, fingerprint)
+        last_modified = article.updated_at or article.created_at
+        set_validators(response, make_etag("article", article_id, last_modified), last_modified)
+        if self.fast_json:
+            return fast_response(to_dict(article, ArticleResponse), response)
+        return article
     
     def get_admin_articles(
         self,
@@ -38,11 +110,15 @@ class ArticleController:
         limit: int = Query(10, ge=1, le=100),
         status_filter: Optional[str] = Query(None, alias="status"),
         category: Optional[str] = None,
+        cursor: Optional[str] = Query(None, description="游标分页：第一页传空字符串，之后传上一页返回的 next_cursor"),
         current_user: User = Depends(get_current_admin_user),
         db: Session = Depends(get_db)
-    ) -> List[ArticleResponse]:
+    ) -> Union[List[ArticleResponse], AdminArticleCursorPage]:
         """获取所有文章（后台管理）"""
-        return self.article_service.get_admin_articles(db, skip, limit, status_filter, category)
+        articles = self.article_service.get_admin_articles(db, skip, limit, status_filter, category, cursor)
+        if self.fast_json:
+            return fast_response(serialize_page(articles, ArticleResponse))
+        return articles
     
     def create_article(
         self,
@@ -0,0 +1,78 @@
+
+from typing import List
+from fastapi import Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from ..models import User
+from ..schemas import StatsResponse, CategoryStatsResponse, ArticleVisitorStats
+from ..services.async_admin_service import AsyncAdminService
+from ..responses import use_fast_json, fast_response
+from ..auth import get_current_admin_user_async
+
+class AsyncAdminController:
+    def __init__(self):
+        self.fast_json = use_fast_json("admin")
+        self.admin_service = AsyncAdminService()
+    
+    async def get_dashboard_stats(
+        self,
+        fresh: bool = Query(False),
+        current_user: User = Depends(get_current_admin_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> StatsResponse:
+        """获取仪表板统计数据"""
+        stats = await self.admin_service.get_dashboard_stats(db, fresh)
+        if self.fast_json:
+            return fast_response(stats)
+        return stats
+    
+    async def get_category_stats(
+        self,
+        current_user: User = Depends(get_current_admin_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> List[CategoryStatsResponse]:
+        """获取分类统计数据"""
+        return await self.admin_service.get_category_stats(db)
+    
+    async def get_article_visitors(
+        self,
+        article_id: int,
+        days: int = Query(30, ge=1, le=366),
+        current_user: User = Depends(get_current_admin_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> ArticleVisitorStats:
+        """获取文章的独立访客统计"""
+        return await self.admin_service.get_article_visitors(db, article_id, days)
+    
+    async def reconcile_stats(
+        self,
+        current_user: User = Depends(get_current_admin_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> dict:
+        """重算统计汇总表"""
+        return await self.admin_service.reconcile_stats(db)
+    
+    async def get_users(
+        self,
+        current_user: User = Depends(get_current_admin_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> list:
+        """获取用户列表"""
+        return await self.admin_service.get_all_users(db)
+
+    async def get_cache_stats(
+        self,
+        current_user: User = Depends(get_current_admin_user_async)
+    ) -> dict:
+        """获取缓存统计"""
+        return self.admin_service.get_cache_stats()
+
+    async def get_pool_stats(
+        self,
+        current_user: User = Depends(get_current_admin_user_async)
+    ) -> dict:
+        """获取连接池统计"""
+        return self.admin_service.get_pool_stats()
+
+# 创建控制器实例
+async_admin_controller = AsyncAdminController()
@@ -0,0 +1,21 @@
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from ..schemas import UserCreate, UserLogin, Token, UserResponse
+from ..services.async_auth_service import AsyncAuthService
+
+class AsyncAuthController:
+    def __init__(self):
+        self.auth_service = AsyncAuthService()
+    
+    async def register(self, user: UserCreate, db: AsyncSession = Depends(get_async_db)) -> UserResponse:
+        """用户注册控制器"""
+        return await self.auth_service.register_user(user, db)
+    
+    async def login(self, user: UserLogin, db: AsyncSession = Depends(get_async_db)) -> Token:
+        """用户登录控制器"""
+        return await self.auth_service.login_user(user, db)
+
+# 创建控制器实例
+async_auth_controller = AsyncAuthController()
@@ -0,0 +1,86 @@
+
+from datetime import datetime
+from typing import Optional
+from fastapi import Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from ..models import User
+from ..schemas import CommentCreate, CommentModeration, CommentResponse, CommentThreadPage
+from ..responses import json_line
+from ..services.async_comment_service import AsyncCommentService
+from ..auth import get_current_admin_user_async
+
+class AsyncCommentController:
+    def __init__(self):
+        self.comment_service = AsyncCommentService()
+    
+    async def create_comment(self, comment: CommentCreate, db: AsyncSession = Depends(get_async_db)) -> CommentResponse:
+        """发表评论"""
+        return await self.comment_service.create_comment(comment, db)
+    
+    async def get_comment_thread(
+        self,
+        article_id: int,
+        cursor: Optional[str] = Query(None, description="游标分页：不传或传空字符串为第一页，之后传上一页返回的 next_cursor"),
+        limit: int = Query(20, ge=1, le=100),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> CommentThreadPage:
+        """获取文章的评论树"""
+        return await self.comment_service.get_comment_thread(article_id, db, cursor, limit)
+    
+    async def approve_comment(
+        self,
+        comment_id: int,
+        current_user: User = Depends(get_current_admin_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> CommentResponse:
+        """审核通过评论"""
+        return await self.comment_service.approve_comment(comment_id, db)
+    
+    async def delete_comment(
+        self,
+        comment_id: int,
+        current_user: User = Depends(get_current_admin_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> dict:
+        """删除评论"""
+        return await self.comment_service.delete_comment(comment_id, db)
+
+    async def stream_pending_comments(
+        self,
+        article_id: Optional[int] = Query(None),
+        author_email: Optional[str] = Query(None),
+        before: Optional[datetime] = Query(None),
+        current_user: User = Depends(get_current_admin_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> StreamingResponse:
+        """以 NDJSON 流式返回待审核评论"""
+        moderation = CommentModeration(article_id=article_id, author_email=author_email, before=before)
+        
+        async def lines():
+            async for comment in self.comment_service.iter_pending_comments(db, moderation):
+                yield json_line(comment)
+        
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+    
+    async def approve_comments(
+        self,
+        moderation: CommentModeration,
+        current_user: User = Depends(get_current_admin_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> dict:
+        """批量审核通过"""
+        return await self.comment_service.approve_comments(moderation, db)
+    
+    async def reject_comments(
+        self,
+        moderation: CommentModeration,
+        current_user: User = Depends(get_current_admin_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> dict:
+        """批量拒绝"""
+        return await self.comment_service.reject_comments(moderation, db)
+
+# 创建控制器实例
+async_comment_controller = AsyncCommentController()
@@ -0,0 +1,52 @@
+
+from typing import List
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from ..models import User
+from ..schemas import TagCreate, TagUpdate, TagResponse, TagCloudItem
+from ..services.async_tag_service import AsyncTagService
+from ..auth import get_current_admin_user_async
+
+class AsyncTagController:
+    def __init__(self):
+        self.tag_service = AsyncTagService()
+    
+    async def get_tags(self, db: AsyncSession = Depends(get_async_db)) -> List[TagResponse]:
+        """获取全部标签"""
+        return await self.tag_service.get_tags(db)
+    
+    async def get_tag_cloud(self, db: AsyncSession = Depends(get_async_db)) -> List[TagCloudItem]:
+        """获取标签云"""
+        return await self.tag_service.get_tag_cloud(db)
+    
+    async def create_tag(
+        self,
+        tag: TagCreate,
+        current_user: User = Depends(get_current_admin_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> TagResponse:
+        """创建标签"""
+        return await self.tag_service.create_tag(tag, db)
+    
+    async def update_tag(
+        self,
+        tag_id: int,
+        tag_update: TagUpdate,
+        current_user: User = Depends(get_current_admin_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> TagResponse:
+        """更新标签"""
+        return await self.tag_service.update_tag(tag_id, tag_update, db)
+    
+    async def delete_tag(
+        self,
+        tag_id: int,
+        current_user: User = Depends(get_current_admin_user_async),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> dict:
+        """删除标签"""
+        return await self.tag_service.delete_tag(tag_id, db)
+
+# 创建控制器实例
+async_tag_controller = AsyncTagController()
@@ -11,13 +11,13 @@ class AuthController:
     def __init__(self):
         self.auth_service = AuthService()
     
-    def register(self, user: UserCreate, db: Session = Depends(get_db)) -> UserResponse:
+    async def register(self, user: UserCreate, db: Session = Depends(get_db)) -> UserResponse:
         """用户注册控制器"""
-        return self.auth_service.register_user(user, db)
+        return await self.auth_service.register_user(user, db)
     
-    def login(self, user: UserLogin, db: Session = Depends(get_db)) -> Token:
+    async def login(self, user: UserLogin, db: Session = Depends(get_db)) -> Token:
         """用户登录控制器"""
-        return self.auth_service.login_user(user, db)
+        return await self.auth_service.login_user(user, db)
 
 # 创建控制器实例
 auth_controller = AuthController()
@@ -0,0 +1,82 @@
+
+from datetime import datetime
+from typing import Optional
+from fastapi import Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from ..database import get_db, get_read_db
+from ..models import User
+from ..schemas import CommentCreate, CommentModeration, CommentResponse, CommentThreadPage
+from ..responses import json_line
+from ..services.comment_service import CommentService
+from ..auth import get_current_admin_user
+
+class CommentController:
+    def __init__(self):
+        self.comment_service = CommentService()
+    
+    def create_comment(self, comment: CommentCreate, db: Session = Depends(get_db)) -> CommentResponse:
+        """发表评论"""
+        return self.comment_service.create_comment(comment, db)
+    
+    def get_comment_thread(
+        self,
+        article_id: int,
+        cursor: Optional[str] = Query(None, description="游标分页：不传或传空字符串为第一页，之后传上一页返回的 next_cursor"),
+        limit: int = Query(20, ge=1, le=100),
+        db: Session = Depends(get_read_db)
+    ) -> CommentThreadPage:
+        """获取文章的评论树"""
+        return self.comment_service.get_comment_thread(article_id, db, cursor, limit)
+    
+    def approve_comment(
+        self,
+        comment_id: int,
+        current_user: User = Depends(get_current_admin_user),
+        db: Session = Depends(get_db)
+    ) -> CommentResponse:
+        """审核通过评论"""
+        return self.comment_service.approve_comment(comment_id, db)
+    
+    def delete_comment(
+        self,
+        comment_id: int,
+        current_user: User = Depends(get_current_admin_user),
+        db: Session = Depends(get_db)
+    ) -> dict:
+        """删除评论"""
+        return self.comment_service.delete_comment(comment_id, db)
+
+    def stream_pending_comments(
+        self,
+        article_id: Optional[int] = Query(None),
+        author_email: Optional[str] = Query(None),
+        before: Optional[datetime] = Query(None),
+        current_user: User = Depends(get_current_admin_user),
+        db: Session = Depends(get_db)
+    ) -> StreamingResponse:
+        """以 NDJSON 流式返回待审核评论"""
+        moderation = CommentModeration(article_id=article_id, author_email=author_email, before=before)
+        comments = self.comment_service.iter_pending_comments(db, moderation)
+        return StreamingResponse((json_line(comment) for comment in comments), media_type="application/x-ndjson")
+    
+    def approve_comments(
+        self,
+        moderation: CommentModeration,
+        current_user: User = Depends(get_current_admin_user),
+        db: Session = Depends(get_db)
+    ) -> dict:
+        """批量审核通过"""
+        return self.comment_service.approve_comments(moderation, db)
+    
+    def reject_comments(
+        self,
+        moderation: CommentModeration,
+        current_user: User = Depends(get_current_admin_user),
+        db: Session = Depends(get_db)
+    ) -> dict:
+        """批量拒绝"""
+        return self.comment_service.reject_comments(moderation, db)
+
+# 创建控制器实例
+comment_controller = CommentController()
@@ -0,0 +1,52 @@
+
+from typing import List
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from ..database import get_db, get_read_db
+from ..models import User
+from ..schemas import TagCreate, TagUpdate, TagResponse, TagCloudItem
+from ..services.tag_service import TagService
+from ..auth import get_current_admin_user
+
+class TagController:
+    def __init__(self):
+        self.tag_service = TagService()
+    
+    def get_tags(self, db: Session = Depends(get_read_db)) -> List[TagResponse]:
+        """获取全部标签"""
+        return self.tag_service.get_tags(db)
+    
+    def get_tag_cloud(self, db: Session = Depends(get_read_db)) -> List[TagCloudItem]:
+        """获取标签云"""
+        return self.tag_service.get_tag_cloud(db)
+    
+    def create_tag(
+        self,
+        tag: TagCreate,
+        current_user: User = Depends(get_current_admin_user),
+        db: Session = Depends(get_db)
+    ) -> TagResponse:
+        """创建标签"""
+        return self.tag_service.create_tag(tag, db)
+    
+    def update_tag(
+        self,
+        tag_id: int,
+        tag_update: TagUpdate,
+        current_user: User = Depends(get_current_admin_user),
+        db: Session = Depends(get_db)
+    ) -> TagResponse:
+        """更新标签"""
+        return self.tag_service.update_tag(tag_id, tag_update, db)
+    
+    def delete_tag(
+        self,
+        tag_id: int,
+        current_user: User = Depends(get_current_admin_user),
+        db: Session = Depends(get_db)
+    ) -> dict:
+        """删除标签"""
+        return self.tag_service.delete_tag(tag_id, db)
+
+# 创建控制器实例
+tag_controller = TagController()
@@ -0,0 +1,232 @@
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .models import Article
+
+logger = logging.getLogger(__name__)
+
+# 配置
+COUNTER_FLUSH_INTERVAL = float(os.getenv("COUNTER_FLUSH_INTERVAL", "5"))
+COUNTER_FLUSH_THRESHOLD = int(os.getenv("COUNTER_FLUSH_THRESHOLD", "1000"))
+# 点赞计数模式：atomic 为每次点赞在数据库中原子自增，buffered 为先进缓冲区再批量写回（适合爆款文章）
+LIKE_COUNTER_MODE = os.getenv("LIKE_COUNTER_MODE", "atomic")
+
+
+def increment(db: Session, column, article_id: int, n: int = 1) -> Optional[Tuple[int, Optional[str]]]:
+    """在数据库中原子地执行 col = col + n（NULL 按 0 计），返回 (新值, 文章分类)；文章不存在时返回 None
+
+    不提交事务：调用方可以在同一事务中写入相关的汇总后再提交。
+    """
+    stmt = (
+        update(Article)
+        .where(Article.id == article_id)
+        .values({column: func.coalesce(column, 0) + n, Article.updated_at: Article.updated_at})
+        .execution_options(synchronize_session=False)
+    )
+    if db.get_bind().dialect.update_returning:
+        row = db.execute(stmt.returning(column, Article.category)).first()
+    else:
+        if db.execute(stmt).rowcount == 0:
+            return None
+        row = db.execute(select(column, Article.category).where(Article.id == article_id)).first()
+    if row is None:
+        db.rollback()
+        return None
+    return row[0], row[1]
+
+
+class BackgroundFlusher:
+    """后台刷新线程：定时（或被唤醒时）把各缓冲区写回数据库"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._targets = []
+        # 目标各自的刷新间隔（秒）和上次刷新时间；未指定间隔的每轮都刷新
+        self._intervals: Dict[int, float] = {}
+        self._last_flush: Dict[int, float] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def register(self, target, interval: Optional[float] = None):
+        """注册需要定期刷新的对象（需提供 flush 方法）；interval 指定时至少间隔这么久才刷新一次"""
+        self._targets.append(target)
+        if interval is not None:
+            self._intervals[id(target)] = interval
+        return target
+
+    def start(self):
+        """启动后台线程"""
+        if self.is_running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="counter-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止后台线程并做最后一次刷新"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush_all()
+
+    def wake(self):
+        """提前触发一次刷新"""
+        self._wake.set()
+
+    def flush_all(self, due_only: bool = False):
+        """刷新所有已注册的缓冲区；due_only 为 True 时跳过还没到刷新间隔的目标"""
+        now = time.monotonic()
+        for target in self._targets:
+            interval = self._intervals.get(id(target))
+            if due_only and interval is not None and now - self._last_flush.get(id(target), 0) < interval:
+                continue
+            self._last_flush[id(target)] = now
+            try:
+                target.flush()
+            except Exception:
+                logger.exception("刷新计数缓冲区失败")
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush_all(due_only=True)
+
+
+class CounterBuffer:
+    """进程内计数缓冲区：合并同一文章的增量，按篇批量执行 UPDATE ... SET col = col + n
+
+    on_flush(db, 列名, {文章ID: 增量}) 在写回的同一事务中调用（服务层用它维护汇总表）。
+    提交在锁外进行；_generation 在每批提交前后各加一（提交进行中为奇数），读取方据此判断
+    读到的数据库值是否已包含正在写回的批次。
+    """
+
+    def __init__(
+        self,
+        column,
+        flusher: BackgroundFlusher,
+        flush_threshold: int = COUNTER_FLUSH_THRESHOLD,
+        on_flush: Optional[Callable[[Session, str, Dict[int, int]], None]] = None
+    ):
+        self.column = column
+        self.flusher = flusher
+        self.flush_threshold = flush_threshold
+        self.on_flush = on_flush
+        self._pending: Dict[int, int] = defaultdict(int)
+        self._inflight: Dict[int, int] = {}
+        self._pending_total = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def incr(self, article_id: int, n: int = 1):
+        """记录一次增量"""
+        with self._lock:
+            self._pending[article_id] += n
+            self._pending_total += n
+            over_threshold = self._pending_total >= self.flush_threshold
+        if over_threshold:
+            # 只唤醒后台线程，不在请求中同步写回：写回失败不应让读请求报错
+            # （后台线程未启动时，脚本需要自行调用 flush）
+            self.flusher.wake()
+
+    def generation(self) -> int:
+        """当前写回代数，在读取数据库中的计数之前取"""
+        with self._lock:
+            return self._generation
+
+    def pending(self, article_id: int, since: Optional[int] = None) -> Optional[int]:
+        """某篇文章尚未写入数据库的增量；since 为读取数据库之前的代数，期间有一批增量提交时返回 None"""
+        with self._lock:
+            if since is not None and (since != self._generation or since % 2):
+                return None
+            return self._pending.get(article_id, 0) + self._inflight.get(article_id, 0)
+
+    def value(self, article_id: int, stored: Optional[int], since: int, reload: Callable[[], Optional[int]]) -> int:
+        """数据库中的计数 stored 加上尚未写回的增量；读取期间有一批增量提交时用 reload 重读数据库"""
+        for _ in range(3):
+            extra = self.pending(article_id, since)
+            if extra is not None:
+                return (stored or 0) + extra
+            since = self.generation()
+            stored = reload()
+        # 一直与写回重叠：返回近似值，最多差一批增量
+        return (stored or 0) + self.pending(article_id)
+
+    def pending_total(self) -> int:
+        """所有文章尚未写入数据库的增量之和"""
+        with self._lock:
+            return self._pending_total + sum(self._inflight.values())
+
+    def flush(self) -> int:
+        """把缓冲的增量写回数据库，返回写入的增量总数"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch = dict(self._pending)
+                self._inflight = batch
+                self._pending = defaultdict(int)
+                self._pending_total = 0
+
+            table = Article.__table__
+            column = table.c[self.column.key]
+            stmt = (
+                table.update()
+                .where(table.c.id == bindparam("_article_id"))
+                # 显式保留 updated_at，计数变化不算作文章修改
+                .values({column: func.coalesce(column, 0) + bindparam("_delta"), table.c.updated_at: table.c.updated_at})
+            )
+            params = [{"_article_id": article_id, "_delta": n} for article_id, n in batch.items()]
+
+            db = SessionLocal()
+            committing = False
+            try:
+                db.execute(stmt, params)
+                if self.on_flush is not None:
+                    self.on_flush(db, self.column.key, batch)
+                # 提交不持有 _lock，不阻塞 incr()/pending()；提交期间代数为奇数
+                with self._lock:
+                    self._generation += 1
+                committing = True
+                db.commit()
+                with self._lock:
+                    self._inflight = {}
+                    self._generation += 1
+            except Exception:
+                db.rollback()
+                # 写回失败时把增量放回缓冲区，留待下次刷新
+                with self._lock:
+                    self._inflight = {}
+                    if committing:
+                        self._generation += 1
+                    for article_id, n in batch.items():
+                        self._pending[article_id] += n
+                        self._pending_total += n
+                raise
+            finally:
+                db.close()
+
+            return sum(batch.values())
+
+
+# 全局实例
+flusher = BackgroundFlusher(COUNTER_FLUSH_INTERVAL)
+view_counter = flusher.register(CounterBuffer(Article.views, flusher))
+like_counter = flusher.register(CounterBuffer(Article.likes, flusher))
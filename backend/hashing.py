@@ -0,0 +1,115 @@
+
+"""
+密码哈希
+
+bcrypt 每次计算要占用一个 CPU 约 250 ms，这里把它放到独立的有界执行器中运行，
+不占用事件循环和处理文章请求的线程池；排队的任务过多时直接返回 503。
+本模块只依赖 passlib，进程池的子进程导入它时不会加载数据库等模块；
+passlib 在第一次计算哈希时才导入，不计入应用的启动时间。
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+# 配置
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# 执行器类型：thread（bcrypt 计算时会释放 GIL）或 process
+PASSWORD_HASH_POOL = os.getenv("PASSWORD_HASH_POOL", "thread")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 同时排队和执行的哈希任务上限，超过时拒绝请求
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+
+_pwd_context = None
+
+
+def get_pwd_context():
+    """密码加密上下文：低于当前轮数的旧哈希会在登录时被重新计算"""
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__rounds=BCRYPT_ROUNDS,
+            bcrypt__min_rounds=BCRYPT_ROUNDS,
+        )
+    return _pwd_context
+
+
+def _hash(password: str) -> str:
+    return get_pwd_context().hash(password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """在有界执行器中异步计算密码哈希"""
+
+    def __init__(self, pool: str, workers: int, max_pending: int):
+        self.pool = pool
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.pool == "process":
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="请求过多，请稍后再试",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """计算密码哈希"""
+        return await self._run(_hash, password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """验证密码；哈希参数过时时同时返回新哈希，否则第二项为 None"""
+        return await self._run(_verify_and_update, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "pool": self.pool,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        """关闭执行器"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# 全局实例
+password_hasher = PasswordHasher(PASSWORD_HASH_POOL, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
@@ -0,0 +1,68 @@
+
+"""
+HTTP 条件请求（ETag / Last-Modified / 304）
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """由若干字段生成强 ETag"""
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    """datetime（UTC，可不带时区）转 HTTP 日期"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value, usegmt=True)
+
+
+def is_conditional(request: Request) -> bool:
+    """请求是否带了条件头"""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """按 RFC 9110 判断是否可以返回 304：有 If-None-Match 时忽略 If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # GET 使用弱比较，忽略 W/ 前缀
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = last_modified.replace(microsecond=0)
+        if modified.tzinfo is None:
+            modified = modified.replace(tzinfo=timezone.utc)
+        return modified <= since
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]):
+    """在响应上设置 ETag / Last-Modified，并要求缓存每次重新验证"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    """304 响应"""
+    response = Response(status_code=304)
+    set_validators(response, etag, last_modified)
+    return response
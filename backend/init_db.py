@@ -1,18 +1,62 @@
 
 """
 数据库初始化脚本
-创建初始管理员用户和示例数据
+创建初始管理员用户和示例数据：python -m backend.init_db
+
+生成大规模合成数据（用于压测和查找扩展瓶颈）：
+    python -m backend.init_db --scale 1000000 [--seed 42] [--batch-size 5000] [--jobs 8] [--no-search-index]
+
+--scale N 生成 N 篇文章，以及按比例生成的用户、标签、文章标签和评论；
+同一 seed 生成完全相同的数据。数据用 Core 批量插入，每批一个事务。
 """
+import argparse
+import bisect
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
-from database import SessionLocal, engine
-from models import Base, User, Article
-from auth import get_password_hash
-from datetime import datetime
+from .database import SessionLocal, get_engine
+from .models import User, Article, ArticleTag, Comment, Tag
+from .auth import get_password_hash
+from .migrations import run_migrations
+from .search import article_document, search_index
+from .services.stats_service import SiteStatsService
+from datetime import datetime, timedelta
+
+# 合成数据的比例和分布
+SEED_ARTICLES_PER_USER = 20
+SEED_MAX_TAGS = 2000
+SEED_BATCH_SIZE = 5000
+SEED_START = datetime(2020, 1, 1)
+SEED_SPAN = timedelta(days=5 * 365)
+SEED_STATUSES = [("已发布", 85), ("草稿", 12), ("已下线", 3)]
+SEED_CATEGORIES = [("技术", 40), ("编程", 25), ("思考", 15), ("生活", 12), ("读书", 8)]
+
+SEED_WORDS = [
+    "Python", "数据库", "前端", "性能", "缓存", "异步", "索引", "架构", "测试", "部署", "算法", "网络",
+    "并发", "安全", "容器", "监控", "日志", "编译器", "操作系统", "分布式", "消息队列", "机器学习",
+]
+SEED_QUALIFIERS = ["入门", "实战", "原理", "优化", "踩坑", "笔记", "设计", "源码", "进阶", "指南"]
+SEED_PHRASES = [
+    "在实际项目中", "我们需要认真考虑", "性能和可维护性之间的取舍", "这个问题并没有标准答案",
+    "先从最简单的方案开始", "然后根据监控数据逐步优化", "很多团队在这里踩过坑", "代码的可读性同样重要",
+    "测试覆盖率并不能说明一切", "上线之前一定要做压测", "数据量增长之后", "原来的设计就不再适用",
+    "缓存可以显著降低数据库的压力", "但也带来了一致性的问题", "索引的选择取决于查询模式",
+    "异步并不总是更快", "瓶颈往往出现在意想不到的地方", "回过头来看", "这次重构的收益非常明显",
+    "读者朋友们可以在评论区分享自己的经验", "下面通过一个具体的例子来说明", "总结一下",
+]
+SEED_COMMENT_PHRASES = [
+    "写得很好", "受益匪浅", "有一个问题想请教", "我们团队也遇到过类似的情况", "期待下一篇",
+    "这里的例子能再详细一点吗", "收藏了", "感谢分享", "和我的经验不太一样", "学习了",
+]
 
 def init_database():
     """初始化数据库"""
     print("创建数据库表...")
-    Base.metadata.create_all(bind=engine)
+    run_migrations(verbose=True)
     
     db = SessionLocal()
     
@@ -87,15 +131,25 @@ def init_database():
                 }
             ]
             
+            articles = []
             for article_data in sample_articles:
                 article = Article(**article_data)
                 if article_data["status"] == "已发布":
                     article.published_at = datetime.utcnow()
                 db.add(article)
+                articles.append(article)
             
+            # 写入检索索引（与文章在同一事务中）
+            db.flush()
+            for article in articles:
+                search_index.index_article(db, article)
             db.commit()
             print("示例文章创建成功！")
         
+        # 示例数据没有经过服务层，重算统计汇总
+        SiteStatsService().reconcile(db)
+        db.commit()
+        
         print("数据库初始化完成！")
     
     except Exception as e:
@@ -105,5 +159,214 @@ def init_database():
     finally:
         db.close()
 
+class SyntheticDataGenerator:
+    """按固定种子生成合成数据：作者、标签的热度和文章的浏览量、点赞数、评论数都是长尾分布"""
+    
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        # 正文从一段预先生成的语料中截取，避免逐字生成
+        phrases, size = [], 0
+        while size < 200_000:
+            phrases.append(self.rng.choice(SEED_PHRASES) + self.rng.choice("，，，。"))
+            size += len(phrases[-1])
+        self.corpus = "".join(phrases) * 2
+        self.corpus_size = len(self.corpus) // 2
+        self.status_weights = list(itertools.accumulate(weight for _, weight in SEED_STATUSES))
+        self.category_weights = list(itertools.accumulate(weight for _, weight in SEED_CATEGORIES))
+    
+    def pick(self, items: list, cum_weights: list):
+        return items[bisect.bisect(cum_weights, self.rng.random() * cum_weights[-1])]
+    
+    def zipf_weights(self, n: int, exponent: float = 1.1) -> list:
+        """第 k 个元素的权重为 1/k^exponent（累计值）"""
+        return list(itertools.accumulate(1 / (k ** exponent) for k in range(1, n + 1)))
+    
+    def text(self, median: int, sigma: float, low: int, high: int) -> str:
+        """对数正态分布长度的中文文本"""
+        length = max(low, min(high, int(self.rng.lognormvariate(0, sigma) * median)))
+        start = self.rng.randrange(self.corpus_size)
+        return self.corpus[start:start + length]
+    
+    def tag_names(self, count: int) -> list:
+        names = [f"{word}{qualifier}" for qualifier in [""] + SEED_QUALIFIERS for word in SEED_WORDS]
+        names += [f"话题{i}" for i in range(max(0, count - len(names)))]
+        return names[:count]
+    
+    def article(self, article_id: int, author_id: int, created_at: datetime) -> dict:
+        status = self.pick(SEED_STATUSES, self.status_weights)[0]
+        body = self.text(1500, 0.6, 200, 20000)
+        paragraphs = "".join(f"<p>{body[i:i + 300]}</p>" for i in range(0, len(body), 300))
+        first, second = self.rng.sample(SEED_WORDS, 2)
+        # 浏览量中位数约 150，少数文章达到数十万；点赞约为浏览量的 3%
+        views = int(self.rng.lognormvariate(5, 1.5)) if status == "已发布" else 0
+        return {
+            "id": article_id,
+            "title": f"{first}与{second}{self.rng.choice(SEED_QUALIFIERS)}：{body[:self.rng.randint(6, 20)]}",
+            "content": f"<h2>{first}</h2>{paragraphs}",
+            "excerpt": body[:120],
+            "category": self.pick(SEED_CATEGORIES, self.category_weights)[0],
+            "status": status,
+            "views": views,
+            "likes": int(views * self.rng.betavariate(1, 30)),
+            "author_id": author_id,
+            "created_at": created_at,
+            "updated_at": created_at + timedelta(hours=self.rng.random() * 48),
+            "published_at": created_at + timedelta(minutes=self.rng.random() * 600) if status == "已发布" else None,
+        }
+    
+    def comments(self, article: dict, next_id: int) -> list:
+        """评论数与浏览量成正比；约 30% 是对同一文章中已审核评论的回复"""
+        if article["status"] != "已发布":
+            return []
+        count = min(int(self.rng.expovariate(1) * article["views"] / 100), 300)
+        rows, approved = [], []
+        created_at = article["published_at"]
+        for comment_id in range(next_id, next_id + count):
+            created_at += timedelta(minutes=self.rng.expovariate(1 / 600))
+            parent_id = self.rng.choice(approved) if approved and self.rng.random() < 0.3 else None
+            is_approved = self.rng.random() < 0.9
+            rows.append({
+                "id": comment_id,
+                "content": self.rng.choice(SEED_COMMENT_PHRASES) + "，" + self.text(40, 0.8, 5, 500),
+                "author_name": f"读者{self.rng.randrange(100000)}",
+                "author_email": f"reader{self.rng.randrange(100000)}@example.com",
+                "article_id": article["id"],
+                "parent_id": parent_id,
+                "is_approved": is_approved,
+                "created_at": created_at,
+            })
+            if is_approved:
+                approved.append(comment_id)
+        return rows
+
+
+def _search_document(article: tuple) -> dict:
+    return article_document(*article)
+
+
+def _next_id(conn, model) -> int:
+    return (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def seed_synthetic(
+    scale: int,
+    seed: int = 42,
+    batch_size: int = SEED_BATCH_SIZE,
+    build_search_index: bool = True,
+    jobs: int = 1,
+    verbose: bool = True
+) -> dict:
+    """生成 scale 篇文章及相应的用户、标签、文章标签和评论，返回各表写入的行数
+
+    检索索引的中文切分是主要的 CPU 开销，jobs 大于 1 时在多个进程中并行切分。
+    """
+    generator = SyntheticDataGenerator(seed)
+    rng = generator.rng
+    users = max(1, scale // SEED_ARTICLES_PER_USER)
+    tags = min(SEED_MAX_TAGS, max(20, scale // 100))
+    counts = {"users": users, "articles": scale, "tags": 0, "article_tags": 0, "comments": 0}
+    started = time.perf_counter()
+    
+    with get_engine().begin() as conn:
+        user_id = _next_id(conn, User)
+        article_id = _next_id(conn, Article)
+        link_id = _next_id(conn, ArticleTag)
+        comment_id = _next_id(conn, Comment)
+        
+        # 用户共用同一个密码哈希（bcrypt 逐个计算太慢），密码为 password123
+        password = get_password_hash("password123")
+        user_ids = list(range(user_id, user_id + users))
+        for start in range(0, users, batch_size):
+            conn.execute(insert(User), [
+                {
+                    "id": uid,
+                    "username": f"seed_user_{uid}",
+                    "email": f"seed_user_{uid}@example.com",
+                    "hashed_password": password,
+                    "is_admin": False,
+                    "is_active": True,
+                    "created_at": SEED_START,
+                    "updated_at": SEED_START,
+                }
+                for uid in user_ids[start:start + batch_size]
+            ])
+        
+        existing = set(conn.execute(select(Tag.name)).scalars())
+        names = [name for name in generator.tag_names(tags + len(existing)) if name not in existing][:tags]
+        if names:
+            conn.execute(insert(Tag), [{"name": name, "created_at": SEED_START} for name in names])
+        tag_ids = list(conn.execute(select(Tag.id).where(Tag.name.in_(names)).order_by(Tag.id)).scalars())
+        counts["tags"] = len(tag_ids)
+    
+    author_weights = generator.zipf_weights(len(user_ids))
+    tag_weights = generator.zipf_weights(len(tag_ids)) if tag_ids else []
+    step = SEED_SPAN / max(scale, 1)
+    executor = ProcessPoolExecutor(max_workers=jobs) if build_search_index and jobs > 1 else None
+    
+    for start in range(0, scale, batch_size):
+        articles, links, comments = [], [], []
+        for i in range(start, min(start + batch_size, scale)):
+            article = generator.article(
+                article_id,
+                generator.pick(user_ids, author_weights),
+                SEED_START + step * i + timedelta(seconds=rng.random() * 60)
+            )
+            articles.append(article)
+            if tag_ids:
+                for tag_id in {generator.pick(tag_ids, tag_weights) for _ in range(rng.randint(1, 4))}:
+                    links.append({"id": link_id, "article_id": article_id, "tag_id": tag_id})
+                    link_id += 1
+            article_comments = generator.comments(article, comment_id)
+            comments.extend(article_comments)
+            comment_id += len(article_comments)
+            article_id += 1
+        
+        documents = []
+        if build_search_index:
+            fields = [(a["id"], a["title"], a["excerpt"], a["content"]) for a in articles]
+            if executor is not None:
+                documents = list(executor.map(_search_document, fields, chunksize=max(1, len(fields) // (jobs * 4))))
+            else:
+                documents = [_search_document(f) for f in fields]
+        
+        # 每批一个事务
+        with get_engine().begin() as conn:
+            conn.execute(insert(Article), articles)
+            if links:
+                conn.execute(insert(ArticleTag), links)
+            if comments:
+                conn.execute(insert(Comment), comments)
+            search_index.index_documents(conn, documents)
+        counts["article_tags"] += len(links)
+        counts["comments"] += len(comments)
+        
+        if verbose:
+            done = start + len(articles)
+            elapsed = time.perf_counter() - started
+            print(f"  {done}/{scale} 篇文章，{counts['comments']} 条评论，{elapsed:.1f}s（{done / elapsed:.0f} 篇/秒）")
+    
+    if executor is not None:
+        executor.shutdown()
+    with get_engine().begin() as conn:
+        SiteStatsService().reconcile(conn)
+    return counts
+
+
 if __name__ == "__main__":
-    init_database()
+    parser = argparse.ArgumentParser(description="数据库初始化")
+    parser.add_argument("--scale", type=int, default=0, help="生成指定篇数的合成文章（及相应的用户、标签、评论）")
+    parser.add_argument("--seed", type=int, default=42, help="合成数据的随机种子")
+    parser.add_argument("--batch-size", type=int, default=SEED_BATCH_SIZE, help="每个事务插入的文章数")
+    parser.add_argument("--no-search-index", action="store_true",
+                        help="不写全文检索索引（之后可运行 python -m backend.rebuild_search_index）")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="并行切分检索索引的进程数")
+    args = parser.parse_args()
+    
+    if args.scale > 0:
+        run_migrations(verbose=True)
+        print(f"生成 {args.scale} 篇合成文章（seed={args.seed}）...")
+        started = time.perf_counter()
+        counts = seed_synthetic(args.scale, args.seed, args.batch_size, not args.no_search_index, args.jobs)
+        print(f"合成数据生成完成，用时 {time.perf_counter() - started:.1f}s：{counts}")
+    else:
+        init_database()
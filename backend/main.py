@@ -1,43 +1,105 @@
 
+import logging
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
-from .routers import auth, articles, admin
-
-# 创建数据库表
-Base.metadata.create_all(bind=engine)
-
-# 初始化 FastAPI 应用
-app = FastAPI(
-    title="个人博客 API",
-    version="1.0.0",
-    description="基于 FastAPI 的个人博客后端 API"
-)
-
-# CORS 配置
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173"],  # Vite 默认端口
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# 注册路由
-app.include_router(auth.router)
-app.include_router(articles.router)
-app.include_router(admin.router)
-
-@app.get("/")
+from fastapi.responses import PlainTextResponse
+from .database import DB_MODE, dispose_async_engine
+from .counters import flusher
+from .hashing import password_hasher
+from .metrics import METRICS_ENABLED, MetricsMiddleware, render_metrics
+from .query_inspector import QUERY_INSPECTOR, QueryInspectorMiddleware
+from .migrations import pending_migrations, run_migrations
+
+logger = logging.getLogger(__name__)
+
+# 启动时自动应用未执行的迁移：只适合单进程的开发环境。
+# 生产环境在部署时执行一次 python -m backend.migrations，避免多个 worker 同时执行 DDL
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "0") == "1"
+
+def check_migrations():
+    """AUTO_MIGRATE 时应用迁移；否则有必需的迁移未应用时拒绝启动，只缺可选迁移时记录警告"""
+    if AUTO_MIGRATE:
+        run_migrations()
+        return
+    required = pending_migrations(required_only=True)
+    if required:
+        raise RuntimeError(f"有未应用的数据库迁移 {required}，请先执行 python -m backend.migrations")
+    pending = pending_migrations()
+    if pending:
+        logger.warning("有未应用的可选数据库迁移 %s，相关功能已降级", pending)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """启动：检查（或应用）迁移，启动计数刷新线程；关闭：写回计数，关闭密码哈希执行器和异步连接池"""
+    check_migrations()
+    flusher.start()
+    try:
+        yield
+    finally:
+        flusher.stop()
+        password_hasher.shutdown()
+        await dispose_async_engine()
+
+def create_app() -> FastAPI:
+    """创建应用：导入和创建都不连接数据库，数据库相关的启动工作在 lifespan 中完成"""
+    app = FastAPI(
+        title="个人博客 API",
+        version="1.0.0",
+        description="基于 FastAPI 的个人博客后端 API",
+        lifespan=lifespan
+    )
+
+    # CORS 配置
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:5173"],  # Vite 默认端口
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # 开发环境的 SQL 检查：按请求分组查询，记录 N+1 和慢查询（QUERY_INSPECTOR=1 时启用）
+    if QUERY_INSPECTOR:
+        app.add_middleware(QueryInspectorMiddleware)
+
+    # 请求指标：按路由记录延迟直方图，抽样请求返回 Server-Timing（放在最外层，计入其他中间件的耗时）
+    if METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
+    # 注册路由：DB_MODE=async 时使用异步会话版本，路径和响应与同步版本一致
+    if DB_MODE == "async":
+        from .routers import async_auth as auth, async_articles as articles, async_admin as admin, async_tags as tags, async_comments as comments
+    else:
+        from .routers import auth, articles, admin, tags, comments
+
+    app.include_router(auth.router)
+    app.include_router(articles.router)
+    app.include_router(admin.router)
+    app.include_router(tags.router)
+    app.include_router(comments.router)
+
+    app.add_api_route("/", root, methods=["GET"])
+    app.add_api_route("/health", health_check, methods=["GET"])
+    app.add_api_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
+    return app
+
 def root():
     """根路径"""
     return {"message": "个人博客 API 服务正在运行"}
 
-@app.get("/health")
 def health_check():
     """健康检查"""
     return {"status": "healthy"}
 
+def metrics():
+    """Prometheus 指标：请求延迟、连接池、缓存"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+app = create_app()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
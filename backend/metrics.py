@@ -0,0 +1,220 @@
+
+"""
+请求指标
+
+- MetricsMiddleware：按路由模板（如 /api/articles/{article_id}）记录请求延迟直方图和状态码计数
+- 抽样请求（METRICS_SAMPLE_RATE）额外统计 SQL 查询次数和数据库耗时，通过 Server-Timing 响应头返回，
+  并按路由累加；未抽样的请求只做一次上下文变量查询，开销可以忽略
+- render_metrics：Prometheus 文本格式，包含请求、连接池和缓存统计，由 /metrics 接口返回
+"""
+import bisect
+import os
+import random
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .cache import caches
+from .database import get_pool_stats
+
+# 配置
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# 统计 SQL 并返回 Server-Timing 的请求比例（0～1）
+METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", "0.1"))
+
+# 延迟直方图的桶上限（秒）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 未匹配任何路由的请求（404 等）归为一类，避免标签数量随路径无限增长
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class QueryStats:
+    """一个请求内的 SQL 查询次数和耗时"""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+# 当前请求的查询统计；未抽样或不在请求中时为 None
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _query_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _query_stats.get()
+    if stats is not None:
+        started = conn.info.get("query_started")
+        if started:
+            stats.seconds += time.perf_counter() - started.pop()
+        stats.queries += 1
+
+
+class LatencyHistogram:
+    """累计直方图（Prometheus histogram 语义）"""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+
+class RequestMetrics:
+    """按 (method, route) 汇总的请求指标；只在事件循环线程中更新，不需要加锁"""
+
+    def __init__(self):
+        self.latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.responses: Dict[Tuple[str, str, int], int] = {}
+        self.sampled: Dict[Tuple[str, str], List[float]] = {}
+        self.in_progress = 0
+
+    def record(self, method: str, route: str, status: int, seconds: float, queries: Optional[QueryStats]):
+        key = (method, route)
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = LatencyHistogram()
+        histogram.observe(seconds)
+        self.responses[(method, route, status)] = self.responses.get((method, route, status), 0) + 1
+        if queries is not None:
+            # [抽样请求数, 查询次数, 数据库耗时]
+            sampled = self.sampled.setdefault(key, [0, 0, 0.0])
+            sampled[0] += 1
+            sampled[1] += queries.queries
+            sampled[2] += queries.seconds
+
+    def reset(self):
+        self.latency.clear()
+        self.responses.clear()
+        self.sampled.clear()
+
+
+request_metrics = RequestMetrics()
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def server_timing(queries: QueryStats, seconds: float) -> str:
+    return f'db;desc="{queries.queries} queries";dur={queries.seconds * 1000:.2f}, app;dur={seconds * 1000:.2f}'
+
+
+class MetricsMiddleware:
+    """纯 ASGI 中间件，不缓冲响应体"""
+
+    def __init__(self, app, sample_rate: float = METRICS_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = QueryStats() if self.sample_rate > 0 and random.random() < self.sample_rate else None
+        token = _query_stats.set(queries)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if queries is not None:
+                    header = server_timing(queries, time.perf_counter() - started)
+                    message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header.encode())]}
+            await send(message)
+
+        request_metrics.in_progress += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_metrics.in_progress -= 1
+            _query_stats.reset(token)
+            request_metrics.record(
+                scope["method"], _route_template(scope), status, time.perf_counter() - started, queries
+            )
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _numeric_stats(stats: dict) -> Dict[str, float]:
+    return {
+        key: value for key, value in stats.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+
+
+def render_metrics() -> str:
+    """Prometheus 文本格式（0.0.4）"""
+    lines = [
+        "# HELP blog_http_request_duration_seconds 请求延迟（按路由模板）",
+        "# TYPE blog_http_request_duration_seconds histogram",
+    ]
+    for (method, route), histogram in sorted(request_metrics.latency.items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+            cumulative += count
+            lines.append(f"blog_http_request_duration_seconds_bucket{_labels(method=method, route=route, le=bound)} {cumulative}")
+        lines.append(f"blog_http_request_duration_seconds_bucket{_labels(method=method, route=route, le='+Inf')} {histogram.count}")
+        lines.append(f"blog_http_request_duration_seconds_sum{_labels(method=method, route=route)} {histogram.total}")
+        lines.append(f"blog_http_request_duration_seconds_count{_labels(method=method, route=route)} {histogram.count}")
+
+    lines += ["# HELP blog_http_responses_total 响应数（按状态码）", "# TYPE blog_http_responses_total counter"]
+    for (method, route, status), count in sorted(request_metrics.responses.items()):
+        lines.append(f"blog_http_responses_total{_labels(method=method, route=route, status=status)} {count}")
+
+    lines += ["# HELP blog_http_requests_in_progress 正在处理的请求数", "# TYPE blog_http_requests_in_progress gauge"]
+    lines.append(f"blog_http_requests_in_progress {request_metrics.in_progress}")
+
+    sampled_metrics = (
+        ("blog_http_sampled_requests_total", "统计了 SQL 的抽样请求数", 0),
+        ("blog_db_queries_total", "抽样请求执行的 SQL 查询数", 1),
+        ("blog_db_query_seconds_total", "抽样请求的数据库耗时", 2),
+    )
+    for name, help_text, index in sampled_metrics:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for (method, route), values in sorted(request_metrics.sampled.items()):
+            lines.append(f"{name}{_labels(method=method, route=route)} {values[index]}")
+
+    pool_stats = {name: _numeric_stats(stats) for name, stats in get_pool_stats().items()}
+    for key in sorted({key for stats in pool_stats.values() for key in stats}):
+        lines += [f"# HELP blog_db_pool_{key} 连接池统计 {key}", f"# TYPE blog_db_pool_{key} gauge"]
+        for name, stats in sorted(pool_stats.items()):
+            if key in stats:
+                lines.append(f"blog_db_pool_{key}{_labels(engine=name)} {stats[key]}")
+
+    cache_stats = {name: _numeric_stats(cache.stats()) for name, cache in caches.items()}
+    for key in sorted({key for stats in cache_stats.values() for key in stats}):
+        lines += [f"# HELP blog_cache_{key} 缓存统计 {key}", f"# TYPE blog_cache_{key} gauge"]
+        for name, stats in sorted(cache_stats.items()):
+            if key in stats:
+                lines.append(f"blog_cache_{key}{_labels(cache=name)} {stats[key]}")
+
+    return "\n".join(lines) + "\n"
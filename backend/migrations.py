@@ -0,0 +1,316 @@
+
+"""
+数据库迁移
+
+按版本号顺序执行 MIGRATIONS 中尚未应用的迁移，每个迁移在独立事务中执行，
+已应用的版本记录在 schema_migrations 表中。迁移返回 False 表示当前数据库还不能应用
+（例如不支持全文检索），不记录版本，下次执行迁移时再尝试。可选迁移（optional=True）
+未应用时服务仍可启动，其余迁移未应用时服务拒绝启动。
+
+用法：
+    python -m backend.migrations             # 应用所有未执行的迁移
+    python -m backend.migrations --status    # 查看迁移状态
+    python -m backend.migrations --explain   # 打印热点查询的执行计划
+"""
+import argparse
+from collections import namedtuple
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text, desc, func, insert, inspect, select,
+    text
+)
+from sqlalchemy.engine import Connection, Engine
+
+from .database import get_engine
+from .models import Article, ArticleTag, ArticleTrending, ArticleVisitorSketch, Comment, SiteStats, Tag
+from .query_inspector import explain_prefix
+from .search import search_index
+from .services.stats_service import SiteStatsService
+
+Migration = namedtuple("Migration", ["version", "description", "upgrade", "optional"], defaults=[False])
+
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+# 迁移 1 创建的基础表，冻结为首个版本的结构；之后的模型变更（索引、新表、新列）都通过新的迁移完成
+baseline_metadata = MetaData()
+
+Table(
+    "users",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("username", String(50), unique=True, index=True, nullable=False),
+    Column("email", String(100), unique=True, index=True, nullable=False),
+    Column("hashed_password", String(255), nullable=False),
+    Column("is_admin", Boolean),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "articles",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String(200), index=True, nullable=False),
+    Column("content", Text, nullable=False),
+    Column("excerpt", Text),
+    Column("category", String(50)),
+    Column("status", String(20)),
+    Column("image", String(500)),
+    Column("views", Integer),
+    Column("likes", Integer),
+    Column("author_id", Integer, ForeignKey("users.id")),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("published_at", DateTime),
+)
+
+Table(
+    "tags",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String(50), unique=True, index=True, nullable=False),
+    Column("description", Text),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "article_tags",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("article_id", Integer, ForeignKey("articles.id")),
+    Column("tag_id", Integer, ForeignKey("tags.id")),
+)
+
+Table(
+    "comments",
+    baseline_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("content", Text, nullable=False),
+    Column("author_name", String(50), nullable=False),
+    Column("author_email", String(100), nullable=False),
+    Column("article_id", Integer, ForeignKey("articles.id")),
+    Column("parent_id", Integer, ForeignKey("comments.id")),
+    Column("is_approved", Boolean),
+    Column("created_at", DateTime),
+)
+
+
+def _create_indexes(*indexes):
+    def upgrade(conn: Connection):
+        for index in indexes:
+            index.create(conn, checkfirst=True)
+    return upgrade
+
+
+def _create_site_stats(conn: Connection):
+    SiteStats.__table__.create(conn, checkfirst=True)
+    SiteStatsService().reconcile(conn)
+
+
+def _create_tables(*tables):
+    def upgrade(conn: Connection):
+        for table in tables:
+            table.create(conn, checkfirst=True)
+    return upgrade
+
+
+def _add_columns(table, *names):
+    """给已有表补列（新库在迁移 1 中已经按模型建好，跳过）"""
+    def upgrade(conn: Connection):
+        existing = {column["name"] for column in inspect(conn).get_columns(table.name)}
+        for name in names:
+            if name in existing:
+                continue
+            column = table.c[name]
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(conn.dialect)}"
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            conn.execute(text(ddl))
+    return upgrade
+
+
+def _add_approved_comments(conn: Connection):
+    _add_columns(SiteStats.__table__, "approved_comments")(conn)
+    SiteStatsService().reconcile(conn)
+
+
+def _create_search_index(conn: Connection):
+    """创建检索表并为已有文章建立索引；数据库不支持全文检索时不记录版本，搜索回退到 LIKE 查询"""
+    search_index.ensure_schema(conn)
+    if not search_index.enabled:
+        return False
+    search_index.rebuild(conn)
+
+
+def _rebuild_search_index(conn: Connection):
+    search_index.ensure_schema(conn)
+    search_index.rebuild(conn)
+
+
+def _delete_orphan_comments(conn: Connection):
+    """删除文章已不存在的评论（汇总只统计现有文章的评论，不受影响）"""
+    conn.execute(Comment.__table__.delete().where(~Comment.article_id.in_(select(Article.id))))
+
+
+def _index(table, name):
+    return next(index for index in table.indexes if index.name == name)
+
+
+# 迁移列表：只能追加，不要修改已发布的迁移
+MIGRATIONS: List[Migration] = [
+    Migration(1, "创建基础表", lambda conn: baseline_metadata.create_all(conn)),
+    Migration(2, "创建全文检索表", _create_search_index, optional=True),
+    Migration(3, "文章、标签、评论的查询索引", _create_indexes(
+        _index(Article.__table__, "ix_articles_status_published_at"),
+        _index(Article.__table__, "ix_articles_status_category_published_at"),
+        _index(Article.__table__, "ix_articles_status_created_at"),
+        _index(Article.__table__, "ix_articles_created_at"),
+        _index(Article.__table__, "ix_articles_author_id"),
+        _index(ArticleTag.__table__, "ix_article_tags_article_id_tag_id"),
+        _index(ArticleTag.__table__, "ix_article_tags_tag_id_article_id"),
+        _index(Comment.__table__, "ix_comments_article_id"),
+    )),
+    Migration(4, "统计汇总表 site_stats", _create_site_stats),
+    Migration(5, "评论按文章、审核状态、时间的索引", _create_indexes(
+        _index(Comment.__table__, "ix_comments_article_id_is_approved_created_at"),
+    )),
+    Migration(6, "评论回复、待审核队列的索引", _create_indexes(
+        _index(Comment.__table__, "ix_comments_parent_id"),
+        _index(Comment.__table__, "ix_comments_is_approved_id"),
+    )),
+    Migration(7, "site_stats 增加已审核评论数", _add_approved_comments),
+    Migration(8, "文章每日独立访客草图", _create_tables(ArticleVisitorSketch.__table__)),
+    Migration(9, "文章热度快照", _create_tables(ArticleTrending.__table__)),
+    Migration(10, "重建全文检索索引（中文单字可检索）", _rebuild_search_index),
+    Migration(11, "清理已删除文章遗留的评论", _delete_orphan_comments),
+]
+
+
+def applied_versions(conn: Connection) -> set:
+    """已应用的迁移版本"""
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending_migrations(engine: Optional[Engine] = None, required_only: bool = False) -> List[int]:
+    """尚未应用的迁移版本（只读，不创建任何表）；required_only 时不含可选迁移"""
+    engine = engine or get_engine()
+    with engine.connect() as conn:
+        done = applied_versions(conn) if inspect(conn).has_table(schema_migrations.name) else set()
+    return sorted(
+        migration.version for migration in MIGRATIONS
+        if migration.version not in done and not (required_only and migration.optional)
+    )
+
+
+def run_migrations(engine: Optional[Engine] = None, verbose: bool = False) -> List[int]:
+    """执行尚未应用的迁移，返回本次应用的版本号"""
+    engine = engine or get_engine()
+    migration_metadata.create_all(engine)
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+
+    applied = []
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version in done:
+            continue
+        if verbose:
+            print(f"应用迁移 {migration.version}: {migration.description}")
+        with engine.begin() as conn:
+            if migration.upgrade(conn) is False:
+                if verbose:
+                    print(f"迁移 {migration.version} 暂不能应用，已跳过")
+                continue
+            conn.execute(insert(schema_migrations).values(
+                version=migration.version,
+                description=migration.description,
+                applied_at=datetime.utcnow()
+            ))
+        applied.append(migration.version)
+    return applied
+
+
+def hot_queries():
+    """热点查询，用于检查执行计划"""
+    published = Article.status == "已发布"
+    return {
+        "前台文章列表": select(Article.id).where(published)
+            .order_by(desc(Article.published_at), desc(Article.id)).limit(10),
+        "前台分类列表": select(Article.id).where(published, Article.category == "技术")
+            .order_by(desc(Article.published_at), desc(Article.id)).limit(10),
+        "后台按状态列表": select(Article.id).where(Article.status == "草稿")
+            .order_by(desc(Article.created_at), desc(Article.id)).limit(10),
+        "后台全部列表": select(Article.id)
+            .order_by(desc(Article.created_at), desc(Article.id)).limit(10),
+        "作者文章": select(Article.id).where(Article.author_id == 1),
+        "按状态计数": select(func.count()).select_from(Article).where(published),
+        "文章标签": select(ArticleTag.tag_id).where(ArticleTag.article_id == 1),
+        "标签文章": select(ArticleTag.article_id).where(ArticleTag.tag_id == 1),
+        "文章评论": select(Comment.id).where(Comment.article_id == 1),
+        "文章评论首层分页": select(Comment.id)
+            .where(Comment.article_id == 1, Comment.is_approved.is_(True), Comment.parent_id.is_(None))
+            .order_by(desc(Comment.created_at), desc(Comment.id)).limit(20),
+        "待审核评论队列": select(Comment.id).where(Comment.is_approved.is_(False), Comment.id > 0)
+            .order_by(Comment.id).limit(500),
+        "评论回复": select(Comment.id).where(Comment.parent_id == 1),
+        "热门文章快照": select(ArticleTrending.article_id)
+            .order_by(desc(ArticleTrending.score)).limit(100),
+        "文章独立访客草图": select(ArticleVisitorSketch.sketch)
+            .where(ArticleVisitorSketch.article_id == 1, ArticleVisitorSketch.day >= "2024-01-01"),
+        "标签过滤列表": select(Article.id)
+            .join(ArticleTag, ArticleTag.article_id == Article.id)
+            .join(Tag, Tag.id == ArticleTag.tag_id)
+            .where(published, Tag.name == "Python")
+            .order_by(desc(Article.published_at), desc(Article.id)).limit(10),
+    }
+
+
+def explain_hot_queries(engine: Optional[Engine] = None):
+    """打印热点查询的执行计划"""
+    engine = engine or get_engine()
+    prefix = explain_prefix(engine.dialect.name)
+    with engine.connect() as conn:
+        for name, query in hot_queries().items():
+            sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+            print(f"-- {name}")
+            for row in conn.execute(text(prefix + sql)):
+                print("   ", row[-1])
+
+
+def print_status(engine: Optional[Engine] = None):
+    """打印迁移状态"""
+    engine = engine or get_engine()
+    migration_metadata.create_all(engine)
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        mark = "已应用" if migration.version in done else "未应用（可选）" if migration.optional else "未应用"
+        print(f"{migration.version:>4}  {mark}  {migration.description}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="数据库迁移")
+    parser.add_argument("--status", action="store_true", help="查看迁移状态")
+    parser.add_argument("--explain", action="store_true", help="打印热点查询的执行计划")
+    args = parser.parse_args()
+
+    if args.status:
+        print_status()
+    else:
+        applied = run_migrations(verbose=True)
+        print(f"迁移完成，本次应用 {len(applied)} 个版本")
+        if args.explain:
+            explain_hot_queries()
@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Boolean, Float, ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -31,14 +31,24 @@ class Article(Base):
     image = Column(String(500))  # 封面图片 URL
     views = Column(Integer, default=0)
     likes = Column(Integer, default=0)
-    author_id = Column(Integer, ForeignKey("users.id"))
+    author_id = Column(Integer, ForeignKey("users.id"), index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     published_at = Column(DateTime)
     
+    # 索引：前台列表按状态（和分类）过滤、按发布时间倒序；后台列表按创建时间倒序
+    __table_args__ = (
+        Index("ix_articles_status_published_at", "status", "published_at", "id"),
+        Index("ix_articles_status_category_published_at", "status", "category", "published_at", "id"),
+        Index("ix_articles_status_created_at", "status", "created_at", "id"),
+        Index("ix_articles_created_at", "created_at", "id"),
+    )
+    
     # 关系
     author = relationship("User", back_populates="articles")
-    tags = relationship("ArticleTag", back_populates="article")
+    # 标签通过 tag_links 写入；tags 只读，列表中用 selectinload 批量加载
+    tag_links = relationship("ArticleTag", back_populates="article", cascade="all, delete-orphan")
+    tags = relationship("Tag", secondary="article_tags", order_by="Tag.name", viewonly=True)
 
 class Tag(Base):
     __tablename__ = "tags"
@@ -58,8 +68,14 @@ class ArticleTag(Base):
     article_id = Column(Integer, ForeignKey("articles.id"))
     tag_id = Column(Integer, ForeignKey("tags.id"))
     
+    # 索引：两个方向的关联查询都能走索引
+    __table_args__ = (
+        Index("ix_article_tags_article_id_tag_id", "article_id", "tag_id"),
+        Index("ix_article_tags_tag_id_article_id", "tag_id", "article_id"),
+    )
+    
     # 关系
-    article = relationship("Article", back_populates="tags")
+    article = relationship("Article", back_populates="tag_links")
     tag = relationship("Tag", back_populates="articles")
 
 class Comment(Base):
@@ -69,11 +85,59 @@ class Comment(Base):
     content = Column(Text, nullable=False)
     author_name = Column(String(50), nullable=False)
     author_email = Column(String(100), nullable=False)
-    article_id = Column(Integer, ForeignKey("articles.id"))
+    article_id = Column(Integer, ForeignKey("articles.id"), index=True)
     parent_id = Column(Integer, ForeignKey("comments.id"))  # 用于回复评论
     is_approved = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    # 索引：按文章取已审核评论、按时间分页；递归取回复；按 id 遍历待审核队列
+    __table_args__ = (
+        Index("ix_comments_article_id_is_approved_created_at", "article_id", "is_approved", "created_at"),
+        Index("ix_comments_parent_id", "parent_id"),
+        Index("ix_comments_is_approved_id", "is_approved", "id"),
+    )
+    
     # 关系
     article = relationship("Article")
     parent = relationship("Comment", remote_side=[id])
+
+class SiteStats(Base):
+    __tablename__ = "site_stats"
+    
+    # "site" 为全站汇总，"category:<分类名>" 为分类汇总（未分类为 "category:"）
+    scope = Column(String(60), primary_key=True)
+    total_articles = Column(Integer, nullable=False, default=0, server_default="0")
+    published_articles = Column(Integer, nullable=False, default=0, server_default="0")
+    draft_articles = Column(Integer, nullable=False, default=0, server_default="0")
+    total_views = Column(Integer, nullable=False, default=0, server_default="0")
+    total_likes = Column(Integer, nullable=False, default=0, server_default="0")
+    total_comments = Column(Integer, nullable=False, default=0, server_default="0")
+    approved_comments = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ArticleVisitorSketch(Base):
+    __tablename__ = "article_visitor_sketches"
+    
+    # 每篇文章每天一行：当天访客指纹的 HyperLogLog 草图（sketches.HyperLogLog.to_bytes）
+    article_id = Column(Integer, ForeignKey("articles.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    sketch = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # 索引：按日期清理过期草图
+    __table_args__ = (
+        Index("ix_article_visitor_sketches_day", "day"),
+    )
+
+class ArticleTrending(Base):
+    __tablename__ = "article_trending"
+    
+    # 热度快照：score 为前向衰减分数的对数 log(Σ w·e^(λ(t - landmark)))，排序与当前衰减后的热度一致
+    article_id = Column(Integer, ForeignKey("articles.id"), primary_key=True)
+    score = Column(Float, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # 索引：启动和快照后按分数取前 K 篇
+    __table_args__ = (
+        Index("ix_article_trending_score", "score"),
+    )
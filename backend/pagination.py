@@ -0,0 +1,89 @@
+
+"""
+游标（keyset）分页
+
+游标对调用方是不透明的字符串，内部是 base64 编码的 JSON：
+- {"k": [排序列的值, id]}：按 (排序列, id) 倒序做 keyset 分页
+- {"o": 偏移量}：结果本身无法 keyset 分页时（例如按相关度排序的检索结果）退化为偏移量
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, desc, or_
+
+
+def _invalid_cursor():
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="无效的分页游标"
+    )
+
+
+def _encode(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> dict:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise _invalid_cursor()
+    if not isinstance(payload, dict):
+        raise _invalid_cursor()
+    return payload
+
+
+def encode_keyset_cursor(sort_value: Optional[datetime], row_id: int) -> str:
+    """生成指向 (sort_value, row_id) 之后的游标"""
+    return _encode({"k": [sort_value.isoformat() if sort_value else None, row_id]})
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """生成偏移量游标"""
+    return _encode({"o": offset})
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """解析偏移量游标，空字符串表示第一页"""
+    if not cursor:
+        return 0
+    offset = _decode(cursor).get("o")
+    if not isinstance(offset, int) or offset < 0:
+        raise _invalid_cursor()
+    return offset
+
+
+def paginate_keyset(query, sort_column, id_column, cursor: str, limit: int) -> dict:
+    """按 (sort_column DESC NULLS LAST, id DESC) 取一页，返回 {"items", "next_cursor"}；空游标表示第一页"""
+    if cursor:
+        try:
+            sort_value, row_id = _decode(cursor)["k"]
+            sort_value = datetime.fromisoformat(sort_value) if sort_value is not None else None
+            row_id = int(row_id)
+        except (KeyError, TypeError, ValueError):
+            raise _invalid_cursor()
+
+        if sort_value is None:
+            # 已经翻到排序列为 NULL 的部分
+            query = query.filter(and_(sort_column.is_(None), id_column < row_id))
+        else:
+            query = query.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id),
+                sort_column.is_(None)
+            ))
+
+    rows = query.order_by(desc(sort_column).nullslast(), desc(id_column)).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_keyset_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return {"items": rows, "next_cursor": next_cursor}
@@ -0,0 +1,76 @@
+
+"""
+pytest 插件：SQL 查询预算
+
+在 conftest.py 中启用 pytest_plugins = ["backend.pytest_plugin"]，或运行 pytest -p backend.pytest_plugin。
+
+    def test_article_list(client, query_budget):
+        with query_budget(3):                  # 超过 3 条查询或出现 N+1 时测试失败
+            client.get("/api/articles/")
+
+    @pytest.mark.query_budget(5)               # 对整个测试函数（不含 fixture 的准备阶段）计数
+    def test_article_detail(client):
+        client.get("/api/articles/1")
+
+失败信息中列出按语句形状分组的查询，便于定位新增的懒加载。
+"""
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+import pytest
+
+from .query_inspector import N_PLUS_ONE_THRESHOLD, QueryInspection, capture_queries
+
+
+def check_budget(
+    inspection: QueryInspection,
+    max_queries: Optional[int],
+    n_plus_one: Optional[int] = N_PLUS_ONE_THRESHOLD
+):
+    """查询数超过预算，或同一形状的查询重复 n_plus_one 次以上时失败"""
+    problems = []
+    if max_queries is not None and inspection.count > max_queries:
+        problems.append(f"查询数 {inspection.count} 超过预算 {max_queries}")
+    if n_plus_one:
+        for shape, count in inspection.repeated(n_plus_one):
+            problems.append(f"疑似 N+1：同一语句执行了 {count} 次：{shape[:300]}")
+    if problems:
+        label = f"{inspection.label}: " if inspection.label else ""
+        pytest.fail(f"{label}{'；'.join(problems)}\n{inspection.summary()}", pytrace=False)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries, n_plus_one=N_PLUS_ONE_THRESHOLD): 测试执行的 SQL 查询数上限",
+    )
+
+
+@pytest.fixture
+def query_budget() -> Callable[..., object]:
+    """with query_budget(n, n_plus_one=5, label=""): 代码块内的查询数不超过 n，且没有 N+1"""
+
+    @contextmanager
+    def budget(
+        max_queries: Optional[int] = None,
+        n_plus_one: Optional[int] = N_PLUS_ONE_THRESHOLD,
+        label: str = ""
+    ) -> Iterator[QueryInspection]:
+        with capture_queries(label) as inspection:
+            yield inspection
+        check_budget(inspection, max_queries, n_plus_one)
+
+    return budget
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+    max_queries = marker.args[0] if marker.args else marker.kwargs.get("max_queries")
+    n_plus_one = marker.kwargs.get("n_plus_one", N_PLUS_ONE_THRESHOLD)
+    with capture_queries(item.nodeid) as inspection:
+        result = yield  # 测试本身失败时异常直接抛出，不再检查预算
+    check_budget(inspection, max_queries, n_plus_one)
+    return result
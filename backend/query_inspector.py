@@ -0,0 +1,182 @@
+
+"""
+SQL 查询检查（开发和测试环境使用，默认关闭）
+
+- 按归一化语句（去掉字面量、合并 IN 列表）把一次请求内的查询分组，同一形状的查询重复
+  N_PLUS_ONE_THRESHOLD 次以上时记录 N+1 警告，通常是在循环里触发了关系的懒加载
+- 耗时超过 SLOW_QUERY_MS 的语句连同参数和执行计划（EXPLAIN）一起记录
+- QUERY_INSPECTOR=1 时 main.py 注册 QueryInspectorMiddleware；测试中用 capture_queries()
+  或 pytest 插件（backend.pytest_plugin）的查询预算
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# 配置
+QUERY_INSPECTOR = os.getenv("QUERY_INSPECTOR", "0") == "1"
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+# 同一形状的查询在一次请求中执行多少次视为 N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)", re.IGNORECASE)
+_PARAM_RE = re.compile(r"%\(\w+\)s|:\w+|\$\d+|%s")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """语句的形状：字面量和占位符统一为 ?，IN 列表合并为 IN (...)，空白压缩"""
+    statement = _STRING_RE.sub("?", statement)
+    statement = _PARAM_RE.sub("?", statement)
+    statement = _NUMBER_RE.sub("?", statement)
+    statement = _IN_LIST_RE.sub("IN (...)", statement)
+    return _SPACE_RE.sub(" ", statement).strip()
+
+
+def explain_prefix(dialect_name: str) -> str:
+    return "EXPLAIN QUERY PLAN " if dialect_name == "sqlite" else "EXPLAIN "
+
+
+class QueryInspection:
+    """一段时间（一次请求或一段测试代码）内执行的查询"""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.queries: List[Tuple[str, str, float]] = []  # (归一化语句, 原始语句, 耗时秒)
+        self._lock = threading.Lock()
+
+    def add(self, statement: str, seconds: float):
+        with self._lock:
+            self.queries.append((normalize_statement(statement), statement, seconds))
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def seconds(self) -> float:
+        return sum(seconds for _, _, seconds in self.queries)
+
+    def groups(self) -> Counter:
+        """每种语句形状的执行次数"""
+        return Counter(shape for shape, _, _ in self.queries)
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        """执行次数达到 threshold 的语句形状（疑似 N+1）"""
+        return [(shape, count) for shape, count in self.groups().most_common() if count >= threshold]
+
+    def summary(self, limit: int = 10) -> str:
+        lines = [f"{self.count} 条查询，共 {self.seconds * 1000:.1f} ms"]
+        for shape, count in self.groups().most_common(limit):
+            lines.append(f"  {count:>4} × {shape[:200]}")
+        return "\n".join(lines)
+
+
+# 当前请求的检查（中间件设置）；测试中 capture_queries 登记的检查（可嵌套）
+_current: ContextVar[Optional[QueryInspection]] = ContextVar("query_inspection", default=None)
+_captures: ContextVar[Tuple[QueryInspection, ...]] = ContextVar("query_captures", default=())
+_installed = False
+_install_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inspector_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("inspector_started")
+    seconds = time.perf_counter() - started.pop() if started else 0.0
+
+    inspection = _current.get()
+    if inspection is not None:
+        inspection.add(statement, seconds)
+    for capture in _captures.get():
+        capture.add(statement, seconds)
+
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        plan = None if executemany else explain(conn, statement, parameters)
+        logger.warning(
+            "慢查询 %.1f ms: %s\n参数: %.500r%s",
+            seconds * 1000, statement, parameters, f"\n执行计划:\n{plan}" if plan else ""
+        )
+
+
+def explain(conn, statement: str, parameters) -> Optional[str]:
+    """用同一个 DBAPI 连接取执行计划（不经过 SQLAlchemy 事件，不会递归）；只处理查询语句"""
+    if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(explain_prefix(conn.dialect.name) + statement, parameters)
+        return "\n".join(f"    {row[-1]}" for row in cursor.fetchall())
+    except Exception as e:  # 执行计划只用于诊断，失败时不影响请求
+        return f"    （获取执行计划失败: {e}）"
+    finally:
+        cursor.close()
+
+
+def install():
+    """在所有引擎上注册查询事件（重复调用无副作用）"""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _installed = True
+
+
+@contextmanager
+def capture_queries(label: str = "") -> Iterator[QueryInspection]:
+    """收集代码块中执行的查询（测试中使用）
+
+    按上下文收集：TestClient 把调用方的上下文带到应用中，请求内的查询会被计入；
+    后台线程（计数写回等）在自己的上下文中运行，它们的查询不计入。
+    """
+    install()
+    inspection = QueryInspection(label)
+    token = _captures.set(_captures.get() + (inspection,))
+    try:
+        yield inspection
+    finally:
+        _captures.reset(token)
+
+
+class QueryInspectorMiddleware:
+    """按请求分组查询，请求结束时记录疑似 N+1 的语句"""
+
+    def __init__(self, app, threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+        install()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inspection = QueryInspection(f"{scope['method']} {scope['path']}")
+        token = _current.set(inspection)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            repeated = inspection.repeated(self.threshold)
+            if repeated:
+                logger.warning(
+                    "疑似 N+1 查询 %s：\n%s", inspection.label,
+                    "\n".join(f"  {count:>4} × {shape[:300]}" for shape, count in repeated)
+                )
+            logger.debug("%s %s", inspection.label, inspection.summary())
@@ -0,0 +1,34 @@
+
+"""
+全文检索索引重建脚本
+在批量导入数据或索引损坏后运行：python -m backend.rebuild_search_index
+"""
+from .database import SessionLocal, get_engine
+from .search import search_index
+
+def rebuild_search_index():
+    """重建文章检索索引"""
+    print("检查检索表...")
+    with get_engine().begin() as conn:
+        search_index.ensure_schema(conn)
+    if not search_index.enabled:
+        print("当前数据库不支持全文检索，跳过")
+        return
+    
+    db = SessionLocal()
+    
+    try:
+        print("重建索引...")
+        count = search_index.rebuild(db)
+        db.commit()
+        print(f"索引重建完成，共 {count} 篇文章")
+    
+    except Exception as e:
+        print(f"重建失败: {e}")
+        db.rollback()
+    
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild_search_index()
@@ -0,0 +1,27 @@
+
+"""
+统计汇总表重算脚本
+用一次分组查询从头重算 site_stats，可定期执行：python -m backend.reconcile_stats
+"""
+from .database import SessionLocal
+from .services.stats_service import SiteStatsService
+
+def reconcile_stats():
+    """重算统计汇总表"""
+    db = SessionLocal()
+    
+    try:
+        print("重算统计数据...")
+        categories = SiteStatsService().reconcile(db)
+        db.commit()
+        print(f"统计数据重算完成，共 {categories} 个分类")
+    
+    except Exception as e:
+        print(f"重算失败: {e}")
+        db.rollback()
+    
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    reconcile_stats()
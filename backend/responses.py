@@ -0,0 +1,90 @@
+"""
+快速 JSON 响应
+
+默认情况下，接口返回值先按 response_model 校验一遍，再序列化为 JSON。
+在 FAST_JSON_ROUTERS 中启用的路由，热点读接口直接把查询结果转成字典，
+用 orjson 编码后原样返回，跳过重复校验；未安装 orjson 时退回标准库 json。
+"""
+import json
+import os
+from functools import lru_cache
+from inspect import isclass
+from typing import Any, Iterable, Optional, Type, get_args, get_origin
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # orjson 是可选依赖
+    orjson = None
+
+# 启用快速 JSON 的路由（articles、admin），逗号分隔
+FAST_JSON_ROUTERS = {name.strip() for name in os.getenv("FAST_JSON_ROUTERS", "").split(",") if name.strip()}
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 编码的 JSON 响应，可以直接编码 datetime"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def use_fast_json(router_name: str) -> bool:
+    """某个路由是否启用快速 JSON"""
+    return router_name in FAST_JSON_ROUTERS
+
+
+def response_class_for(router_name: str) -> Type[JSONResponse]:
+    """路由的默认响应类"""
+    return FastJSONResponse if use_fast_json(router_name) else JSONResponse
+
+
+@lru_cache(maxsize=None)
+def _fields(schema: Type[BaseModel]) -> tuple:
+    """响应模型的字段，以及嵌套模型字段对应的模型和是否为列表"""
+    fields = []
+    for name, field in schema.model_fields.items():
+        annotation, many = field.annotation, False
+        if get_origin(annotation) is list:
+            annotation, many = get_args(annotation)[0], True
+        nested = annotation if isclass(annotation) and issubclass(annotation, BaseModel) else None
+        fields.append((name, nested, many))
+    return tuple(fields)
+
+
+def to_dict(obj: Any, schema: Type[BaseModel]) -> dict:
+    """按响应模型的字段从 ORM 对象或行中取值（嵌套模型同样处理），不做校验"""
+    result = {}
+    for name, nested, many in _fields(schema):
+        value = getattr(obj, name)
+        if nested is not None and value is not None:
+            value = to_dicts(value, nested) if many else to_dict(value, nested)
+        result[name] = value
+    return result
+
+
+def to_dicts(objs: Iterable[Any], schema: Type[BaseModel]) -> list:
+    return [to_dict(obj, schema) for obj in objs]
+
+
+def serialize_page(result: Any, schema: Type[BaseModel]) -> Any:
+    """列表结果（对象列表，或带 items 的游标分页字典）转成字典"""
+    if isinstance(result, dict):
+        return {"items": to_dicts(result["items"], schema), "next_cursor": result["next_cursor"]}
+    return to_dicts(result, schema)
+
+
+def fast_response(content: Any, response: Optional[Response] = None) -> FastJSONResponse:
+    """直接返回已序列化的内容，保留依赖中设置在 response 上的响应头（ETag 等）"""
+    return FastJSONResponse(content, headers=dict(response.headers) if response is not None else None)
+
+
+def json_line(content: Any) -> bytes:
+    """编码一行 NDJSON，供流式接口使用"""
+    if orjson is None:
+        return (json.dumps(content, ensure_ascii=False, default=lambda value: value.isoformat()) + "\n").encode()
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
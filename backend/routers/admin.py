@@ -1,21 +1,50 @@
 
-from fastapi import APIRouter, Depends
+from typing import List
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import User
-from ..schemas import StatsResponse
+from ..schemas import StatsResponse, CategoryStatsResponse, ArticleVisitorStats
+from ..responses import response_class_for
 from ..auth import get_current_admin_user
 from ..controllers.admin_controller import admin_controller
 
-router = APIRouter(prefix="/api/admin", tags=["管理后台"])
+router = APIRouter(prefix="/api/admin", tags=["管理后台"], default_response_class=response_class_for("admin"))
 
 @router.get("/stats", response_model=StatsResponse)
 def get_dashboard_stats(
+    fresh: bool = Query(False, description="为 true 时绕过汇总表，全表重新统计"),
     current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """获取仪表板统计数据"""
-    return admin_controller.get_dashboard_stats(current_user, db)
+    return admin_controller.get_dashboard_stats(fresh, current_user, db)
+
+@router.get("/stats/categories", response_model=List[CategoryStatsResponse])
+def get_category_stats(
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_read_db)
+):
+    """获取分类统计数据"""
+    return admin_controller.get_category_stats(current_user, db)
+
+@router.get("/stats/articles/{article_id}/visitors", response_model=ArticleVisitorStats)
+def get_article_visitors(
+    article_id: int,
+    days: int = Query(30, ge=1, le=366, description="返回最近多少天的每日独立访客"),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_read_db)
+):
+    """获取文章的独立访客（每日、最近 7 天、最近 30 天，HyperLogLog 估计）"""
+    return admin_controller.get_article_visitors(article_id, days, current_user, db)
+
+@router.post("/stats/reconcile")
+def reconcile_stats(
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """用一次分组查询重算统计汇总表"""
+    return admin_controller.reconcile_stats(current_user, db)
 
 @router.get("/users")
 def get_users(
@@ -24,3 +53,13 @@ def get_users(
 ):
     """获取用户列表"""
     return admin_controller.get_users(current_user, db)
+
+@router.get("/cache")
+def get_cache_stats(current_user: User = Depends(get_current_admin_user)):
+    """获取缓存命中统计"""
+    return admin_controller.get_cache_stats(current_user)
+
+@router.get("/pool")
+def get_pool_stats(current_user: User = Depends(get_current_admin_user)):
+    """获取数据库连接池统计（签出数、等待时间、超时次数）"""
+    return admin_controller.get_pool_stats(current_user)
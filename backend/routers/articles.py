@@ -1,47 +1,81 @@
 
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import User
 from ..schemas import (
     ArticleCreate, 
     ArticleUpdate, 
     ArticleResponse, 
-    ArticleListResponse
+    ArticleListResponse,
+    SearchResultResponse,
+    TrendingArticleResponse,
+    ArticleCursorPage,
+    AdminArticleCursorPage
 )
+from ..responses import response_class_for
 from ..auth import get_current_admin_user
 from ..controllers.article_controller import article_controller
 
-router = APIRouter(prefix="/api/articles", tags=["文章"])
+router = APIRouter(prefix="/api/articles", tags=["文章"], default_response_class=response_class_for("articles"))
 
-@router.get("/", response_model=List[ArticleListResponse])
+@router.get("/", response_model=Union[List[ArticleListResponse], ArticleCursorPage])
 def get_articles(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     category: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="游标分页：第一页传空字符串，之后传上一页返回的 next_cursor"),
+    tag: Optional[str] = Query(None, description="按标签名过滤"),
+    db: Session = Depends(get_read_db)
+):
+    """获取文章列表（前台）；传 cursor 时返回 {items, next_cursor}，传 tag 时按标签过滤"""
+    return article_controller.get_articles(request, response, skip, limit, category, search, cursor, tag, db)
+
+@router.get("/search", response_model=List[SearchResultResponse])
+def search_articles(
+    q: str = Query(..., min_length=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    category: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
-    """获取文章列表（前台）"""
-    return article_controller.get_articles(skip, limit, category, search, db)
+    """全文检索文章（按相关度排序，附带摘要片段）"""
+    return article_controller.search_articles(q, skip, limit, category, db)
+
+@router.get("/trending", response_model=List[TrendingArticleResponse])
+def get_trending_articles(
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """热门文章（按时间衰减的浏览、点赞热度排序）"""
+    return article_controller.get_trending_articles(limit, db)
 
 @router.get("/{article_id}", response_model=ArticleResponse)
-def get_article(article_id: int, db: Session = Depends(get_db)):
-    """获取单篇文章详情"""
-    return article_controller.get_article(article_id, db)
+def get_article(
+    article_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db)
+):
+    """获取单篇文章详情（支持 If-None-Match / If-Modified-Since）"""
+    return article_controller.get_article(article_id, request, response, db)
 
-@router.get("/admin/all", response_model=List[ArticleResponse])
+@router.get("/admin/all", response_model=Union[List[ArticleResponse], AdminArticleCursorPage])
 def get_admin_articles(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     status_filter: Optional[str] = Query(None, alias="status"),
     category: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="游标分页：第一页传空字符串，之后传上一页返回的 next_cursor"),
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """获取所有文章（后台管理）"""
-    return article_controller.get_admin_articles(skip, limit, status_filter, category, current_user, db)
+    """获取所有文章（后台管理）；传 cursor 时返回 {items, next_cursor}"""
+    return article_controller.get_admin_articles(skip, limit, status_filter, category, cursor, current_user, db)
 
 @router.post("/", response_model=ArticleResponse)
 def create_article(
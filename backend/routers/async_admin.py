@@ -0,0 +1,65 @@
+
+from typing import List
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from ..models import User
+from ..schemas import StatsResponse, CategoryStatsResponse, ArticleVisitorStats
+from ..responses import response_class_for
+from ..auth import get_current_admin_user_async
+from ..controllers.async_admin_controller import async_admin_controller
+
+router = APIRouter(prefix="/api/admin", tags=["管理后台"], default_response_class=response_class_for("admin"))
+
+@router.get("/stats", response_model=StatsResponse)
+async def get_dashboard_stats(
+    fresh: bool = Query(False, description="为 true 时绕过汇总表，全表重新统计"),
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取仪表板统计数据"""
+    return await async_admin_controller.get_dashboard_stats(fresh, current_user, db)
+
+@router.get("/stats/categories", response_model=List[CategoryStatsResponse])
+async def get_category_stats(
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取分类统计数据"""
+    return await async_admin_controller.get_category_stats(current_user, db)
+
+@router.get("/stats/articles/{article_id}/visitors", response_model=ArticleVisitorStats)
+async def get_article_visitors(
+    article_id: int,
+    days: int = Query(30, ge=1, le=366, description="返回最近多少天的每日独立访客"),
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取文章的独立访客（每日、最近 7 天、最近 30 天，HyperLogLog 估计）"""
+    return await async_admin_controller.get_article_visitors(article_id, days, current_user, db)
+
+@router.post("/stats/reconcile")
+async def reconcile_stats(
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """用一次分组查询重算统计汇总表"""
+    return await async_admin_controller.reconcile_stats(current_user, db)
+
+@router.get("/users")
+async def get_users(
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取用户列表"""
+    return await async_admin_controller.get_users(current_user, db)
+
+@router.get("/cache")
+async def get_cache_stats(current_user: User = Depends(get_current_admin_user_async)):
+    """获取缓存命中统计"""
+    return await async_admin_controller.get_cache_stats(current_user)
+
+@router.get("/pool")
+async def get_pool_stats(current_user: User = Depends(get_current_admin_user_async)):
+    """获取数据库连接池统计（签出数、等待时间、超时次数）"""
+    return await async_admin_controller.get_pool_stats(current_user)
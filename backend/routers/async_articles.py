@@ -0,0 +1,111 @@
+
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from ..models import User
+from ..schemas import (
+    ArticleCreate, 
+    ArticleUpdate, 
+    ArticleResponse, 
+    ArticleListResponse,
+    SearchResultResponse,
+    TrendingArticleResponse,
+    ArticleCursorPage,
+    AdminArticleCursorPage
+)
+from ..responses import response_class_for
+from ..auth import get_current_admin_user_async
+from ..controllers.async_article_controller import async_article_controller
+
+router = APIRouter(prefix="/api/articles", tags=["文章"], default_response_class=response_class_for("articles"))
+
+@router.get("/", response_model=Union[List[ArticleListResponse], ArticleCursorPage])
+async def get_articles(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    category: Optional[str] = None,
+    search: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="游标分页：第一页传空字符串，之后传上一页返回的 next_cursor"),
+    tag: Optional[str] = Query(None, description="按标签名过滤"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取文章列表（前台）；传 cursor 时返回 {items, next_cursor}，传 tag 时按标签过滤"""
+    return await async_article_controller.get_articles(request, response, skip, limit, category, search, cursor, tag, db)
+
+@router.get("/search", response_model=List[SearchResultResponse])
+async def search_articles(
+    q: str = Query(..., min_length=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    category: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """全文检索文章（按相关度排序，附带摘要片段）"""
+    return await async_article_controller.search_articles(q, skip, limit, category, db)
+
+@router.get("/trending", response_model=List[TrendingArticleResponse])
+async def get_trending_articles(
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """热门文章（按时间衰减的浏览、点赞热度排序）"""
+    return await async_article_controller.get_trending_articles(limit, db)
+
+@router.get("/{article_id}", response_model=ArticleResponse)
+async def get_article(
+    article_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取单篇文章详情（支持 If-None-Match / If-Modified-Since）"""
+    return await async_article_controller.get_article(article_id, request, response, db)
+
+@router.get("/admin/all", response_model=Union[List[ArticleResponse], AdminArticleCursorPage])
+async def get_admin_articles(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    category: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="游标分页：第一页传空字符串，之后传上一页返回的 next_cursor"),
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取所有文章（后台管理）；传 cursor 时返回 {items, next_cursor}"""
+    return await async_article_controller.get_admin_articles(skip, limit, status_filter, category, cursor, current_user, db)
+
+@router.post("/", response_model=ArticleResponse)
+async def create_article(
+    article: ArticleCreate,
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """创建文章"""
+    return await async_article_controller.create_article(article, current_user, db)
+
+@router.put("/{article_id}", response_model=ArticleResponse)
+async def update_article(
+    article_id: int,
+    article_update: ArticleUpdate,
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """更新文章"""
+    return await async_article_controller.update_article(article_id, article_update, current_user, db)
+
+@router.delete("/{article_id}")
+async def delete_article(
+    article_id: int,
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """删除文章"""
+    return await async_article_controller.delete_article(article_id, current_user, db)
+
+@router.post("/{article_id}/like")
+async def like_article(article_id: int, db: AsyncSession = Depends(get_async_db)):
+    """点赞文章"""
+    return await async_article_controller.like_article(article_id, db)
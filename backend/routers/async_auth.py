@@ -0,0 +1,18 @@
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from ..schemas import UserCreate, UserLogin, Token, UserResponse
+from ..controllers.async_auth_controller import async_auth_controller
+
+router = APIRouter(prefix="/api/auth", tags=["认证"])
+
+@router.post("/register", response_model=UserResponse)
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """用户注册"""
+    return await async_auth_controller.register(user, db)
+
+@router.post("/login", response_model=Token)
+async def login_for_access_token(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    """用户登录"""
+    return await async_auth_controller.login(user, db)
@@ -0,0 +1,74 @@
+
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from ..models import User
+from ..schemas import CommentCreate, CommentModeration, CommentResponse, CommentThreadPage
+from ..auth import get_current_admin_user_async
+from ..controllers.async_comment_controller import async_comment_controller
+
+router = APIRouter(prefix="/api/comments", tags=["评论"])
+
+@router.post("/", response_model=CommentResponse)
+async def create_comment(comment: CommentCreate, db: AsyncSession = Depends(get_async_db)):
+    """发表评论或回复（审核通过后公开）"""
+    return await async_comment_controller.create_comment(comment, db)
+
+@router.get("/article/{article_id}", response_model=CommentThreadPage)
+async def get_comment_thread(
+    article_id: int,
+    cursor: Optional[str] = Query(None, description="游标分页：不传或传空字符串为第一页，之后传上一页返回的 next_cursor"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取文章的已审核评论树（首层评论按时间倒序分页，回复按时间正序嵌套）"""
+    return await async_comment_controller.get_comment_thread(article_id, cursor, limit, db)
+
+@router.get("/pending")
+async def stream_pending_comments(
+    article_id: Optional[int] = Query(None, description="只看某篇文章"),
+    author_email: Optional[str] = Query(None, description="只看某个邮箱"),
+    before: Optional[datetime] = Query(None, description="只看此时间之前发表的"),
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """审核队列：跨全部文章按 id 顺序流式返回待审核评论（NDJSON，每行一条）"""
+    return await async_comment_controller.stream_pending_comments(article_id, author_email, before, current_user, db)
+
+@router.post("/approve")
+async def approve_comments(
+    moderation: CommentModeration,
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """批量审核通过（按 id 列表或筛选条件，分批提交）"""
+    return await async_comment_controller.approve_comments(moderation, current_user, db)
+
+@router.post("/reject")
+async def reject_comments(
+    moderation: CommentModeration,
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """批量拒绝（删除）待审核评论（按 id 列表或筛选条件，分批提交）"""
+    return await async_comment_controller.reject_comments(moderation, current_user, db)
+
+@router.put("/{comment_id}/approve", response_model=CommentResponse)
+async def approve_comment(
+    comment_id: int,
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """审核通过评论"""
+    return await async_comment_controller.approve_comment(comment_id, current_user, db)
+
+@router.delete("/{comment_id}")
+async def delete_comment(
+    comment_id: int,
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """删除评论（连同其全部回复）"""
+    return await async_comment_controller.delete_comment(comment_id, current_user, db)
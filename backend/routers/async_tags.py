@@ -0,0 +1,49 @@
+
+from typing import List
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_async_db
+from ..models import User
+from ..schemas import TagCreate, TagUpdate, TagResponse, TagCloudItem
+from ..auth import get_current_admin_user_async
+from ..controllers.async_tag_controller import async_tag_controller
+
+router = APIRouter(prefix="/api/tags", tags=["标签"])
+
+@router.get("/", response_model=List[TagResponse])
+async def get_tags(db: AsyncSession = Depends(get_async_db)):
+    """获取全部标签"""
+    return await async_tag_controller.get_tags(db)
+
+@router.get("/cloud", response_model=List[TagCloudItem])
+async def get_tag_cloud(db: AsyncSession = Depends(get_async_db)):
+    """获取标签云（每个标签的已发布文章数）"""
+    return await async_tag_controller.get_tag_cloud(db)
+
+@router.post("/", response_model=TagResponse)
+async def create_tag(
+    tag: TagCreate,
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """创建标签"""
+    return await async_tag_controller.create_tag(tag, current_user, db)
+
+@router.put("/{tag_id}", response_model=TagResponse)
+async def update_tag(
+    tag_id: int,
+    tag_update: TagUpdate,
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """更新标签"""
+    return await async_tag_controller.update_tag(tag_id, tag_update, current_user, db)
+
+@router.delete("/{tag_id}")
+async def delete_tag(
+    tag_id: int,
+    current_user: User = Depends(get_current_admin_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """删除标签（同时解除与文章的关联）"""
+    return await async_tag_controller.delete_tag(tag_id, current_user, db)
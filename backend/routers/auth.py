@@ -8,11 +8,11 @@ from ..controllers.auth_controller import auth_controller
 router = APIRouter(prefix="/api/auth", tags=["认证"])
 
 @router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: Session = Depends(get_db)):
     """用户注册"""
-    return auth_controller.register(user, db)
+    return await auth_controller.register(user, db)
 
 @router.post("/login", response_model=Token)
-def login_for_access_token(user: UserLogin, db: Session = Depends(get_db)):
+async def login_for_access_token(user: UserLogin, db: Session = Depends(get_db)):
     """用户登录"""
-    return auth_controller.login(user, db)
+    return await auth_controller.login(user, db)
@@ -1,6 +1,6 @@
 
 from pydantic import BaseModel, EmailStr
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
 
 # 用户相关 Schema
@@ -24,6 +24,36 @@ class UserResponse(UserBase):
     class Config:
         from_attributes = True
 
+# 标签相关 Schema
+class TagBase(BaseModel):
+    name: str
+    description: Optional[str] = None
+
+class TagCreate(TagBase):
+    pass
+
+class TagUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+
+class TagResponse(TagBase):
+    id: int
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class TagSummary(BaseModel):
+    """文章响应中的标签"""
+    id: int
+    name: str
+    
+    class Config:
+        from_attributes = True
+
+class TagCloudItem(TagSummary):
+    count: int
+
 # 文章相关 Schema
 class ArticleBase(BaseModel):
     title: str
@@ -34,6 +64,7 @@ class ArticleBase(BaseModel):
 
 class ArticleCreate(ArticleBase):
     status: str = "草稿"
+    tags: List[str] = []
 
 class ArticleUpdate(BaseModel):
     title: Optional[str] = None
@@ -42,6 +73,7 @@ class ArticleUpdate(BaseModel):
     category: Optional[str] = None
     status: Optional[str] = None
     image: Optional[str] = None
+    tags: Optional[List[str]] = None  # 标签名列表，不传时保持不变
 
 class ArticleResponse(ArticleBase):
     id: int
@@ -52,6 +84,7 @@ class ArticleResponse(ArticleBase):
     created_at: datetime
     updated_at: datetime
     published_at: Optional[datetime]
+    tags: List[TagSummary] = []
     
     class Config:
         from_attributes = True
@@ -68,24 +101,25 @@ class ArticleListResponse(BaseModel):
     author_id: int
     created_at: datetime
     published_at: Optional[datetime]
+    tags: List[TagSummary] = []
     
     class Config:
         from_attributes = True
 
-# 标签相关 Schema
-class TagBase(BaseModel):
-    name: str
-    description: Optional[str] = None
+class ArticleCursorPage(BaseModel):
+    items: List[ArticleListResponse]
+    next_cursor: Optional[str] = None
 
-class TagCreate(TagBase):
-    pass
+class AdminArticleCursorPage(BaseModel):
+    items: List[ArticleResponse]
+    next_cursor: Optional[str] = None
 
-class TagResponse(TagBase):
-    id: int
-    created_at: datetime
-    
-    class Config:
-        from_attributes = True
+class SearchResultResponse(ArticleListResponse):
+    snippet: str
+    score: float
+
+class TrendingArticleResponse(ArticleListResponse):
+    trending_score: float
 
 # 评论相关 Schema
 class CommentBase(BaseModel):
@@ -107,6 +141,38 @@ class CommentResponse(CommentBase):
     class Config:
         from_attributes = True
 
+class CommentNode(BaseModel):
+    """公开的评论树节点（不含邮箱）"""
+    id: int
+    article_id: int
+    parent_id: Optional[int]
+    author_name: str
+    content: str
+    created_at: datetime
+    replies: List["CommentNode"] = []
+    
+    class Config:
+        from_attributes = True
+
+class CommentThreadPage(BaseModel):
+    items: List[CommentNode]
+    next_cursor: Optional[str] = None
+
+class PendingComment(CommentBase):
+    """审核队列中的评论"""
+    id: int
+    article_id: int
+    article_title: str
+    parent_id: Optional[int]
+    created_at: datetime
+
+class CommentModeration(BaseModel):
+    """批量审核：传 ids 只处理这些评论，否则处理符合筛选条件的全部待审核评论"""
+    ids: Optional[List[int]] = None
+    article_id: Optional[int] = None
+    author_email: Optional[str] = None
+    before: Optional[datetime] = None
+
 # 统计相关 Schema
 class StatsResponse(BaseModel):
     total_articles: int
@@ -115,6 +181,25 @@ class StatsResponse(BaseModel):
     total_views: int
     total_likes: int
     total_comments: int
+    approved_comments: int = 0
+
+class CategoryStatsResponse(StatsResponse):
+    category: Optional[str]
+
+class DailyVisitors(BaseModel):
+    day: date
+    unique_visitors: int
+
+class ArticleVisitorStats(BaseModel):
+    """文章独立访客（HyperLogLog 估计值）"""
+    article_id: int
+    views: int
+    unique_today: int
+    unique_7d: int
+    unique_30d: int
+    daily: List[DailyVisitors]
+    sketch_bytes: int  # 每篇文章每天的草图最多占用的字节数
+    standard_error: float
 
 # Token 相关 Schema
 class Token(BaseModel):
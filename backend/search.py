@@ -0,0 +1,283 @@
+
+"""
+文章全文检索
+
+- SQLite 使用 FTS5 虚拟表，PostgreSQL 使用 tsvector + GIN 索引
+- 中日韩文字按二元组（bigram）切分，其他文字按单词切分并转小写
+- 索引中存放的是切分后以空格连接的词串，查询时用同样的方式切分并按短语匹配
+- 文档中每段中日韩文字末尾再加上最后一个字，这样每个字都是某个索引词的开头，
+  单字查询用前缀匹配（FTS5 的 "字"*，tsquery 的 字:*）
+"""
+import html
+import logging
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import inspect, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from .models import Article
+
+logger = logging.getLogger(__name__)
+
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+_SEGMENT_RE = re.compile(f"[{_CJK}]+|[^\\W_{_CJK}]+")
+_CJK_RE = re.compile(f"[{_CJK}]")
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+# 各字段的权重：标题 > 摘要 > 正文
+TITLE_WEIGHT = 10.0
+EXCERPT_WEIGHT = 3.0
+CONTENT_WEIGHT = 1.0
+
+
+def strip_html(value: Optional[str]) -> str:
+    """去掉 HTML 标签并还原实体"""
+    if not value:
+        return ""
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", value))).strip()
+
+
+def _segment_tokens(segment: str) -> List[str]:
+    if _CJK_RE.match(segment):
+        if len(segment) == 1:
+            return [segment]
+        return [segment[i:i + 2] for i in range(len(segment) - 1)]
+    return [segment.lower()]
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """切分文档：中日韩文字取二元组并补上末字，其余取小写单词"""
+    tokens = []
+    for segment in _SEGMENT_RE.findall(value or ""):
+        tokens.extend(_segment_tokens(segment))
+        if len(segment) > 1 and _CJK_RE.match(segment):
+            tokens.append(segment[-1])
+    return tokens
+
+
+def article_document(article_id: int, title: Optional[str], excerpt: Optional[str], content: Optional[str]) -> dict:
+    """一篇文章的索引内容（各字段切分后以空格连接）"""
+    return {
+        "id": article_id,
+        "title": " ".join(tokenize(title)),
+        "excerpt": " ".join(tokenize(excerpt)),
+        "content": " ".join(tokenize(strip_html(content))),
+    }
+
+
+def query_phrases(query: str) -> List[List[str]]:
+    """把查询串切成若干短语，每个短语内的词必须相邻出现"""
+    return [_segment_tokens(segment) for segment in _SEGMENT_RE.findall(query or "")]
+
+
+def _is_single_cjk(phrase: List[str]) -> bool:
+    """单个中日韩字的短语：按前缀匹配（二元组不会等于单字）"""
+    return len(phrase) == 1 and len(phrase[0]) == 1 and bool(_CJK_RE.match(phrase[0]))
+
+
+def _fts5_query(phrases: List[List[str]]) -> str:
+    return " ".join(
+        '"' + " ".join(p) + '"' + ("*" if _is_single_cjk(p) else "")
+        for p in phrases
+    )
+
+
+def _tsquery(phrases: List[List[str]]) -> str:
+    return " & ".join(
+        p[0] + ":*" if _is_single_cjk(p) else "(" + " <-> ".join(p) + ")"
+        for p in phrases
+    )
+
+
+def make_snippet(content: Optional[str], query: str, width: int = 80) -> str:
+    """在正文中截取命中位置附近的一段文字，命中词用 <mark> 标出"""
+    plain = strip_html(content)
+    segments = [s for s in _SEGMENT_RE.findall(query or "")]
+    lowered = plain.lower()
+
+    start = 0
+    positions = [lowered.find(s.lower()) for s in segments]
+    positions = [p for p in positions if p >= 0]
+    if positions:
+        start = max(min(positions) - width // 4, 0)
+    end = min(start + width, len(plain))
+    window = plain[start:end]
+
+    if segments:
+        pattern = re.compile("|".join(re.escape(s) for s in sorted(segments, key=len, reverse=True)), re.I)
+        parts, last = [], 0
+        for match in pattern.finditer(window):
+            parts.append(html.escape(window[last:match.start()]))
+            parts.append(f"<mark>{html.escape(match.group(0))}</mark>")
+            last = match.end()
+        parts.append(html.escape(window[last:]))
+        snippet = "".join(parts)
+    else:
+        snippet = html.escape(window)
+
+    if start > 0:
+        snippet = "…" + snippet
+    if end < len(plain):
+        snippet = snippet + "…"
+    return snippet
+
+
+class SearchIndex:
+    """文章检索索引，按数据库方言选择实现；不支持的数据库返回 None，由调用方回退到 LIKE 查询"""
+
+    def __init__(self):
+        # None 表示尚未检查检索表是否存在（数据库不支持全文检索时迁移不会创建它）
+        self.enabled: Optional[bool] = None
+
+    def _backend(self, bind) -> Optional[str]:
+        if isinstance(bind, Session):
+            bind = bind.get_bind()
+        if self.enabled is None:
+            self.enabled = self._dialect_backend(bind) is not None and inspect(bind).has_table("article_search")
+        if not self.enabled:
+            return None
+        return self._dialect_backend(bind)
+
+    def _dialect_backend(self, bind) -> Optional[str]:
+        name = bind.dialect.name
+        if name == "sqlite":
+            return "fts5"
+        if name == "postgresql":
+            return "tsvector"
+        return None
+
+    def available(self, bind) -> bool:
+        """当前数据库是否使用检索索引（否则 search 返回 None）"""
+        return self._backend(bind) is not None
+
+    def ensure_schema(self, conn):
+        """在给定连接（事务）中创建检索表，已存在时跳过；创建失败时 enabled 为 False"""
+        backend = self._dialect_backend(conn)
+        try:
+            if backend == "fts5":
+                conn.execute(text(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS article_search "
+                    "USING fts5(title, excerpt, content, tokenize = 'unicode61')"
+                ))
+            elif backend == "tsvector":
+                conn.execute(text(
+                    "CREATE TABLE IF NOT EXISTS article_search ("
+                    "article_id INTEGER PRIMARY KEY REFERENCES articles(id) ON DELETE CASCADE, "
+                    "document TSVECTOR NOT NULL)"
+                ))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_article_search_document "
+                    "ON article_search USING GIN (document)"
+                ))
+        except OperationalError:
+            # 例如 SQLite 编译时未启用 FTS5
+            logger.warning("无法创建全文检索表，搜索将回退到 LIKE 查询", exc_info=True)
+            self.enabled = False
+            return
+        self.enabled = backend is not None
+
+    def index_article(self, db: Session, article):
+        """写入或更新一篇文章的索引（与文章修改处于同一事务）"""
+        backend = self._backend(db.get_bind())
+        if backend is None:
+            return
+        if backend == "fts5":
+            db.execute(text("DELETE FROM article_search WHERE rowid = :id"), {"id": article.id})
+        self._insert(db, backend, [article_document(article.id, article.title, article.excerpt, article.content)])
+
+    def index_documents(self, conn, documents: List[dict]):
+        """批量写入新文章的索引（article_document 的结果），供批量导入在同一事务中调用"""
+        backend = self._backend(conn)
+        if backend is not None and documents:
+            self._insert(conn, backend, documents)
+
+    def _insert(self, bind, backend: str, documents: List[dict]):
+        if backend == "fts5":
+            bind.execute(text(
+                "INSERT INTO article_search (rowid, title, excerpt, content) "
+                "VALUES (:id, :title, :excerpt, :content)"
+            ), documents)
+        else:
+            bind.execute(text(
+                "INSERT INTO article_search (article_id, document) VALUES (:id, "
+                "setweight(to_tsvector('simple', :title), 'A') || "
+                "setweight(to_tsvector('simple', :excerpt), 'B') || "
+                "setweight(to_tsvector('simple', :content), 'C')) "
+                "ON CONFLICT (article_id) DO UPDATE SET document = EXCLUDED.document"
+            ), documents)
+
+    def remove_article(self, db: Session, article_id: int):
+        """删除一篇文章的索引"""
+        backend = self._backend(db.get_bind())
+        if backend == "fts5":
+            db.execute(text("DELETE FROM article_search WHERE rowid = :id"), {"id": article_id})
+        elif backend == "tsvector":
+            db.execute(text("DELETE FROM article_search WHERE article_id = :id"), {"id": article_id})
+
+    def rebuild(self, bind, batch_size: int = 500) -> int:
+        """清空并重建全部索引（会话或连接，由调用方提交），返回索引的文章数"""
+        backend = self._backend(bind)
+        if backend is None:
+            return 0
+        bind.execute(text("DELETE FROM article_search"))
+        count, last_id = 0, 0
+        while True:
+            batch = bind.execute(
+                select(Article.id, Article.title, Article.excerpt, Article.content)
+                .where(Article.id > last_id)
+                .order_by(Article.id)
+                .limit(batch_size)
+            ).all()
+            if not batch:
+                break
+            self._insert(bind, backend, [article_document(*row) for row in batch])
+            count += len(batch)
+            last_id = batch[-1][0]
+        return count
+
+    def search(
+        self,
+        db: Session,
+        query: str,
+        category: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 10
+    ) -> Optional[List[Tuple[int, float]]]:
+        """检索已发布文章，返回按相关度排序的 (文章ID, 得分)；不支持时返回 None"""
+        backend = self._backend(db.get_bind())
+        if backend is None:
+            return None
+        phrases = [p for p in query_phrases(query) if p]
+        if not phrases:
+            return []
+
+        params = {"skip": skip, "limit": limit, "category": category}
+        category_filter = "AND a.category = :category " if category else ""
+        if backend == "fts5":
+            params["q"] = _fts5_query(phrases)
+            sql = (
+                "SELECT a.id, -bm25(article_search, "
+                f"{TITLE_WEIGHT}, {EXCERPT_WEIGHT}, {CONTENT_WEIGHT}) AS score "
+                "FROM article_search JOIN articles a ON a.id = article_search.rowid "
+                "WHERE article_search MATCH :q AND a.status = '已发布' "
+                f"{category_filter}"
+                "ORDER BY score DESC, a.id DESC LIMIT :limit OFFSET :skip"
+            )
+        else:
+            params["q"] = _tsquery(phrases)
+            sql = (
+                "SELECT a.id, ts_rank_cd(s.document, q) AS score "
+                "FROM article_search s JOIN articles a ON a.id = s.article_id, "
+                "to_tsquery('simple', :q) q "
+                "WHERE s.document @@ q AND a.status = '已发布' "
+                f"{category_filter}"
+                "ORDER BY score DESC, a.id DESC LIMIT :limit OFFSET :skip"
+            )
+        return [(row[0], float(row[1])) for row in db.execute(text(sql), params)]
+
+
+# 全局实例
+search_index = SearchIndex()
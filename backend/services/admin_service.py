@@ -3,10 +3,50 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from ..models import Article, User, Comment
 from ..schemas import StatsResponse
+from ..counters import view_counter, like_counter
+from ..cache import caches
+from ..database import get_pool_stats, get_replica_router
+from .stats_service import SiteStatsService
+from .visitor_service import VisitorService
 
 class AdminService:
-    def get_dashboard_stats(self, db: Session) -> StatsResponse:
-        """获取仪表板统计数据"""
+    def __init__(self):
+        self.stats_service = SiteStatsService()
+        self.visitor_service = VisitorService()
+    
+    def get_dashboard_stats(self, db: Session, fresh: bool = False) -> StatsResponse:
+        """获取仪表板统计数据：默认读取 site_stats 汇总行，fresh 为 True 时全表重新统计"""
+        if fresh:
+            stats = self._compute_dashboard_stats(db)
+        else:
+            stats = self.stats_service.get_stats(db)
+            if stats is None:
+                # 汇总行还不存在（例如刚迁移的空库），先重算一次
+                self.stats_service.reconcile(db)
+                db.commit()
+                stats = self.stats_service.get_stats(db)
+        
+        # 加上缓冲区中尚未写回的浏览量和点赞数
+        stats["total_views"] += view_counter.pending_total()
+        stats["total_likes"] += like_counter.pending_total()
+        return stats
+    
+    def get_category_stats(self, db: Session) -> list:
+        """获取分类统计数据"""
+        return self.stats_service.get_category_stats(db)
+    
+    def get_article_visitors(self, db: Session, article_id: int, days: int) -> dict:
+        """获取文章的独立访客统计"""
+        return self.visitor_service.get_article_visitors(db, article_id, days)
+    
+    def reconcile_stats(self, db: Session) -> dict:
+        """从头重算统计汇总表"""
+        categories = self.stats_service.reconcile(db)
+        db.commit()
+        return {"message": "统计数据已重算", "categories": categories}
+    
+    def _compute_dashboard_stats(self, db: Session) -> dict:
+        """全表重新统计"""
         # 文章统计
         total_articles = db.query(Article).count()
         published_articles = db.query(Article).filter(Article.status == "已发布").count()
@@ -20,6 +60,7 @@ class AdminService:
         
         # 评论统计
         total_comments = db.query(Comment).count()
+        approved_comments = db.query(Comment).filter(Comment.is_approved.is_(True)).count()
         
         return {
             "total_articles": total_articles,
@@ -27,10 +68,23 @@ class AdminService:
             "draft_articles": draft_articles,
             "total_views": total_views,
             "total_likes": total_likes,
-            "total_comments": total_comments
+            "total_comments": total_comments,
+            "approved_comments": approved_comments
         }
     
     def get_all_users(self, db: Session) -> list:
         """获取所有用户"""
         users = db.query(User).all()
         return users
+    
+    def get_cache_stats(self) -> dict:
+        """获取各缓存的命中统计"""
+        return {name: cache.stats() for name, cache in caches.items()}
+
+    def get_pool_stats(self) -> dict:
+        """获取各引擎的连接池统计，配置了只读副本时附带读写分离统计"""
+        stats = get_pool_stats()
+        replica_router = get_replica_router()
+        if replica_router.replicas:
+            stats["routing"] = replica_router.stats()
+        return stats
@@ -1,41 +1,193 @@
 
-from typing import List, Optional
+from typing import List, Optional, Union
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy import desc, func, or_
 from datetime import datetime
-from ..models import Article
+from ..models import Article, ArticleTag, ArticleTrending, ArticleVisitorSketch, Comment, Tag
+from ..search import search_index, make_snippet
+from ..pagination import paginate_keyset, encode_offset_cursor, decode_offset_cursor
+from ..cache import article_list_cache
+from ..responses import serialize_page, to_dict
+from .stats_service import COUNTER_COLUMNS, SiteStatsService
+from .tag_service import TagService
+from .visitor_service import VisitorService
+from ..counters import view_counter, like_counter, increment, LIKE_COUNTER_MODE
+from ..visitors import visitor_sketches
+from ..trending import trending_tracker, TRENDING_TOP_K, TRENDING_VIEW_WEIGHT, TRENDING_LIKE_WEIGHT
 from ..schemas import (
     ArticleCreate, 
     ArticleUpdate, 
     ArticleResponse, 
-    ArticleListResponse
+    ArticleListResponse,
+    SearchResultResponse,
+    TrendingArticleResponse,
+    ArticleCursorPage,
+    AdminArticleCursorPage
 )
 
+# 列表响应需要的列：列表查询只加载这些列，不读取 content
+LIST_COLUMNS = [getattr(Article, name) for name in ArticleListResponse.model_fields if name in Article.__table__.c]
+
+# 文章的标签用一次 IN 查询批量加载，避免逐篇查询
+WITH_TAGS = selectinload(Article.tags).load_only(Tag.id, Tag.name)
+
 class ArticleService:
+    def __init__(self):
+        self.stats_service = SiteStatsService()
+        self.tag_service = TagService()
+        self.visitor_service = VisitorService()
+    
     def get_published_articles(
         self, 
         db: Session, 
         skip: int, 
         limit: int, 
         category: Optional[str] = None, 
-        search: Optional[str] = None
-    ) -> List[ArticleListResponse]:
-        """获取已发布的文章列表"""
-        query = db.query(Article).filter(Article.status == "已发布")
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        tag: Optional[str] = None
+    ) -> Union[List[ArticleListResponse], ArticleCursorPage]:
+        """获取已发布的文章列表；传入 cursor（第一页为空字符串）时使用游标分页，传入 tag 时按标签过滤"""
+        key = article_list_cache.make_key(cursor if cursor is not None else skip, limit, category, search, tag)
+        return article_list_cache.get_or_set(
+            key,
+            lambda: self._serialize_list(
+                self._query_published_articles(db, skip, limit, category, search, cursor, tag)
+            ),
+            tags=self._list_cache_tags(category, search, tag)
+        )
+    
+    def _query_published_articles(
+        self,
+        db: Session,
+        skip: int,
+        limit: int,
+        category: Optional[str] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        tag: Optional[str] = None
+    ):
+        """查询已发布的文章列表（不经过缓存，返回 ORM 对象）"""
+        if search and not tag and search_index.available(db):
+            if cursor is None:
+                hits = search_index.search(db, search, category, skip, limit)
+                return self._load_in_order(db, [article_id for article_id, _ in hits], LIST_COLUMNS)
+            # 相关度排序无法做 keyset 分页，游标中记录偏移量；没有检索索引时走下面的 LIKE 查询和 keyset 游标
+            offset = decode_offset_cursor(cursor)
+            hits = search_index.search(db, search, category, offset, limit + 1)
+            next_cursor = encode_offset_cursor(offset + limit) if len(hits) > limit else None
+            items = self._load_in_order(db, [article_id for article_id, _ in hits[:limit]], LIST_COLUMNS)
+            return {"items": items, "next_cursor": next_cursor}
+        
+        query = db.query(Article).options(load_only(*LIST_COLUMNS), WITH_TAGS).filter(Article.status == "已发布")
         
         if category:
             query = query.filter(Article.category == category)
         
+        if tag:
+            # 经 article_tags 的 (tag_id, article_id) 索引连接
+            query = (
+                query.join(ArticleTag, ArticleTag.article_id == Article.id)
+                .join(Tag, Tag.id == ArticleTag.tag_id)
+                .filter(Tag.name == tag)
+            )
+        
         if search:
-            query = query.filter(Article.title.contains(search))
+            # 数据库不支持全文检索时回退到 LIKE 查询
+            query = query.filter(or_(
+                Article.title.contains(search),
+                Article.excerpt.contains(search),
+                Article.content.contains(search)
+            ))
+        
+        if cursor is not None:
+            return paginate_keyset(query, Article.published_at, Article.id, cursor, limit)
         
         articles = query.order_by(desc(Article.published_at)).offset(skip).limit(limit).all()
         return articles
     
-    def get_article_by_id(self, article_id: int, db: Session) -> ArticleResponse:
-        """根据ID获取文章详情"""
-        article = db.query(Article).filter(
+    def _serialize_list(self, result):
+        """把列表结果直接按响应字段转成可缓存的字典（查询结果已符合模型，无需再校验）"""
+        return serialize_page(result, ArticleListResponse)
+    
+    def _list_cache_tags(self, category: Optional[str], search: Optional[str], tag: Optional[str] = None) -> List[str]:
+        """列表缓存条目的失效标签"""
+        if search:
+            return ["search"]
+        if tag:
+            return [f"tag:{tag}"]
+        return [f"category:{category}"] if category else ["all"]
+    
+    def _article_state(self, article: Article) -> tuple:
+        """决定文章出现在哪些列表中的状态：(状态, 分类, 标签名)"""
+        return (article.status, article.category, tuple(tag.name for tag in article.tags))
+    
+    def _invalidate_list_cache(self, *states):
+        """文章写入后按 (状态, 分类, 标签) 精确失效列表缓存和标签云；前后都不是已发布状态时无需失效"""
+        published = [state for state in states if state[0] == "已发布"]
+        if not published:
+            return
+        tags = {"all", "search"}
+        for _, category, tag_names in published:
+            if category:
+                tags.add(f"category:{category}")
+            tags.update(f"tag:{name}" for name in tag_names)
+        article_list_cache.invalidate(tags)
+        self.tag_service.invalidate_caches(article_lists=False)
+    
+    def search_articles(
+        self,
+        db: Session,
+        q: str,
+        skip: int,
+        limit: int,
+        category: Optional[str] = None
+    ) -> List[SearchResultResponse]:
+        """全文检索已发布文章，按相关度排序并附带摘要片段"""
+        hits = search_index.search(db, q, category, skip, limit)
+        if hits is None:
+            articles = self._query_published_articles(db, skip, limit, category, q)
+            hits = [(article.id, 0.0) for article in articles]
+        # 摘要片段需要正文，这里加载完整的文章
+        articles = self._load_in_order(db, [article_id for article_id, _ in hits])
+        
+        scores = dict(hits)
+        return [
+            SearchResultResponse(
+                **to_dict(article, ArticleListResponse),
+                snippet=make_snippet(article.content, q),
+                score=scores.get(article.id, 0.0)
+            )
+            for article in articles
+        ]
+    
+    def get_trending_articles(self, db: Session, limit: int) -> List[TrendingArticleResponse]:
+        """热门文章：从内存中的前 K 篇取候选，按主键批量加载，不扫描文章表"""
+        # 多取一些候选，跳过已下线的文章后仍能凑够 limit 篇
+        ranked = trending_tracker.top(min(TRENDING_TOP_K, limit * 2))
+        scores = dict(ranked)
+        articles = self._load_in_order(db, [article_id for article_id, _ in ranked], LIST_COLUMNS)
+        return [
+            {**to_dict(article, ArticleListResponse), "trending_score": round(scores[article.id], 4)}
+            for article in articles if article.status == "已发布"
+        ][:limit]
+    
+    def _load_in_order(self, db: Session, article_ids: List[int], columns=None) -> List[Article]:
+        """按给定 ID 顺序加载文章；columns 指定时只加载这些列"""
+        if not article_ids:
+            return []
+        query = db.query(Article).options(WITH_TAGS)
+        if columns:
+            query = query.options(load_only(*columns))
+        articles = query.filter(Article.id.in_(article_ids)).all()
+        by_id = {article.id: article for article in articles}
+        return [by_id[article_id] for article_id in article_ids if article_id in by_id]
+    
+    def get_article_by_id(self, article_id: int, db: Session, fingerprint: Optional[int] = None) -> ArticleResponse:
+        """根据ID获取文章详情；fingerprint 为访客指纹，计入独立访客"""
+        generation = view_counter.generation()
+        article = db.query(Article).options(WITH_TAGS).filter(
             Article.id == article_id,
             Article.status == "已发布"
         ).first()
@@ -46,22 +198,59 @@ class ArticleService:
                 detail="文章不存在"
             )
         
-        # 增加浏览量
-        article.views += 1
-        db.commit()
+        # 浏览量先记入缓冲区，由后台批量写回；响应中带上尚未写回的部分
+        self.record_view(article.id, fingerprint)
+        db.expunge(article)
+        article.views = view_counter.value(
+            article.id, article.views, generation,
+            lambda: db.query(Article.views).filter(Article.id == article_id).scalar()
+        )
         
         return article
     
+    def get_article_last_modified(self, article_id: int, db: Session) -> datetime:
+        """只读取已发布文章的修改时间，用于条件请求（不加载 content）"""
+        row = db.query(Article.updated_at, Article.created_at).filter(
+            Article.id == article_id,
+            Article.status == "已发布"
+        ).first()
+        
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="文章不存在"
+            )
+        
+        return row.updated_at or row.created_at
+    
+    def get_list_validators(self, db: Session) -> dict:
+        """已发布文章集合的最大修改时间和篇数，用于列表的条件请求；与列表缓存一起失效"""
+        def load():
+            last_modified, count = db.query(
+                func.max(Article.updated_at),
+                func.count(Article.id)
+            ).filter(Article.status == "已发布").one()
+            return {"last_modified": last_modified, "count": count}
+        
+        return article_list_cache.get_or_set(article_list_cache.make_key("validators"), load, tags=["all"])
+    
+    def record_view(self, article_id: int, fingerprint: Optional[int] = None):
+        """记录一次浏览（浏览量、当天的独立访客草图和热度）"""
+        view_counter.incr(article_id)
+        self.visitor_service.record_visit(article_id, fingerprint)
+        trending_tracker.record(article_id, TRENDING_VIEW_WEIGHT)
+    
     def get_admin_articles(
         self, 
         db: Session, 
         skip: int, 
         limit: int, 
         status_filter: Optional[str] = None, 
-        category: Optional[str] = None
-    ) -> List[ArticleResponse]:
-        """获取管理员文章列表"""
-        query = db.query(Article)
+        category: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Union[List[ArticleResponse], AdminArticleCursorPage]:
+        """获取管理员文章列表；传入 cursor（第一页为空字符串）时使用游标分页"""
+        query = db.query(Article).options(WITH_TAGS)
         
         if status_filter:
             query = query.filter(Article.status == status_filter)
@@ -69,23 +258,31 @@ class ArticleService:
         if category:
             query = query.filter(Article.category == category)
         
+        if cursor is not None:
+            return paginate_keyset(query, Article.created_at, Article.id, cursor, limit)
+        
         articles = query.order_by(desc(Article.created_at)).offset(skip).limit(limit).all()
         return articles
     
     def create_article(self, article: ArticleCreate, author_id: int, db: Session) -> ArticleResponse:
         """创建新文章"""
         db_article = Article(
-            **article.dict(),
+            **article.dict(exclude={"tags"}),
             author_id=author_id
         )
+        self.tag_service.set_article_tags(db, db_article, article.tags)
         
         # 如果是发布状态，设置发布时间
         if article.status == "已发布":
             db_article.published_at = datetime.utcnow()
         
         db.add(db_article)
+        db.flush()
+        search_index.index_article(db, db_article)
+        self.stats_service.on_article_created(db, db_article)
         db.commit()
         db.refresh(db_article)
+        self._invalidate_list_cache(self._article_state(db_article))
         
         return db_article
     
@@ -99,10 +296,15 @@ class ArticleService:
                 detail="文章不存在"
             )
         
+        old_state = self._article_state(db_article)
+        
         # 更新文章字段
         update_data = article_update.dict(exclude_unset=True)
+        tag_names = update_data.pop("tags", None)
         for field, value in update_data.items():
             setattr(db_article, field, value)
+        if tag_names is not None:
+            self.tag_service.set_article_tags(db, db_article, tag_names)
         
         # 如果状态改为发布且之前未发布，设置发布时间
         if (article_update.status == "已发布" and 
@@ -111,8 +313,16 @@ class ArticleService:
             db_article.published_at = datetime.utcnow()
         
         db_article.updated_at = datetime.utcnow()
+        search_index.index_article(db, db_article)
+        self.stats_service.on_article_updated(db, db_article, *old_state[:2])
+        if db_article.status != "已发布":
+            # 下线的文章移出热门，快照行也一并删除，不占前 K 篇的位置
+            db.query(ArticleTrending).filter(ArticleTrending.article_id == article_id).delete(synchronize_session=False)
         db.commit()
         db.refresh(db_article)
+        self._invalidate_list_cache(old_state, self._article_state(db_article))
+        if db_article.status != "已发布":
+            trending_tracker.remove(article_id)
         
         return db_article
     
@@ -126,22 +336,52 @@ class ArticleService:
                 detail="文章不存在"
             )
         
+        old_state = self._article_state(db_article)
+        search_index.remove_article(db, article_id)
+        
+        # 评论随文章一起删除，并从汇总中减去
+        comments, approved = self.stats_service.comment_counts(db, article_id)
+        self.stats_service.on_article_deleted(db, db_article, comments, approved)
+        db.query(Comment).filter(Comment.article_id == article_id).delete(synchronize_session=False)
+        db.query(ArticleVisitorSketch).filter(ArticleVisitorSketch.article_id == article_id).delete(synchronize_session=False)
+        db.query(ArticleTrending).filter(ArticleTrending.article_id == article_id).delete(synchronize_session=False)
+        
         db.delete(db_article)
         db.commit()
+        visitor_sketches.discard(article_id)
+        trending_tracker.remove(article_id)
+        self._invalidate_list_cache(old_state)
         
         return {"message": "文章删除成功"}
     
     def like_article(self, article_id: int, db: Session) -> dict:
         """文章点赞"""
-        article = db.query(Article).filter(Article.id == article_id).first()
+        if LIKE_COUNTER_MODE == "buffered":
+            # 缓冲模式：只读当前值，增量进缓冲区批量写回
+            # 用 first() 判断文章是否存在：likes 为 NULL 的文章 scalar() 也返回 None
+            generation = like_counter.generation()
+            row = db.query(Article.likes).filter(Article.id == article_id).first()
+            likes = None
+            if row is not None:
+                like_counter.incr(article_id)
+                likes = like_counter.value(
+                    article_id, row.likes, generation,
+                    lambda: db.query(Article.likes).filter(Article.id == article_id).scalar()
+                )
+        else:
+            # 在数据库中原子自增，并发点赞不会丢失更新；汇总在同一事务中累加
+            row = increment(db, Article.likes, article_id)
+            likes = None
+            if row is not None:
+                likes, category = row
+                self.stats_service.apply_deltas(db, category, {COUNTER_COLUMNS["likes"]: 1})
+                db.commit()
         
-        if not article:
+        if likes is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="文章不存在"
             )
         
-        article.likes += 1
-        db.commit()
-        
-        return {"message": "点赞成功", "likes": article.likes}
+        trending_tracker.record(article_id, TRENDING_LIKE_WEIGHT)
+        return {"message": "点赞成功", "likes": likes}
@@ -0,0 +1,38 @@
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..schemas import StatsResponse
+from .admin_service import AdminService
+
+class AsyncAdminService:
+    """AdminService 的异步版本：业务逻辑与同步版本共用，通过 AsyncSession.run_sync 在异步驱动上执行"""
+    
+    def __init__(self):
+        self.admin_service = AdminService()
+    
+    async def get_dashboard_stats(self, db: AsyncSession, fresh: bool = False) -> StatsResponse:
+        """获取仪表板统计数据"""
+        return await db.run_sync(lambda session: self.admin_service.get_dashboard_stats(session, fresh))
+    
+    async def get_category_stats(self, db: AsyncSession) -> list:
+        """获取分类统计数据"""
+        return await db.run_sync(self.admin_service.get_category_stats)
+    
+    async def get_article_visitors(self, db: AsyncSession, article_id: int, days: int) -> dict:
+        """获取文章的独立访客统计"""
+        return await db.run_sync(lambda session: self.admin_service.get_article_visitors(session, article_id, days))
+    
+    async def reconcile_stats(self, db: AsyncSession) -> dict:
+        """从头重算统计汇总表"""
+        return await db.run_sync(self.admin_service.reconcile_stats)
+    
+    async def get_all_users(self, db: AsyncSession) -> list:
+        """获取所有用户"""
+        return await db.run_sync(self.admin_service.get_all_users)
+    
+    def get_cache_stats(self) -> dict:
+        """获取各缓存的命中统计"""
+        return self.admin_service.get_cache_stats()
+    
+    def get_pool_stats(self) -> dict:
+        """获取各引擎的连接池统计"""
+        return self.admin_service.get_pool_stats()
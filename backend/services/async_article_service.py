@@ -0,0 +1,105 @@
+
+from datetime import datetime
+from typing import List, Optional, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..schemas import (
+    ArticleCreate,
+    ArticleUpdate,
+    ArticleResponse,
+    ArticleListResponse,
+    SearchResultResponse,
+    TrendingArticleResponse,
+    ArticleCursorPage,
+    AdminArticleCursorPage
+)
+from .article_service import ArticleService
+
+class AsyncArticleService:
+    """ArticleService 的异步版本：业务逻辑与同步版本共用，通过 AsyncSession.run_sync 在异步驱动上执行"""
+    
+    def __init__(self):
+        self.article_service = ArticleService()
+    
+    async def get_published_articles(
+        self,
+        db: AsyncSession,
+        skip: int,
+        limit: int,
+        category: Optional[str] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        tag: Optional[str] = None
+    ) -> Union[List[ArticleListResponse], ArticleCursorPage]:
+        """获取已发布的文章列表"""
+        return await db.run_sync(
+            lambda session: self.article_service.get_published_articles(
+                session, skip, limit, category, search, cursor, tag
+            )
+        )
+    
+    async def search_articles(
+        self,
+        db: AsyncSession,
+        q: str,
+        skip: int,
+        limit: int,
+        category: Optional[str] = None
+    ) -> List[SearchResultResponse]:
+        """全文检索已发布文章"""
+        return await db.run_sync(
+            lambda session: self.article_service.search_articles(session, q, skip, limit, category)
+        )
+    
+    async def get_trending_articles(self, db: AsyncSession, limit: int) -> List[TrendingArticleResponse]:
+        """热门文章"""
+        return await db.run_sync(lambda session: self.article_service.get_trending_articles(session, limit))
+    
+    async def get_article_by_id(self, article_id: int, db: AsyncSession, fingerprint: Optional[int] = None) -> ArticleResponse:
+        """根据ID获取文章详情"""
+        return await db.run_sync(
+            lambda session: self.article_service.get_article_by_id(article_id, session, fingerprint)
+        )
+    
+    async def get_article_last_modified(self, article_id: int, db: AsyncSession) -> datetime:
+        """只读取已发布文章的修改时间"""
+        return await db.run_sync(lambda session: self.article_service.get_article_last_modified(article_id, session))
+    
+    async def get_list_validators(self, db: AsyncSession) -> dict:
+        """已发布文章集合的校验信息"""
+        return await db.run_sync(self.article_service.get_list_validators)
+    
+    def record_view(self, article_id: int, fingerprint: Optional[int] = None):
+        """记录一次浏览（只写内存缓冲区，无需等待）"""
+        self.article_service.record_view(article_id, fingerprint)
+    
+    async def get_admin_articles(
+        self,
+        db: AsyncSession,
+        skip: int,
+        limit: int,
+        status_filter: Optional[str] = None,
+        category: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> Union[List[ArticleResponse], AdminArticleCursorPage]:
+        """获取管理员文章列表"""
+        return await db.run_sync(
+            lambda session: self.article_service.get_admin_articles(session, skip, limit, status_filter, category, cursor)
+        )
+    
+    async def create_article(self, article: ArticleCreate, author_id: int, db: AsyncSession) -> ArticleResponse:
+        """创建新文章"""
+        return await db.run_sync(lambda session: self.article_service.create_article(article, author_id, session))
+    
+    async def update_article(self, article_id: int, article_update: ArticleUpdate, db: AsyncSession) -> ArticleResponse:
+        """更新文章"""
+        return await db.run_sync(
+            lambda session: self.article_service.update_article(article_id, article_update, session)
+        )
+    
+    async def delete_article(self, article_id: int, db: AsyncSession) -> dict:
+        """删除文章"""
+        return await db.run_sync(lambda session: self.article_service.delete_article(article_id, session))
+    
+    async def like_article(self, article_id: int, db: AsyncSession) -> dict:
+        """文章点赞"""
+        return await db.run_sync(lambda session: self.article_service.like_article(article_id, session))
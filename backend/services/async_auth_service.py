@@ -0,0 +1,9 @@
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from .auth_service import AuthService
+
+class AsyncAuthService(AuthService):
+    """AuthService 的异步会话版本：数据库操作通过 AsyncSession.run_sync 在异步驱动上执行"""
+    
+    async def _run_db(self, db: AsyncSession, fn, *args):
+        return await db.run_sync(lambda session: fn(*args, session))
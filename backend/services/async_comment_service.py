@@ -0,0 +1,61 @@
+
+from typing import AsyncIterator, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..schemas import CommentCreate, CommentModeration, CommentResponse, CommentThreadPage
+from .comment_service import COMMENT_MODERATION_BATCH_SIZE, CommentService
+
+class AsyncCommentService:
+    """CommentService 的异步版本：业务逻辑与同步版本共用，通过 AsyncSession.run_sync 在异步驱动上执行"""
+    
+    def __init__(self):
+        self.comment_service = CommentService()
+    
+    async def create_comment(self, comment: CommentCreate, db: AsyncSession) -> CommentResponse:
+        """发表评论"""
+        return await db.run_sync(lambda session: self.comment_service.create_comment(comment, session))
+    
+    async def get_comment_thread(
+        self,
+        article_id: int,
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> CommentThreadPage:
+        """文章的已审核评论树"""
+        return await db.run_sync(
+            lambda session: self.comment_service.get_comment_thread(article_id, session, cursor, limit)
+        )
+    
+    async def approve_comment(self, comment_id: int, db: AsyncSession) -> CommentResponse:
+        """审核通过评论"""
+        return await db.run_sync(lambda session: self.comment_service.approve_comment(comment_id, session))
+    
+    async def delete_comment(self, comment_id: int, db: AsyncSession) -> dict:
+        """删除评论及其全部回复"""
+        return await db.run_sync(lambda session: self.comment_service.delete_comment(comment_id, session))
+    
+    async def iter_pending_comments(
+        self,
+        db: AsyncSession,
+        moderation: Optional[CommentModeration] = None,
+        batch_size: int = COMMENT_MODERATION_BATCH_SIZE
+    ) -> AsyncIterator[dict]:
+        """逐批遍历待审核评论"""
+        after_id = 0
+        while True:
+            batch = await db.run_sync(
+                lambda session: self.comment_service.get_pending_batch(session, after_id, batch_size, moderation)
+            )
+            for comment in batch:
+                yield comment
+            if len(batch) < batch_size:
+                return
+            after_id = batch[-1]["id"]
+    
+    async def approve_comments(self, moderation: CommentModeration, db: AsyncSession) -> dict:
+        """批量审核通过"""
+        return await db.run_sync(lambda session: self.comment_service.approve_comments(moderation, session))
+    
+    async def reject_comments(self, moderation: CommentModeration, db: AsyncSession) -> dict:
+        """批量拒绝"""
+        return await db.run_sync(lambda session: self.comment_service.reject_comments(moderation, session))
@@ -0,0 +1,31 @@
+
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..schemas import TagCreate, TagUpdate, TagResponse, TagCloudItem
+from .tag_service import TagService
+
+class AsyncTagService:
+    """TagService 的异步版本：业务逻辑与同步版本共用，通过 AsyncSession.run_sync 在异步驱动上执行"""
+    
+    def __init__(self):
+        self.tag_service = TagService()
+    
+    async def get_tags(self, db: AsyncSession) -> List[TagResponse]:
+        """获取全部标签"""
+        return await db.run_sync(self.tag_service.get_tags)
+    
+    async def get_tag_cloud(self, db: AsyncSession) -> List[TagCloudItem]:
+        """标签云"""
+        return await db.run_sync(self.tag_service.get_tag_cloud)
+    
+    async def create_tag(self, tag: TagCreate, db: AsyncSession) -> TagResponse:
+        """创建标签"""
+        return await db.run_sync(lambda session: self.tag_service.create_tag(tag, session))
+    
+    async def update_tag(self, tag_id: int, tag_update: TagUpdate, db: AsyncSession) -> TagResponse:
+        """更新标签"""
+        return await db.run_sync(lambda session: self.tag_service.update_tag(tag_id, tag_update, session))
+    
+    async def delete_tag(self, tag_id: int, db: AsyncSession) -> dict:
+        """删除标签"""
+        return await db.run_sync(lambda session: self.tag_service.delete_tag(tag_id, session))
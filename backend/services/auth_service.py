@@ -1,19 +1,29 @@
-
 from datetime import timedelta
+from typing import Optional
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from ..models import User
 from ..schemas import UserCreate, UserLogin, Token, UserResponse
 from ..auth import (
-    authenticate_user,
     create_access_token,
-    get_password_hash,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from ..hashing import password_hasher
 
 class AuthService:
-    def register_user(self, user: UserCreate, db: Session) -> UserResponse:
-        """用户注册业务逻辑"""
+    async def _run_db(self, db: Session, fn, *args):
+        """执行一段同步数据库操作：同步会话放到线程池中执行"""
+        return await run_in_threadpool(fn, *args, db)
+    
+    async def register_user(self, user: UserCreate, db: Session) -> UserResponse:
+        """用户注册业务逻辑：数据库操作不占用事件循环，密码哈希在独立执行器中计算"""
+        await self._run_db(db, self._check_user_unique, user)
+        hashed_password = await password_hasher.hash(user.password)
+        return await self._run_db(db, self._create_user, user, hashed_password)
+    
+    def _check_user_unique(self, user: UserCreate, db: Session):
+        """检查用户名和邮箱是否已被占用"""
         # 检查用户名是否已存在
         if db.query(User).filter(User.username == user.username).first():
             raise HTTPException(
@@ -27,9 +37,9 @@ class AuthService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="邮箱已存在"
             )
-        
-        # 创建新用户
-        hashed_password = get_password_hash(user.password)
+    
+    def _create_user(self, user: UserCreate, hashed_password: str, db: Session) -> User:
+        """创建新用户"""
         db_user = User(
             username=user.username,
             email=user.email,
@@ -46,10 +56,18 @@ class AuthService:
         
         return db_user
     
-    def login_user(self, user: UserLogin, db: Session) -> Token:
+    async def login_user(self, user: UserLogin, db: Session) -> Token:
         """用户登录业务逻辑"""
-        user_obj = authenticate_user(db, user.username, user.password)
-        if not user_obj:
+        user_obj = await self._run_db(db, self._get_user, user.username)
+        
+        verified = False
+        if user_obj:
+            verified, new_hash = await password_hasher.verify_and_update(user.password, user_obj.hashed_password)
+            if verified and new_hash:
+                # 哈希参数已过时（例如提高了 BCRYPT_ROUNDS），登录成功时顺便重新计算
+                await self._run_db(db, self._update_password_hash, user_obj, new_hash)
+        
+        if not verified:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="用户名或密码错误",
@@ -58,7 +76,7 @@ class AuthService:
         
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": user_obj.username}, expires_delta=access_token_expires
+            data={"sub": user_obj.username, "uid": user_obj.id}, expires_delta=access_token_expires
         )
         
         return {
@@ -66,3 +84,13 @@ class AuthService:
             "token_type": "bearer",
             "user": user_obj
         }
+    
+    def _get_user(self, username: str, db: Session) -> Optional[User]:
+        """按用户名查询用户"""
+        return db.query(User).filter(User.username == username).first()
+    
+    def _update_password_hash(self, user: User, hashed_password: str, db: Session):
+        """保存重新计算的密码哈希"""
+        user.hashed_password = hashed_password
+        db.commit()
+        db.refresh(user)
@@ -0,0 +1,305 @@
+
+import os
+from collections import Counter
+from typing import Dict, Iterator, List, Optional
+from fastapi import HTTPException, status
+from sqlalchemy import Update, delete, select, update
+from sqlalchemy.orm import Session
+from ..models import Article, Comment
+from ..pagination import paginate_keyset
+from ..schemas import CommentCreate, CommentModeration, CommentResponse, CommentThreadPage
+from .stats_service import SiteStatsService
+
+# 审核队列和批量审核每批处理的评论数（批量审核每批一个事务）
+COMMENT_MODERATION_BATCH_SIZE = int(os.getenv("COMMENT_MODERATION_BATCH_SIZE", "500"))
+
+# 评论树节点中返回的列（不含邮箱）
+NODE_COLUMNS = [
+    Comment.id,
+    Comment.article_id,
+    Comment.parent_id,
+    Comment.author_name,
+    Comment.content,
+    Comment.created_at,
+]
+
+class CommentService:
+    def __init__(self):
+        self.stats_service = SiteStatsService()
+    
+    def create_comment(self, comment: CommentCreate, db: Session) -> CommentResponse:
+        """发表评论（或回复），审核通过后才会公开"""
+        article = db.query(Article.id, Article.category).filter(
+            Article.id == comment.article_id,
+            Article.status == "已发布"
+        ).first()
+        if not article:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="文章不存在"
+            )
+        
+        if comment.parent_id is not None:
+            parent = db.query(Comment.article_id, Comment.is_approved).filter(Comment.id == comment.parent_id).first()
+            if not parent or parent.article_id != comment.article_id or not parent.is_approved:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="回复的评论不存在"
+                )
+        
+        db_comment = Comment(**comment.model_dump(), is_approved=False)
+        db.add(db_comment)
+        db.flush()
+        self.stats_service.on_comment_added(db, article.category)
+        db.commit()
+        db.refresh(db_comment)
+        return db_comment
+    
+    def get_comment_thread(
+        self,
+        article_id: int,
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> CommentThreadPage:
+        """文章的已审核评论树：首层评论按时间倒序游标分页，每页的全部回复用一次递归查询取出"""
+        roots_query = db.query(*NODE_COLUMNS).filter(
+            Comment.article_id == article_id,
+            Comment.is_approved.is_(True),
+            Comment.parent_id.is_(None)
+        )
+        page = paginate_keyset(roots_query, Comment.created_at, Comment.id, cursor or "", limit)
+        roots = page["items"]
+        # 有评论时文章必然存在（评论随文章删除），只有空页才需要确认文章是否存在
+        if not roots and not db.query(Article.id).filter(Article.id == article_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="文章不存在"
+            )
+        replies = self._load_replies(db, [root.id for root in roots])
+        return {"items": self._build_tree(roots, replies), "next_cursor": page["next_cursor"]}
+    
+    def _load_replies(self, db: Session, root_ids: List[int]) -> list:
+        """用递归 CTE 取出若干首层评论下所有已审核的回复（未审核评论下的回复不会被取出）"""
+        if not root_ids:
+            return []
+        thread = (
+            select(*NODE_COLUMNS)
+            .where(Comment.parent_id.in_(root_ids), Comment.is_approved.is_(True))
+            .cte("thread", recursive=True)
+        )
+        thread = thread.union_all(
+            select(*NODE_COLUMNS)
+            .join(thread, Comment.parent_id == thread.c.id)
+            .where(Comment.is_approved.is_(True))
+        )
+        return db.execute(select(thread).order_by(thread.c.created_at, thread.c.id)).all()
+    
+    def _build_tree(self, roots: list, replies: list) -> List[dict]:
+        """在内存中把首层评论和回复组装成树，回复按时间正序"""
+        nodes: Dict[int, dict] = {}
+        for row in list(roots) + list(replies):
+            nodes[row.id] = {
+                "id": row.id,
+                "article_id": row.article_id,
+                "parent_id": row.parent_id,
+                "author_name": row.author_name,
+                "content": row.content,
+                "created_at": row.created_at,
+                "replies": [],
+            }
+        for row in replies:
+            parent = nodes.get(row.parent_id)
+            if parent is not None:
+                parent["replies"].append(nodes[row.id])
+        return [nodes[root.id] for root in roots]
+    
+    def approve_comment(self, comment_id: int, db: Session) -> CommentResponse:
+        """审核通过评论"""
+        # 条件 UPDATE：并发审核同一条评论时只有实际改动了行的一方累加汇总
+        changed = self._moderate(db, update(Comment).values(is_approved=True), [self._comment_category(comment_id, db)])
+        for category, count in changed.items():
+            self.stats_service.on_comments_approved(db, category, count)
+        db.commit()
+        return self._get_comment(comment_id, db)
+    
+    def delete_comment(self, comment_id: int, db: Session) -> dict:
+        """删除评论及其全部回复"""
+        comment = self._comment_category(comment_id, db)
+        subtree = select(Comment.id).where(Comment.id == comment_id).cte("subtree", recursive=True)
+        subtree = subtree.union_all(select(Comment.id).join(subtree, Comment.parent_id == subtree.c.id))
+        rows = db.execute(
+            select(Comment.id, Comment.is_approved).where(Comment.id.in_(select(subtree.c.id)))
+        ).all()
+        
+        deleted = db.query(Comment).filter(Comment.id.in_([row.id for row in rows])).delete(synchronize_session=False)
+        approved = sum(1 for row in rows if row.is_approved)
+        self.stats_service.on_comment_added(db, comment.category, -deleted, -approved)
+        db.commit()
+        return {"message": "评论删除成功", "deleted": deleted}
+    
+    def get_pending_batch(
+        self,
+        db: Session,
+        after_id: int = 0,
+        limit: int = COMMENT_MODERATION_BATCH_SIZE,
+        moderation: Optional[CommentModeration] = None
+    ) -> List[dict]:
+        """按 id 顺序取 after_id 之后的一批待审核评论（跨全部文章）"""
+        query = (
+            select(
+                Comment.id,
+                Comment.article_id,
+                Article.title.label("article_title"),
+                Comment.parent_id,
+                Comment.author_name,
+                Comment.author_email,
+                Comment.content,
+                Comment.created_at,
+            )
+            .join(Article, Article.id == Comment.article_id)
+            .where(Comment.id > after_id)
+        )
+        query = self._pending_filter(query, moderation)
+        return [dict(row) for row in db.execute(query.order_by(Comment.id).limit(limit)).mappings()]
+    
+    def iter_pending_comments(
+        self,
+        db: Session,
+        moderation: Optional[CommentModeration] = None,
+        batch_size: int = COMMENT_MODERATION_BATCH_SIZE
+    ) -> Iterator[dict]:
+        """逐批遍历待审核评论，每批一次按主键的短查询，不长时间占用数据库游标"""
+        after_id = 0
+        while True:
+            batch = self.get_pending_batch(db, after_id, batch_size, moderation)
+            yield from batch
+            if len(batch) < batch_size:
+                return
+            after_id = batch[-1]["id"]
+    
+    def approve_comments(
+        self,
+        moderation: CommentModeration,
+        db: Session,
+        batch_size: int = COMMENT_MODERATION_BATCH_SIZE
+    ) -> dict:
+        """批量审核通过：每批一条 UPDATE，和已审核评论数的增量在同一事务中提交"""
+        approved = 0
+        for rows in self._moderation_batches(moderation, db, batch_size):
+            changed = self._moderate(db, update(Comment).values(is_approved=True), rows)
+            for category, count in changed.items():
+                self.stats_service.on_comments_approved(db, category, count)
+            db.commit()
+            approved += sum(changed.values())
+        return {"message": "评论审核通过", "count": approved}
+    
+    def reject_comments(
+        self,
+        moderation: CommentModeration,
+        db: Session,
+        batch_size: int = COMMENT_MODERATION_BATCH_SIZE
+    ) -> dict:
+        """批量拒绝：每批一条 DELETE 删除待审核评论（待审核评论不能被回复，没有子评论）"""
+        rejected = 0
+        for rows in self._moderation_batches(moderation, db, batch_size):
+            changed = self._moderate(db, delete(Comment), rows)
+            for category, count in changed.items():
+                self.stats_service.on_comment_added(db, category, -count)
+            db.commit()
+            rejected += sum(changed.values())
+        return {"message": "评论已拒绝", "count": rejected}
+    
+    def _moderate(self, db: Session, stmt, rows: list) -> Counter:
+        """对本批中仍待审核的评论执行 UPDATE/DELETE，返回实际改动的评论数（按文章分类）
+
+        并发审核同一批评论时只有一方真正改动了行，统计增量以实际改动的行为准。
+        """
+        categories = {row.id: row.category for row in rows}
+        stmt = (
+            stmt.where(Comment.id.in_(list(categories)), Comment.is_approved.is_(False))
+            .execution_options(synchronize_session=False)
+        )
+        dialect = db.get_bind().dialect
+        if dialect.update_returning if isinstance(stmt, Update) else dialect.delete_returning:
+            changed = db.execute(stmt.returning(Comment.id)).scalars().all()
+        else:
+            # 不支持 RETURNING 的数据库：本批评论已被 FOR UPDATE 锁住，改动前重新确认仍待审核的行
+            changed = db.execute(
+                select(Comment.id)
+                .where(Comment.id.in_(list(categories)), Comment.is_approved.is_(False))
+                .with_for_update()
+            ).scalars().all()
+            db.execute(stmt.where(Comment.id.in_(changed)))
+        return Counter(categories[comment_id] for comment_id in changed)
+    
+    def _moderation_batches(self, moderation: CommentModeration, db: Session, batch_size: int) -> Iterator[list]:
+        """逐批取出要处理的待审核评论 (id, 文章分类)，调用方处理完一批并提交后再取下一批"""
+        if (moderation.ids is None and moderation.article_id is None
+                and moderation.author_email is None and moderation.before is None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="请指定评论 id 或筛选条件"
+            )
+        if moderation.ids is None:
+            yield from self._pending_batches(moderation, db, batch_size)
+            return
+        # id 列表按批拆开，每条语句的参数个数有上限
+        ids = sorted(set(moderation.ids))
+        for start in range(0, len(ids), batch_size):
+            chunk = moderation.model_copy(update={"ids": ids[start:start + batch_size]})
+            yield from self._pending_batches(chunk, db, batch_size)
+    
+    def _pending_batches(self, moderation: CommentModeration, db: Session, batch_size: int) -> Iterator[list]:
+        after_id = 0
+        while True:
+            query = (
+                select(Comment.id, Article.category)
+                .join(Article, Article.id == Comment.article_id)
+                .where(Comment.id > after_id)
+            )
+            query = self._pending_filter(query, moderation)
+            # PostgreSQL 等支持行锁的数据库上锁住本批评论，避免并发审核重复计数
+            rows = db.execute(query.order_by(Comment.id).limit(batch_size).with_for_update(of=Comment)).all()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1].id
+    
+    def _pending_filter(self, query, moderation: Optional[CommentModeration]):
+        query = query.where(Comment.is_approved.is_(False))
+        if moderation is None:
+            return query
+        if moderation.ids is not None:
+            query = query.where(Comment.id.in_(moderation.ids))
+        if moderation.article_id is not None:
+            query = query.where(Comment.article_id == moderation.article_id)
+        if moderation.author_email is not None:
+            query = query.where(Comment.author_email == moderation.author_email)
+        if moderation.before is not None:
+            query = query.where(Comment.created_at < moderation.before)
+        return query
+    
+    def _comment_category(self, comment_id: int, db: Session):
+        """评论的 (id, 文章分类)；评论或文章不存在时 404"""
+        row = db.query(Comment.id, Article.category).join(Article, Article.id == Comment.article_id).filter(
+            Comment.id == comment_id
+        ).first()
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="评论不存在"
+            )
+        return row
+    
+    def _get_comment(self, comment_id: int, db: Session) -> Comment:
+        """取评论；文章已删除的评论视为不存在"""
+        db_comment = db.query(Comment).join(Article, Article.id == Comment.article_id).filter(Comment.id == comment_id).first()
+        if not db_comment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="评论不存在"
+            )
+        return db_comment
@@ -0,0 +1,212 @@
+
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from ..counters import like_counter, view_counter
+from ..models import Article, Comment, SiteStats
+
+SITE_SCOPE = "site"
+
+STAT_COLUMNS = (
+    "total_articles",
+    "published_articles",
+    "draft_articles",
+    "total_views",
+    "total_likes",
+    "total_comments",
+    "approved_comments",
+)
+
+# 计数列到统计列的对应关系
+COUNTER_COLUMNS = {"views": "total_views", "likes": "total_likes"}
+
+
+def category_scope(category: Optional[str]) -> str:
+    """分类汇总行的 scope"""
+    return f"category:{category or ''}"
+
+
+def _dialect_name(bind) -> str:
+    if isinstance(bind, Session):
+        bind = bind.get_bind()
+    return bind.dialect.name
+
+
+class SiteStatsService:
+    """维护 site_stats 汇总表：各写路径在同一事务中累加增量，reconcile 从头重算"""
+
+    def apply_deltas(self, db, category: Optional[str], deltas: Dict[str, int]):
+        """把增量同时累加到全站行和分类行"""
+        deltas = {column: value for column, value in deltas.items() if value}
+        if not deltas:
+            return
+
+        table = SiteStats.__table__
+        now = datetime.utcnow()
+        dialect = _dialect_name(db)
+        for scope in (SITE_SCOPE, category_scope(category)):
+            if dialect in ("sqlite", "postgresql"):
+                insert_fn = sqlite.insert if dialect == "sqlite" else postgresql.insert
+                stmt = insert_fn(table).values(scope=scope, updated_at=now, **deltas)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[table.c.scope],
+                    set_={
+                        **{column: table.c[column] + stmt.excluded[column] for column in deltas},
+                        "updated_at": now,
+                    }
+                )
+                db.execute(stmt)
+            else:
+                result = db.execute(
+                    update(table)
+                    .where(table.c.scope == scope)
+                    .values({column: table.c[column] + value for column, value in deltas.items()}, updated_at=now)
+                )
+                if result.rowcount == 0:
+                    db.execute(insert(table).values(scope=scope, updated_at=now, **deltas))
+
+    def article_contribution(
+        self,
+        article_status: Optional[str],
+        views: Optional[int] = 0,
+        likes: Optional[int] = 0,
+        comments: int = 0,
+        approved_comments: int = 0,
+        sign: int = 1
+    ) -> Dict[str, int]:
+        """一篇文章对汇总行的贡献"""
+        return {
+            "total_articles": sign,
+            "published_articles": sign * int(article_status == "已发布"),
+            "draft_articles": sign * int(article_status == "草稿"),
+            "total_views": sign * (views or 0),
+            "total_likes": sign * (likes or 0),
+            "total_comments": sign * comments,
+            "approved_comments": sign * approved_comments,
+        }
+
+    def comment_counts(self, db: Session, article_id: int) -> Tuple[int, int]:
+        """文章的评论数和已审核评论数"""
+        total, approved = db.query(
+            func.count(Comment.id),
+            func.sum(case((Comment.is_approved.is_(True), 1), else_=0))
+        ).filter(Comment.article_id == article_id).one()
+        return total, int(approved or 0)
+
+    def on_article_created(self, db: Session, article: Article):
+        """新建文章"""
+        self.apply_deltas(db, article.category, self.article_contribution(article.status))
+
+    def on_article_updated(
+        self,
+        db: Session,
+        article: Article,
+        old_status: Optional[str],
+        old_category: Optional[str]
+    ):
+        """文章状态或分类变化（在提交前调用）"""
+        if old_status == article.status and old_category == article.category:
+            return
+        if old_category == article.category:
+            self.apply_deltas(db, article.category, {
+                "published_articles": int(article.status == "已发布") - int(old_status == "已发布"),
+                "draft_articles": int(article.status == "草稿") - int(old_status == "草稿"),
+            })
+            return
+        # 分类变化时，把整篇文章的贡献从旧分类移到新分类
+        comments, approved = self.comment_counts(db, article.id)
+        self.apply_deltas(db, old_category, self.article_contribution(
+            old_status, article.views, article.likes, comments, approved, sign=-1
+        ))
+        self.apply_deltas(db, article.category, self.article_contribution(
+            article.status, article.views, article.likes, comments, approved
+        ))
+
+    def on_article_deleted(self, db: Session, article: Article, comments: int, approved_comments: int = 0):
+        """删除文章：减去文章和它的评论（reconcile 只统计现有文章的评论）"""
+        self.apply_deltas(db, article.category, self.article_contribution(
+            article.status, article.views, article.likes, comments, approved_comments, sign=-1
+        ))
+
+    def on_counter_flushed(self, db, column_key: str, deltas: Dict[int, int]):
+        """浏览量、点赞数写回时按分类累加"""
+        column = COUNTER_COLUMNS[column_key]
+        categories = db.execute(
+            select(Article.id, Article.category).where(Article.id.in_(list(deltas)))
+        ).all()
+        by_category: Dict[Optional[str], int] = {}
+        for article_id, category in categories:
+            by_category[category] = by_category.get(category, 0) + deltas[article_id]
+        for category, value in by_category.items():
+            self.apply_deltas(db, category, {column: value})
+
+    def on_comment_added(self, db, category: Optional[str], count: int = 1, approved: int = 0):
+        """新增（或删除，count 为负）评论，approved 为其中已审核评论的增量"""
+        self.apply_deltas(db, category, {"total_comments": count, "approved_comments": approved})
+
+    def on_comments_approved(self, db, category: Optional[str], count: int):
+        """评论审核通过"""
+        self.apply_deltas(db, category, {"approved_comments": count})
+
+    def reconcile(self, db) -> int:
+        """用一次分组查询从头重算全部汇总行，返回分类数"""
+        comment_counts = (
+            select(
+                Comment.article_id,
+                func.count(Comment.id).label("comments"),
+                func.sum(case((Comment.is_approved.is_(True), 1), else_=0)).label("approved"),
+            )
+            .group_by(Comment.article_id)
+            .subquery()
+        )
+        rows = db.execute(
+            select(
+                Article.category,
+                func.count(Article.id),
+                func.sum(case((Article.status == "已发布", 1), else_=0)),
+                func.sum(case((Article.status == "草稿", 1), else_=0)),
+                func.sum(func.coalesce(Article.views, 0)),
+                func.sum(func.coalesce(Article.likes, 0)),
+                func.sum(func.coalesce(comment_counts.c.comments, 0)),
+                func.sum(func.coalesce(comment_counts.c.approved, 0)),
+            )
+            .select_from(Article)
+            .outerjoin(comment_counts, comment_counts.c.article_id == Article.id)
+            .group_by(Article.category)
+        ).all()
+
+        now = datetime.utcnow()
+        site = dict.fromkeys(STAT_COLUMNS, 0)
+        values = []
+        for category, *numbers in rows:
+            row = dict(zip(STAT_COLUMNS, (int(n or 0) for n in numbers)))
+            for column in STAT_COLUMNS:
+                site[column] += row[column]
+            values.append({"scope": category_scope(category), "updated_at": now, **row})
+        values.append({"scope": SITE_SCOPE, "updated_at": now, **site})
+
+        table = SiteStats.__table__
+        db.execute(table.delete())
+        db.execute(insert(table), values)
+        return len(values) - 1
+
+    def get_stats(self, db: Session, scope: str = SITE_SCOPE) -> Optional[dict]:
+        """读取一行汇总"""
+        row = db.get(SiteStats, scope)
+        if row is None:
+            return None
+        return {column: getattr(row, column) for column in STAT_COLUMNS}
+
+    def get_category_stats(self, db: Session) -> list:
+        """读取全部分类汇总"""
+        rows = db.query(SiteStats).filter(SiteStats.scope.startswith("category:")).order_by(SiteStats.scope).all()
+        return [
+            {"category": row.scope[len("category:"):] or None, **{c: getattr(row, c) for c in STAT_COLUMNS}}
+            for row in rows
+        ]
+
+
+# 浏览量、点赞的缓冲区写回时，在同一事务中按分类累加汇总
+view_counter.on_flush = like_counter.on_flush = SiteStatsService().on_counter_flushed
@@ -0,0 +1,135 @@
+
+from datetime import datetime
+from typing import Iterable, List
+from fastapi import HTTPException, status
+from sqlalchemy import desc, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..models import Article, ArticleTag, Tag
+from ..schemas import TagCreate, TagUpdate, TagResponse, TagCloudItem
+from ..cache import article_list_cache, tag_cloud_cache
+
+class TagService:
+    def get_tags(self, db: Session) -> List[TagResponse]:
+        """获取全部标签"""
+        return db.query(Tag).order_by(Tag.name).all()
+    
+    def get_tag_cloud(self, db: Session) -> List[TagCloudItem]:
+        """标签云：每个标签的已发布文章数（一次分组查询，结果缓存）"""
+        def load():
+            rows = db.execute(
+                select(Tag.id, Tag.name, func.count(func.distinct(Article.id)).label("count"))
+                .join(ArticleTag, ArticleTag.tag_id == Tag.id)
+                .join(Article, Article.id == ArticleTag.article_id)
+                .where(Article.status == "已发布")
+                .group_by(Tag.id, Tag.name)
+                .order_by(desc("count"), Tag.name)
+            ).all()
+            return [{"id": row.id, "name": row.name, "count": row.count} for row in rows]
+        
+        return tag_cloud_cache.get_or_set(tag_cloud_cache.make_key("cloud"), load, tags=["cloud"])
+    
+    def create_tag(self, tag: TagCreate, db: Session) -> TagResponse:
+        """创建标签"""
+        if db.query(Tag.id).filter(Tag.name == tag.name).first():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="标签已存在"
+            )
+        db_tag = Tag(**tag.model_dump())
+        db.add(db_tag)
+        db.commit()
+        db.refresh(db_tag)
+        return db_tag
+    
+    def update_tag(self, tag_id: int, tag_update: TagUpdate, db: Session) -> TagResponse:
+        """更新标签；改名时一并更新使用该标签的文章的修改时间，使列表缓存和 ETag 失效"""
+        db_tag = self._get_tag(tag_id, db)
+        update_data = tag_update.model_dump(exclude_unset=True)
+        renamed = "name" in update_data and update_data["name"] != db_tag.name
+        if renamed and db.query(Tag.id).filter(Tag.name == update_data["name"]).first():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="标签已存在"
+            )
+        
+        for field, value in update_data.items():
+            setattr(db_tag, field, value)
+        if renamed:
+            self._touch_articles(db, tag_id)
+        db.commit()
+        db.refresh(db_tag)
+        if renamed:
+            self.invalidate_caches()
+        return db_tag
+    
+    def delete_tag(self, tag_id: int, db: Session) -> dict:
+        """删除标签及其与文章的关联"""
+        db_tag = self._get_tag(tag_id, db)
+        self._touch_articles(db, tag_id)
+        db.query(ArticleTag).filter(ArticleTag.tag_id == tag_id).delete(synchronize_session=False)
+        db.delete(db_tag)
+        db.commit()
+        self.invalidate_caches()
+        return {"message": "标签删除成功"}
+    
+    def resolve_tags(self, db: Session, names: Iterable[str]) -> List[Tag]:
+        """按名称查找标签，不存在的自动创建（去重、去空白，保持顺序）"""
+        names = list(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+        if not names:
+            return []
+        existing = {tag.name: tag for tag in db.query(Tag).filter(Tag.name.in_(names))}
+        missing = [name for name in names if name not in existing]
+        if missing:
+            # 并发请求可能同时创建同名标签：冲突时跳过插入，再统一查回
+            self._insert_missing(db, missing)
+            existing.update((tag.name, tag) for tag in db.query(Tag).filter(Tag.name.in_(missing)))
+        return [existing[name] for name in names]
+    
+    def set_article_tags(self, db: Session, article: Article, names: Iterable[str]):
+        """替换文章的标签"""
+        tags = self.resolve_tags(db, names)
+        article.tag_links = [ArticleTag(tag=tag) for tag in tags]
+    
+    def invalidate_caches(self, article_lists: bool = True):
+        """标签变化后失效标签云；标签改名或删除时文章列表中的标签名也要失效"""
+        tag_cloud_cache.invalidate(["cloud"])
+        if article_lists:
+            article_list_cache.clear()
+    
+    def _get_tag(self, tag_id: int, db: Session) -> Tag:
+        db_tag = db.query(Tag).filter(Tag.id == tag_id).first()
+        if not db_tag:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="标签不存在"
+            )
+        return db_tag
+    
+    def _insert_missing(self, db: Session, names: List[str]):
+        """插入新标签，已被其他事务插入的同名标签直接跳过"""
+        table = Tag.__table__
+        dialect = db.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            insert_fn = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            db.execute(
+                insert_fn(table).on_conflict_do_nothing(index_elements=[table.c.name]),
+                [{"name": name, "created_at": datetime.utcnow()} for name in names]
+            )
+            return
+        for name in names:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(table).values(name=name, created_at=datetime.utcnow()))
+            except IntegrityError:
+                pass
+    
+    def _touch_articles(self, db: Session, tag_id: int):
+        """更新使用某个标签的文章的修改时间"""
+        db.execute(
+            update(Article)
+            .where(Article.id.in_(select(ArticleTag.article_id).where(ArticleTag.tag_id == tag_id)))
+            .values(updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
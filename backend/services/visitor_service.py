@@ -0,0 +1,76 @@
+
+from datetime import date, timedelta
+from typing import Dict, Optional
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from ..models import Article, ArticleVisitorSketch
+from ..counters import view_counter
+from ..sketches import HyperLogLog
+from ..visitors import UNIQUE_VISITORS_ENABLED, utc_today, visitor_sketches
+
+# 周、月独立访客由每天的草图合并得到
+WEEK_DAYS = 7
+MONTH_DAYS = 30
+
+
+class VisitorService:
+    """文章独立访客：记录访问，按日期区间合并草图估计独立访客数"""
+
+    def record_visit(self, article_id: int, fingerprint: Optional[int]):
+        """记录一次访问（只写内存草图）；没有指纹（爬虫）或功能关闭时忽略"""
+        if UNIQUE_VISITORS_ENABLED and fingerprint is not None:
+            visitor_sketches.add(article_id, fingerprint)
+
+    def get_daily_sketches(self, db: Session, article_id: int, start: date, end: date) -> Dict[date, HyperLogLog]:
+        """[start, end] 内每天的草图：数据库中已写回的与内存中尚未写回的合并"""
+        sketches = {
+            day: HyperLogLog.from_bytes(sketch)
+            for day, sketch in db.query(ArticleVisitorSketch.day, ArticleVisitorSketch.sketch).filter(
+                ArticleVisitorSketch.article_id == article_id,
+                ArticleVisitorSketch.day >= start,
+                ArticleVisitorSketch.day <= end
+            )
+        }
+        for day, sketch in visitor_sketches.pending(article_id, start, end).items():
+            if day in sketches:
+                sketches[day].merge(sketch)
+            else:
+                sketches[day] = sketch
+        return sketches
+
+    def get_article_visitors(self, db: Session, article_id: int, days: int = MONTH_DAYS) -> dict:
+        """文章最近 days 天每天的独立访客，以及今天、最近 7 天、最近 30 天的独立访客"""
+        views = db.query(Article.views).filter(Article.id == article_id).scalar()
+        if views is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="文章不存在"
+            )
+
+        today = utc_today()
+        start = today - timedelta(days=max(days, MONTH_DAYS) - 1)
+        sketches = self.get_daily_sketches(db, article_id, start, today)
+
+        def unique_since(first_day: date) -> int:
+            merged = HyperLogLog(visitor_sketches.precision)
+            for day, sketch in sketches.items():
+                if day >= first_day:
+                    merged.merge(sketch)
+            return merged.count()
+
+        daily = []
+        for offset in range(days - 1, -1, -1):
+            day = today - timedelta(days=offset)
+            sketch = sketches.get(day)
+            daily.append({"day": day, "unique_visitors": sketch.count() if sketch else 0})
+
+        return {
+            "article_id": article_id,
+            "views": views + view_counter.pending(article_id),
+            "unique_today": daily[-1]["unique_visitors"],
+            "unique_7d": unique_since(today - timedelta(days=WEEK_DAYS - 1)),
+            "unique_30d": unique_since(today - timedelta(days=MONTH_DAYS - 1)),
+            "daily": daily,
+            "sketch_bytes": visitor_sketches.sketch_bytes,
+            "standard_error": round(HyperLogLog(visitor_sketches.precision).standard_error, 4),
+        }
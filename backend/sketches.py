@@ -0,0 +1,142 @@
+
+"""
+HyperLogLog 基数估计
+
+- 2^precision 个寄存器，每个 1 字节；标准误差约 1.04 / sqrt(2^precision)（precision=12 时 4 KiB、约 1.6%）
+- 寄存器很少时用稀疏字典保存，超过 m/8 个后转为定长的 bytearray，内存不随访客数增长
+- merge 按寄存器取最大值，可以合并不同进程、不同日期的草图（例如每天的草图合并成周、月）
+- to_bytes / from_bytes：稀疏时存 (寄存器号, 值) 对，否则存全部寄存器，取较短的一种
+"""
+import hashlib
+import math
+import struct
+from typing import Dict, Iterable, Optional
+
+_DENSE = 0
+_SPARSE = 1
+_SPARSE_ENTRY = struct.Struct(">HB")
+_HEADER = struct.Struct("BB")
+_MASK64 = (1 << 64) - 1
+
+# 2^-rank，计算调和平均时查表
+_INVERSE_POWERS = [2.0 ** -rank for rank in range(66)]
+
+
+def hash64(value: bytes, key: bytes = b"") -> int:
+    """64 位哈希（blake2b，可以带密钥）"""
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8, key=key).digest(), "big")
+
+
+class HyperLogLog:
+    """HyperLogLog 草图，add 接收 64 位哈希值"""
+
+    __slots__ = ("precision", "_sparse", "_dense")
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision 必须在 4～16 之间")
+        self.precision = precision
+        self._sparse: Optional[Dict[int, int]] = {}
+        self._dense: Optional[bytearray] = None
+
+    @property
+    def size(self) -> int:
+        """寄存器个数 m"""
+        return 1 << self.precision
+
+    @property
+    def standard_error(self) -> float:
+        return 1.04 / math.sqrt(self.size)
+
+    def add(self, hashed: int):
+        """加入一个元素的 64 位哈希"""
+        hashed &= _MASK64
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        # 剩余位中前导零的个数 + 1
+        rank = 64 - self.precision - rest.bit_length() + 1
+        self._set(index, rank)
+
+    def _set(self, index: int, rank: int):
+        if self._dense is not None:
+            if rank > self._dense[index]:
+                self._dense[index] = rank
+            return
+        if rank > self._sparse.get(index, 0):
+            self._sparse[index] = rank
+            if len(self._sparse) > self.size // 8:
+                self._to_dense()
+
+    def _to_dense(self):
+        dense = bytearray(self.size)
+        for index, rank in self._sparse.items():
+            dense[index] = rank
+        self._dense, self._sparse = dense, None
+
+    def _registers(self) -> Iterable:
+        """(寄存器号, 值)，只包含非零寄存器"""
+        if self._dense is None:
+            return self._sparse.items()
+        return ((index, rank) for index, rank in enumerate(self._dense) if rank)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """并入另一个草图（按寄存器取最大值），返回 self"""
+        if other.precision != self.precision:
+            raise ValueError("只能合并相同精度的草图")
+        if other._dense is not None:
+            if self._dense is None:
+                self._to_dense()
+            self._dense = bytearray(map(max, self._dense, other._dense))
+        else:
+            for index, rank in other._sparse.items():
+                self._set(index, rank)
+        return self
+
+    def copy(self) -> "HyperLogLog":
+        sketch = HyperLogLog(self.precision)
+        if self._dense is not None:
+            sketch._dense, sketch._sparse = bytearray(self._dense), None
+        else:
+            sketch._sparse = dict(self._sparse)
+        return sketch
+
+    def count(self) -> int:
+        """估计的不同元素个数"""
+        m = self.size
+        if self._dense is not None:
+            zeros = self._dense.count(0)
+            total = sum(map(_INVERSE_POWERS.__getitem__, self._dense))
+        else:
+            zeros = m - len(self._sparse)
+            total = zeros + sum(map(_INVERSE_POWERS.__getitem__, self._sparse.values()))
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / total
+        # 小基数时用线性计数修正；64 位哈希不需要大基数修正
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        """序列化：[precision][编码] + 稀疏的 (寄存器号, 值) 对或全部寄存器"""
+        registers = sorted(self._registers())
+        if len(registers) * _SPARSE_ENTRY.size < self.size:
+            body = b"".join(_SPARSE_ENTRY.pack(index, rank) for index, rank in registers)
+            return _HEADER.pack(self.precision, _SPARSE) + body
+        dense = self._dense if self._dense is not None else bytearray(self.size)
+        if self._dense is None:
+            for index, rank in registers:
+                dense[index] = rank
+        return _HEADER.pack(self.precision, _DENSE) + bytes(dense)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        precision, encoding = _HEADER.unpack_from(data)
+        sketch = cls(precision)
+        body = memoryview(data)[_HEADER.size:]
+        if encoding == _DENSE:
+            if len(body) != sketch.size:
+                raise ValueError("草图数据长度不正确")
+            sketch._dense, sketch._sparse = bytearray(body), None
+        else:
+            for index, rank in _SPARSE_ENTRY.iter_unpack(body):
+                sketch._set(index, rank)
+        return sketch
@@ -0,0 +1,43 @@
+
+"""
+SQLite 只读副本同步脚本
+本地没有真正的复制环境时，用几个 SQLite 文件模拟只读副本：
+把主库完整复制到 DATABASE_REPLICA_URLS 中的每个 SQLite 文件，可反复执行以模拟复制。
+
+    DATABASE_REPLICA_URLS=sqlite:///./replica1.db,sqlite:///./replica2.db python -m backend.sync_sqlite_replicas
+"""
+import sqlite3
+from .database import SQLALCHEMY_DATABASE_URL, DATABASE_REPLICA_URLS
+
+def _sqlite_path(url: str) -> str:
+    if not url.startswith("sqlite"):
+        raise ValueError(f"不是 SQLite 数据库: {url}")
+    return url.partition(":///")[2]
+
+def sync_replicas():
+    """把主库复制到各个 SQLite 副本"""
+    if not DATABASE_REPLICA_URLS:
+        print("未配置 DATABASE_REPLICA_URLS")
+        return
+    
+    source = sqlite3.connect(_sqlite_path(SQLALCHEMY_DATABASE_URL))
+    synced = 0
+    try:
+        for url in DATABASE_REPLICA_URLS:
+            print(f"同步副本 {url}...")
+            try:
+                target = sqlite3.connect(_sqlite_path(url))
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                synced += 1
+            except Exception as e:
+                print(f"同步失败: {e}")
+        print(f"同步完成，成功 {synced}/{len(DATABASE_REPLICA_URLS)} 个副本")
+    
+    finally:
+        source.close()
+
+if __name__ == "__main__":
+    sync_replicas()
@@ -0,0 +1,58 @@
+
+"""
+测试公共夹具：整个测试会话使用临时目录中的 SQLite 数据库，应用启动时自动应用迁移
+
+环境变量在导入 backend 之前设置（配置在模块导入时读取），不会连接 DATABASE_URL 指向的数据库。
+"""
+import os
+import tempfile
+
+_tmpdir = tempfile.mkdtemp(prefix="blog-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmpdir}/test.db"
+os.environ["AUTO_MIGRATE"] = "1"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# 并发测试中线程很多，写锁的持有者可能长时间拿不到 GIL，放宽 SQLite 的锁等待时间
+os.environ.setdefault("SQLITE_BUSY_TIMEOUT", "30000")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.database import SessionLocal
+from backend.main import create_app
+from backend.models import User
+
+pytest_plugins = ["backend.pytest_plugin"]
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(create_app()) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    """管理员的 Authorization 头"""
+    client.post("/api/auth/register", json={"username": "admin", "email": "admin@example.com", "password": "admin123"})
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.username == "admin").update({User.is_admin: True})
+        db.commit()
+    finally:
+        db.close()
+    token = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def make_article(client, admin_headers):
+    """创建文章，返回文章 ID"""
+    def make(title: str = "测试文章", status: str = "已发布", **fields) -> int:
+        response = client.post(
+            "/api/articles/",
+            json={"title": title, "content": "正文", "status": status, **fields},
+            headers=admin_headers
+        )
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+    return make
@@ -0,0 +1,36 @@
+
+"""响应缓存：加载期间发生的失效使这次加载的结果不被缓存"""
+import pytest
+
+from backend.cache import MemoryCacheBackend, ResponseCache, caches
+
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache("test", 60, MemoryCacheBackend(16, 1024 * 1024))
+    yield cache
+    caches.pop("test", None)
+
+
+def loader(values, during=None):
+    def load():
+        if during:
+            during()
+        return values.pop(0)
+    return load
+
+
+@pytest.mark.parametrize("invalidated, cached", [(["list"], False), (["other"], True)])
+def test_invalidation_during_load(cache, invalidated, cached):
+    values = ["旧值", "新值"]
+    assert cache.get_or_set("k", loader(values, lambda: cache.invalidate(invalidated)), tags=["list"]) == "旧值"
+    assert cache.get_or_set("k", loader(values), tags=["list"]) == ("旧值" if cached else "新值")
+
+
+def test_clear_during_load_with_computed_tags(cache):
+    values = ["旧值", "新值"]
+    assert cache.get_or_set("k", loader(values, cache.clear), tags=lambda value: [value]) == "旧值"
+    assert cache.get_or_set("k", loader(values), tags=lambda value: [value]) == "新值"
+    assert cache.get_or_set("k", loader(values), tags=lambda value: [value]) == "新值"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
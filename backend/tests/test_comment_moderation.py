@@ -0,0 +1,93 @@
+
+"""评论审核：两个管理员同时审核同一批（或同一条）评论时，计数和统计汇总只算一次；文章不存在时 404"""
+import pytest
+
+from backend.database import SessionLocal
+from backend.schemas import CommentModeration
+from backend.services.comment_service import CommentService
+from backend.services.stats_service import SiteStatsService
+
+COMMENTS = 3
+
+
+def admin_stats(client, admin_headers) -> dict:
+    return client.get("/api/admin/stats", headers=admin_headers).json()
+
+
+def reconciled_stats(client, admin_headers) -> dict:
+    db = SessionLocal()
+    try:
+        SiteStatsService().reconcile(db)
+        db.commit()
+    finally:
+        db.close()
+    return admin_stats(client, admin_headers)
+
+
+@pytest.mark.parametrize("action", ["approve_comments", "reject_comments"])
+def test_concurrent_moderation_counts_once(client, admin_headers, make_article, monkeypatch, action):
+    article_id = make_article(f"并发审核 {action}", category="审核")
+    for i in range(COMMENTS):
+        response = client.post("/api/comments/", json={
+            "article_id": article_id, "content": f"评论 {i}",
+            "author_name": "读者", "author_email": "reader@example.com"
+        })
+        assert response.status_code == 200, response.text
+    moderation = CommentModeration(article_id=article_id)
+    service = CommentService()
+    batches = CommentService._moderation_batches
+    results = []
+
+    def racing_batches(self, moderation, db, batch_size):
+        # 第一位管理员取出本批后、改动前，第二位管理员处理完同一批
+        for rows in batches(self, moderation, db, batch_size):
+            monkeypatch.setattr(CommentService, "_moderation_batches", batches)
+            other = SessionLocal()
+            try:
+                results.append(getattr(service, action)(moderation, other))
+            finally:
+                other.close()
+            yield rows
+
+    monkeypatch.setattr(CommentService, "_moderation_batches", racing_batches)
+    db = SessionLocal()
+    try:
+        results.append(getattr(service, action)(moderation, db))
+    finally:
+        db.close()
+
+    assert sorted(result["count"] for result in results) == [0, COMMENTS]
+    assert admin_stats(client, admin_headers) == reconciled_stats(client, admin_headers)
+
+
+def test_concurrent_single_approval_counts_once(client, admin_headers, make_article, monkeypatch):
+    article_id = make_article("并发审核单条评论", category="审核")
+    comment_id = client.post("/api/comments/", json={
+        "article_id": article_id, "content": "评论", "author_name": "读者", "author_email": "reader@example.com"
+    }).json()["id"]
+    service = CommentService()
+    lookup = CommentService._comment_category
+
+    def racing_lookup(self, comment_id, db):
+        # 第一位管理员确认评论存在后、改动前，第二位管理员完成审核
+        row = lookup(self, comment_id, db)
+        monkeypatch.setattr(CommentService, "_comment_category", lookup)
+        other = SessionLocal()
+        try:
+            assert service.approve_comment(comment_id, other).is_approved
+        finally:
+            other.close()
+        return row
+
+    monkeypatch.setattr(CommentService, "_comment_category", racing_lookup)
+    db = SessionLocal()
+    try:
+        assert service.approve_comment(comment_id, db).is_approved
+    finally:
+        db.close()
+
+    assert admin_stats(client, admin_headers) == reconciled_stats(client, admin_headers)
+
+
+def test_comment_thread_of_missing_article(client):
+    assert client.get("/api/comments/article/999999").status_code == 404
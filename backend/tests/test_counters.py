@@ -0,0 +1,51 @@
+
+"""计数缓冲区：写回提交不持有缓冲区的锁；与写回重叠的读取重读数据库，不重不漏"""
+from sqlalchemy import event
+
+from backend.counters import CounterBuffer, flusher, view_counter
+from backend.database import SessionLocal
+from backend.models import Article
+
+
+def stored_views(article_id: int) -> int:
+    db = SessionLocal()
+    try:
+        return db.query(Article.views).filter(Article.id == article_id).scalar()
+    finally:
+        db.close()
+
+
+def test_commit_runs_outside_buffer_lock(make_article):
+    article_id = make_article("计数写回不持锁")
+    counter = CounterBuffer(Article.views, flusher, on_flush=view_counter.on_flush)
+    counter.incr(article_id, 5)
+    seen = {}
+
+    def after_commit(session):
+        # 提交已完成、_inflight 尚未清空：锁空闲，且读取方能看出有一批增量正在提交
+        seen["lock_free"] = counter._lock.acquire(blocking=False)
+        if seen["lock_free"]:
+            counter._lock.release()
+        seen["pending"] = counter.pending(article_id, since=counter.generation())
+
+    event.listen(SessionLocal, "after_commit", after_commit)
+    try:
+        assert counter.flush() == 5
+    finally:
+        event.remove(SessionLocal, "after_commit", after_commit)
+    assert seen == {"lock_free": True, "pending": None}
+
+
+def test_read_overlapping_flush_is_exact(make_article):
+    article_id = make_article("计数读取与写回重叠")
+    counter = CounterBuffer(Article.views, flusher, on_flush=view_counter.on_flush)
+    counter.incr(article_id, 3)
+    before = stored_views(article_id)
+
+    # 读取数据库在写回之前，加上缓冲区增量在写回之后
+    generation = counter.generation()
+    counter.incr(article_id, 2)
+    counter.flush()
+    assert counter.value(article_id, before, generation, lambda: stored_views(article_id)) == before + 5
+    assert counter.pending(article_id, since=generation) is None
+    assert counter.pending(article_id, since=counter.generation()) == 0
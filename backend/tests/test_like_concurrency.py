@@ -0,0 +1,60 @@
+
+"""并发点赞：两种计数模式下，并发请求全部写回后点赞数都应精确等于请求数"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.counters import like_counter
+from backend.database import SessionLocal
+from backend.models import Article
+from backend.services import article_service
+
+LIKES = 2000
+WORKERS = 16
+
+
+def stored_likes(article_id: int):
+    db = SessionLocal()
+    try:
+        return db.query(Article.likes).filter(Article.id == article_id).scalar()
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("mode", ["atomic", "buffered"])
+def test_parallel_likes_are_exact(client, make_article, monkeypatch, mode):
+    monkeypatch.setattr(article_service, "LIKE_COUNTER_MODE", mode)
+    article_id = make_article(f"并发点赞 {mode}")
+
+    def like(_):
+        return client.post(f"/api/articles/{article_id}/like").status_code
+
+    with ThreadPoolExecutor(WORKERS) as pool:
+        statuses = list(pool.map(like, range(LIKES)))
+
+    assert statuses.count(200) == LIKES
+    like_counter.flush()
+    assert like_counter.pending(article_id) == 0
+    assert stored_likes(article_id) == LIKES
+
+
+@pytest.mark.parametrize("mode", ["atomic", "buffered"])
+def test_like_article_with_null_likes(client, make_article, monkeypatch, mode):
+    monkeypatch.setattr(article_service, "LIKE_COUNTER_MODE", mode)
+    article_id = make_article(f"点赞数为空 {mode}")
+    db = SessionLocal()
+    try:
+        db.query(Article).filter(Article.id == article_id).update({Article.likes: None})
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.post(f"/api/articles/{article_id}/like")
+    assert response.status_code == 200
+    assert response.json()["likes"] == 1
+    like_counter.flush()
+    assert stored_likes(article_id) == 1
+
+
+def test_like_missing_article(client):
+    assert client.post("/api/articles/999999/like").status_code == 404
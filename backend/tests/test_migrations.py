@@ -0,0 +1,47 @@
+
+"""迁移：新库迁移后与模型一致；AUTO_MIGRATE 关闭时，缺少必需迁移拒绝启动，只缺可选迁移时照常启动"""
+import pytest
+from sqlalchemy import delete, inspect
+
+from backend import main, migrations
+from backend.database import Base, create_db_engine
+from backend.migrations import run_migrations, schema_migrations
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/startup.db", name="startup")
+    monkeypatch.setattr(migrations, "get_engine", lambda: engine)
+    monkeypatch.setattr(main, "AUTO_MIGRATE", False)
+    yield engine
+    engine.dispose()
+
+
+def test_startup_refuses_pending_required_migrations(engine):
+    with pytest.raises(RuntimeError, match="python -m backend.migrations"):
+        main.check_migrations()
+
+
+def test_startup_allows_pending_optional_migrations(engine):
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(delete(schema_migrations).where(schema_migrations.c.version == 2))
+
+    main.check_migrations()
+    assert migrations.pending_migrations() == [2]
+    assert migrations.pending_migrations(required_only=True) == []
+
+
+def test_fresh_database_matches_models(tmp_path):
+    """新库依次执行全部迁移后，表、列和索引与模型一致（模型变更必须附带迁移）"""
+    engine = create_db_engine(f"sqlite:///{tmp_path}/fresh.db", name="fresh")
+    try:
+        run_migrations(engine)
+        inspector = inspect(engine)
+        for table in Base.metadata.sorted_tables:
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            assert columns == set(table.c.keys()), table.name
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            assert {index.name for index in table.indexes} <= indexes, table.name
+    finally:
+        engine.dispose()
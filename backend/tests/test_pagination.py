@@ -0,0 +1,25 @@
+
+"""游标分页：检索索引可用与不可用时，带 search 的列表都能翻页到最后"""
+import pytest
+
+from backend.search import search_index
+
+
+def collect_pages(client, search: str) -> list:
+    ids, cursor = [], ""
+    while cursor is not None:
+        response = client.get("/api/articles/", params={"search": search, "limit": 1, "cursor": cursor})
+        assert response.status_code == 200, response.text
+        page = response.json()
+        ids.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+    return ids
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_search_cursor_pages(client, make_article, monkeypatch, enabled):
+    word = f"翻页{int(enabled)}"
+    created = {make_article(f"{word}测试 {i}") for i in range(3)}
+    monkeypatch.setattr(search_index, "enabled", enabled)
+    ids = collect_pages(client, word)
+    assert sorted(ids) == sorted(created)
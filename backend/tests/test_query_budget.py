@@ -0,0 +1,56 @@
+
+"""热点接口的 SQL 查询预算：查询数不随文章、标签、评论的数量增长（没有 N+1）"""
+import pytest
+
+from backend.cache import article_list_cache
+
+ARTICLES = 8
+
+
+@pytest.fixture(scope="module")
+def budget_articles(client, admin_headers):
+    ids = []
+    for i in range(ARTICLES):
+        response = client.post(
+            "/api/articles/",
+            json={"title": f"查询预算 {i}", "content": "正文", "status": "已发布",
+                  "category": "预算", "tags": ["预算", f"预算{i}"]},
+            headers=admin_headers
+        )
+        ids.append(response.json()["id"])
+    for i in range(ARTICLES):
+        comment = client.post("/api/comments/", json={
+            "article_id": ids[0], "content": f"评论 {i}", "author_name": "读者", "author_email": "reader@example.com"
+        }).json()
+        client.put(f"/api/comments/{comment['id']}/approve", headers=admin_headers)
+        client.post("/api/comments/", json={
+            "article_id": ids[0], "parent_id": comment["id"], "content": f"回复 {i}",
+            "author_name": "读者", "author_email": "reader@example.com"
+        })
+    return ids
+
+
+@pytest.mark.parametrize("params", [{}, {"limit": 20, "cursor": ""}])
+def test_article_list_budget(client, budget_articles, query_budget, params):
+    article_list_cache.clear()
+    with query_budget(3):
+        response = client.get("/api/articles/", params=params)
+    assert response.status_code == 200
+
+
+def test_article_detail_budget(client, budget_articles, query_budget):
+    with query_budget(2):
+        response = client.get(f"/api/articles/{budget_articles[0]}")
+    assert len(response.json()["tags"]) == 2
+
+
+def test_comment_thread_budget(client, budget_articles, query_budget):
+    with query_budget(2):
+        response = client.get(f"/api/comments/article/{budget_articles[0]}")
+    assert response.status_code == 200
+
+
+@pytest.mark.query_budget(1)
+def test_admin_stats_budget(client, admin_headers, budget_articles):
+    response = client.get("/api/admin/stats", headers=admin_headers)
+    assert response.json()["published_articles"] >= ARTICLES
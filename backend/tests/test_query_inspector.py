@@ -0,0 +1,46 @@
+
+"""查询检查：语句归一化、N+1 判定，以及 capture_queries 不计入后台线程的查询"""
+from threading import Thread
+
+from sqlalchemy import text
+
+from backend.database import get_engine
+from backend.query_inspector import QueryInspection, capture_queries, normalize_statement
+
+
+def test_normalize_statement_replaces_literals_and_in_lists():
+    assert normalize_statement(
+        "SELECT * FROM articles\n  WHERE id = 42 AND title = 'it''s' AND views > :views_1"
+    ) == "SELECT * FROM articles WHERE id = ? AND title = ? AND views > ?"
+    assert normalize_statement("SELECT * FROM tags WHERE id IN (?, ?, ?)") == \
+        normalize_statement("SELECT * FROM tags WHERE id IN (%(id_1)s)") == \
+        "SELECT * FROM tags WHERE id IN (...)"
+
+
+def test_normalize_statement_keeps_identifiers_with_digits():
+    assert normalize_statement("SELECT articles_1.id FROM articles AS articles_1 LIMIT 10") == \
+        "SELECT articles_1.id FROM articles AS articles_1 LIMIT ?"
+
+
+def test_repeated_reports_shapes_at_threshold():
+    inspection = QueryInspection()
+    for article_id in range(5):
+        inspection.add(f"SELECT * FROM tags WHERE article_id = {article_id}", 0.001)
+    inspection.add("SELECT * FROM articles", 0.001)
+    assert inspection.count == 6
+    assert inspection.repeated(5) == [("SELECT * FROM tags WHERE article_id = ?", 5)]
+    assert inspection.repeated(6) == []
+
+
+def test_capture_ignores_background_threads(client):
+    def query():
+        with get_engine().connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    with capture_queries() as inspection:
+        worker = Thread(target=query)
+        worker.start()
+        worker.join()
+        assert inspection.count == 0
+        query()
+    assert inspection.count == 1
@@ -0,0 +1,65 @@
+
+"""读写分离：写入后，同一用户的读请求在窗口内走主库，其他用户的读请求仍走副本
+
+副本是另一个空的 SQLite 文件：读到主库中刚写入的数据说明查询发往了主库。
+"""
+import pytest
+from starlette.datastructures import State
+
+from backend import database
+from backend.database import ReplicaRouter, SessionLocal, create_db_engine
+from backend.migrations import run_migrations
+from backend.models import Tag
+
+
+@pytest.fixture
+def replica_router(tmp_path, monkeypatch):
+    replica = create_db_engine(f"sqlite:///{tmp_path}/replica.db", name="replica0")
+    run_migrations(replica)
+    router = ReplicaRouter([replica], "round_robin", sticky_seconds=60, retry_seconds=30)
+    monkeypatch.setattr(database, "_replica_router", router)
+    yield router
+    replica.dispose()
+
+
+def request_state(user_id=None, is_admin=False) -> State:
+    state = State()
+    if user_id is not None:
+        state.user_id = user_id
+        state.is_admin = is_admin
+    return state
+
+
+def read_tag(state: State, name: str):
+    db = SessionLocal(info={"replica_reads": True, "request_state": state})
+    try:
+        return db.query(Tag.id).filter(Tag.name == name).scalar()
+    finally:
+        db.close()
+
+
+def test_user_reads_own_write_from_primary(client, replica_router):
+    writer = request_state(user_id=1001)
+    db = SessionLocal(info={"request_state": writer})
+    try:
+        db.add(Tag(name="读写分离"))
+        db.commit()
+    finally:
+        db.close()
+
+    # 同一用户（另一个请求、另一个会话）读主库；其他用户和匿名请求仍读副本
+    assert read_tag(request_state(user_id=1001), "读写分离") is not None
+    assert read_tag(request_state(user_id=1002), "读写分离") is None
+    assert read_tag(request_state(), "读写分离") is None
+    assert replica_router.stats()["replica_sessions"] == 2
+
+
+def test_read_route_sees_authenticated_user(client, admin_headers, make_article, replica_router):
+    make_article("读写分离接口", category="副本测试")
+    # 只保留管理员本人的窗口，确认 get_read_db 的会话能认出当前用户
+    replica_router._sticky_until.pop(None, None)
+    assert replica_router._sticky_until
+
+    categories = client.get("/api/admin/stats/categories", headers=admin_headers).json()
+    assert "副本测试" in [row["category"] for row in categories]
+    assert replica_router.stats()["replica_sessions"] == 0
@@ -0,0 +1,23 @@
+
+"""全文检索：中文二元切分与单字前缀查询"""
+import pytest
+
+from backend.search import query_phrases, tokenize
+
+
+def test_tokenize_appends_last_cjk_character():
+    assert tokenize("代码之美 Hello") == ["代码", "码之", "之美", "美", "hello"]
+    assert query_phrases("代码之美 Hello") == [["代码", "码之", "之美"], ["hello"]]
+
+
+@pytest.mark.parametrize("q", ["代码之美", "代码", "码", "美", "之美 艺术"])
+def test_search_matches_cjk_words_and_single_characters(client, make_article, q):
+    article_id = make_article("代码之美：编程中的艺术哲学")
+    results = client.get("/api/articles/search", params={"q": q, "limit": 100}).json()
+    assert article_id in [result["id"] for result in results]
+
+
+def test_search_skips_unrelated_single_character(client, make_article):
+    article_id = make_article("代码之美：编程中的艺术哲学")
+    results = client.get("/api/articles/search", params={"q": "猫", "limit": 100}).json()
+    assert article_id not in [result["id"] for result in results]
@@ -0,0 +1,59 @@
+
+"""统计汇总：各写路径增量维护的 site_stats 与从头重算的结果一致"""
+from backend.counters import like_counter, view_counter
+from backend.database import SessionLocal
+from backend.models import Comment
+from backend.services.stats_service import SiteStatsService
+
+
+def stats(client, admin_headers) -> dict:
+    view_counter.flush()
+    like_counter.flush()
+    response = client.get("/api/admin/stats", headers=admin_headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def reconcile():
+    db = SessionLocal()
+    try:
+        SiteStatsService().reconcile(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_incremental_stats_match_reconcile(client, admin_headers, make_article):
+    published = make_article("统计 已发布", category="技术")
+    draft = make_article("统计 草稿", status="草稿", category="技术")
+    client.get(f"/api/articles/{published}")
+    client.post(f"/api/articles/{published}/like")
+    comment = client.post("/api/comments/", json={
+        "article_id": published, "content": "好文", "author_name": "读者", "author_email": "reader@example.com"
+    }).json()
+    client.put(f"/api/comments/{comment['id']}/approve", headers=admin_headers)
+    client.put(f"/api/articles/{draft}", json={"category": "生活"}, headers=admin_headers)
+    client.delete(f"/api/articles/{published}", headers=admin_headers)
+
+    incremental = stats(client, admin_headers)
+    reconcile()
+    assert stats(client, admin_headers) == incremental
+
+
+def test_delete_article_removes_its_comments(client, admin_headers, make_article):
+    article_id = make_article("删除带评论的文章", category="删除")
+    comment = client.post("/api/comments/", json={
+        "article_id": article_id, "content": "待审核", "author_name": "读者", "author_email": "reader@example.com"
+    }).json()
+
+    assert client.delete(f"/api/articles/{article_id}", headers=admin_headers).status_code == 200
+    db = SessionLocal()
+    try:
+        assert db.query(Comment).filter(Comment.article_id == article_id).count() == 0
+    finally:
+        db.close()
+    assert client.put(f"/api/comments/{comment['id']}/approve", headers=admin_headers).status_code == 404
+
+    incremental = stats(client, admin_headers)
+    reconcile()
+    assert stats(client, admin_headers) == incremental
@@ -0,0 +1,35 @@
+
+"""标签：并发创建引用同一个新标签的文章时不会因唯一约束冲突而失败"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import pytest
+
+from backend.database import SessionLocal
+from backend.models import Tag
+
+WORKERS = 8
+
+
+@pytest.mark.parametrize("round_", range(5))
+def test_concurrent_articles_share_new_tag(client, admin_headers, round_):
+    name = f"并发标签{round_}"
+    barrier = Barrier(WORKERS)
+
+    def create(i):
+        barrier.wait()
+        return client.post(
+            "/api/articles/",
+            json={"title": f"{name} {i}", "content": "正文", "status": "已发布", "tags": [name, "共享"]},
+            headers=admin_headers
+        ).status_code
+
+    with ThreadPoolExecutor(WORKERS) as pool:
+        statuses = list(pool.map(create, range(WORKERS)))
+
+    assert statuses == [200] * WORKERS
+    db = SessionLocal()
+    try:
+        assert db.query(Tag).filter(Tag.name == name).count() == 1
+    finally:
+        db.close()
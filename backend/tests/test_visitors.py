@@ -0,0 +1,63 @@
+
+"""独立访客草图：文章删除时丢弃缓冲区中和正在写回的草图，写回中途删除的文章不再写入"""
+from datetime import date
+
+from sqlalchemy import event
+
+from backend.database import SessionLocal
+from backend.models import ArticleVisitorSketch
+from backend.visitors import VisitorSketchBuffer
+
+DAY = date(2026, 1, 1)
+
+
+def test_discard_clears_pending_and_inflight(monkeypatch):
+    buffer = VisitorSketchBuffer(precision=4)
+    buffer.add(1, 101, DAY)
+    buffer.add(2, 202, DAY)
+    seen = {}
+
+    def write(batch):
+        # 写回进行中文章 1 被删除
+        buffer.discard(1)
+        seen["article"] = buffer.pending(1, DAY, DAY)
+        seen["other"] = buffer.pending(2, DAY, DAY)
+        seen["batch"] = set(batch)
+
+    monkeypatch.setattr(buffer, "_write", write)
+    monkeypatch.setattr(buffer, "_prune", lambda: None)
+    assert buffer.flush() == 2
+    assert seen["article"] == {}
+    assert list(seen["other"]) == [DAY]
+    assert seen["batch"] == {(1, DAY), (2, DAY)}
+
+
+def test_discard_during_write_skips_article(make_article):
+    article_id = make_article("写回中删除的文章")
+    other_id = make_article("写回中保留的文章")
+    buffer = VisitorSketchBuffer(precision=4, retention_days=0)
+    buffer.add(article_id, 101, DAY)
+    buffer.add(other_id, 202, DAY)
+
+    def discard_after_alive_check(orm_execute_state):
+        # 本批交给 _write 并查过文章是否存在之后，文章被删除
+        event.remove(SessionLocal, "do_orm_execute", discard_after_alive_check)
+        result = orm_execute_state.invoke_statement()
+        buffer.discard(article_id)
+        return result
+
+    event.listen(SessionLocal, "do_orm_execute", discard_after_alive_check)
+    try:
+        buffer.flush()
+    finally:
+        if event.contains(SessionLocal, "do_orm_execute", discard_after_alive_check):
+            event.remove(SessionLocal, "do_orm_execute", discard_after_alive_check)
+
+    db = SessionLocal()
+    try:
+        stored = {row.article_id for row in db.query(ArticleVisitorSketch.article_id).filter(ArticleVisitorSketch.day == DAY)}
+    finally:
+        db.close()
+    assert article_id not in stored
+    assert other_id in stored
+    assert buffer.pending(article_id, DAY, DAY) == {}
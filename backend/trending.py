@@ -0,0 +1,209 @@
+
+"""
+热门文章
+
+- 前向衰减：事件（浏览、点赞）在时刻 t 的贡献记为 w·e^(λ(t - L))，L 为固定的基准时刻，
+  λ = ln2 / 半衰期。文章的分数只增不减，且所有文章按同一因子衰减，所以排序不随时间变化，
+  来了新事件只需更新这一篇文章，不用重算其他文章。分数保存为对数形式，不会溢出
+- 进程内用最小堆维护前 K 篇，读取热门列表只需 O(K)
+- 计数刷新线程每 TRENDING_SNAPSHOT_INTERVAL 秒把本进程的增量合并进 article_trending 表，
+  再从表中取回前 K 篇，多个 worker 的热度由此汇总；进程重启后也从快照恢复
+"""
+import heapq
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, desc, select
+from sqlalchemy.exc import IntegrityError
+
+from .counters import flusher
+from .database import SessionLocal
+from .models import Article, ArticleTrending
+
+logger = logging.getLogger(__name__)
+
+# 配置
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24"))
+TRENDING_TOP_K = int(os.getenv("TRENDING_TOP_K", "100"))
+TRENDING_VIEW_WEIGHT = float(os.getenv("TRENDING_VIEW_WEIGHT", "1"))
+TRENDING_LIKE_WEIGHT = float(os.getenv("TRENDING_LIKE_WEIGHT", "5"))
+# 快照（写回增量并从数据库刷新前 K 篇）的间隔（秒）
+TRENDING_SNAPSHOT_INTERVAL = float(os.getenv("TRENDING_SNAPSHOT_INTERVAL", "60"))
+# 衰减后低于该值的快照行在写回时删除
+TRENDING_MIN_SCORE = float(os.getenv("TRENDING_MIN_SCORE", "0.01"))
+
+# 前向衰减的基准时刻（2024-01-01 UTC）
+LANDMARK = 1704067200.0
+
+
+def _log_add(a: Optional[float], b: float) -> float:
+    """log(e^a + e^b)"""
+    if a is None:
+        return b
+    high, low = (a, b) if a >= b else (b, a)
+    return high + math.log1p(math.exp(low - high))
+
+
+class TrendingTracker:
+    """前向衰减热度和前 K 篇的最小堆"""
+
+    def __init__(self, top_k: int = TRENDING_TOP_K, half_life_hours: float = TRENDING_HALF_LIFE_HOURS):
+        self.top_k = top_k
+        self.decay = math.log(2) / (half_life_hours * 3600)
+        self._scores: Dict[int, float] = {}   # 已知的对数分数：快照 + 本进程之后的增量
+        self._pending: Dict[int, float] = {}  # 本进程尚未写回的对数增量
+        self._inflight: Dict[int, float] = {}
+        self._top: Dict[int, float] = {}
+        self._heap: List[Tuple[float, int]] = []  # (分数, 文章)，分数过时的条目在弹出时跳过
+        self._ranked: Optional[List[Tuple[int, float]]] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def _log_term(self, weight: float, at: float) -> float:
+        return math.log(weight) + self.decay * (at - LANDMARK)
+
+    def record(self, article_id: int, weight: float, at: Optional[float] = None):
+        """记录一次事件（浏览、点赞）"""
+        if weight <= 0:
+            return
+        term = self._log_term(weight, at if at is not None else time.time())
+        with self._lock:
+            self._pending[article_id] = _log_add(self._pending.get(article_id), term)
+            score = self._scores[article_id] = _log_add(self._scores.get(article_id), term)
+            self._offer(article_id, score)
+
+    def _offer(self, article_id: int, score: float):
+        if article_id not in self._top and len(self._top) >= self.top_k:
+            lowest, lowest_id = self._peek_lowest()
+            if score <= lowest:
+                return
+            heapq.heappop(self._heap)
+            del self._top[lowest_id]
+        self._top[article_id] = score
+        heapq.heappush(self._heap, (score, article_id))
+        self._ranked = None
+        if len(self._heap) > 4 * self.top_k:
+            self._rebuild_heap()
+
+    def _peek_lowest(self) -> Tuple[float, int]:
+        while self._top.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0]
+
+    def _rebuild_heap(self):
+        self._heap = [(score, article_id) for article_id, score in self._top.items()]
+        heapq.heapify(self._heap)
+
+    def _rebuild_top(self):
+        self._top = dict(heapq.nlargest(self.top_k, self._scores.items(), key=lambda item: item[1]))
+        self._rebuild_heap()
+        self._ranked = None
+
+    def top(self, limit: int) -> List[Tuple[int, float]]:
+        """当前最热的 limit 篇文章 [(文章 ID, 衰减到现在的分数)]"""
+        if not self._loaded:
+            self.refresh()
+        now = time.time()
+        with self._lock:
+            if self._ranked is None:
+                self._ranked = sorted(self._top.items(), key=lambda item: item[1], reverse=True)
+            ranked = self._ranked[:limit]
+        offset = self.decay * (now - LANDMARK)
+        return [(article_id, math.exp(score - offset)) for article_id, score in ranked]
+
+    def remove(self, article_id: int):
+        """移出热门（文章下线或删除）"""
+        with self._lock:
+            self._scores.pop(article_id, None)
+            self._pending.pop(article_id, None)
+            if self._top.pop(article_id, None) is not None:
+                self._rebuild_top()
+
+    def refresh(self):
+        """从快照表取回前 K 篇，与本进程尚未写回的增量合并"""
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(ArticleTrending.article_id, ArticleTrending.score)
+                .order_by(desc(ArticleTrending.score)).limit(self.top_k)
+            ).all()
+        finally:
+            db.close()
+        with self._lock:
+            self._scores = {article_id: score for article_id, score in rows}
+            # 正在写回的增量可能已经提交，只补给快照里还没有的文章；尚未写回的增量都要加上
+            for article_id, delta in self._inflight.items():
+                self._scores.setdefault(article_id, delta)
+            for article_id, delta in self._pending.items():
+                self._scores[article_id] = _log_add(self._scores.get(article_id), delta)
+            self._rebuild_top()
+            self._loaded = True
+
+    def flush(self) -> int:
+        """快照：把增量合并进 article_trending，删除已冷却的行，再刷新前 K 篇；返回写回的文章数"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+            try:
+                self._write(batch)
+            except IntegrityError:
+                # 其他 worker 同时插入了同一篇文章：并回增量，下次快照时累加到它写入的行上
+                logger.info("热度快照写回冲突，下次快照重试")
+                self._restore(batch)
+                return 0
+            except Exception:
+                self._restore(batch)
+                raise
+            finally:
+                with self._lock:
+                    self._inflight = {}
+            self.refresh()
+            return len(batch)
+
+    def _restore(self, batch: Dict[int, float]):
+        with self._lock:
+            for article_id, delta in batch.items():
+                self._pending[article_id] = _log_add(self._pending.get(article_id), delta)
+
+    def _write(self, batch: Dict[int, float]):
+        table = ArticleTrending.__table__
+        db = SessionLocal()
+        try:
+            if batch:
+                # 已删除文章的增量直接丢弃；锁住要更新的行，多个 worker 同时写回时不会丢失增量
+                alive = set(db.execute(select(Article.id).where(Article.id.in_(batch))).scalars())
+                existing = dict(db.execute(
+                    select(table.c.article_id, table.c.score).where(table.c.article_id.in_(alive)).with_for_update()
+                ).all())
+                now = datetime.utcnow()
+                updates = [
+                    {"_article_id": article_id, "score": _log_add(existing[article_id], delta), "updated_at": now}
+                    for article_id, delta in batch.items() if article_id in existing
+                ]
+                inserts = [
+                    {"article_id": article_id, "score": delta, "updated_at": now}
+                    for article_id, delta in batch.items() if article_id in alive and article_id not in existing
+                ]
+                if updates:
+                    db.execute(table.update().where(table.c.article_id == bindparam("_article_id")), updates)
+                if inserts:
+                    db.execute(table.insert(), inserts)
+            floor = self._log_term(TRENDING_MIN_SCORE, time.time())
+            db.execute(delete(ArticleTrending).where(ArticleTrending.score < floor))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+# 全局实例
+trending_tracker = flusher.register(TrendingTracker(), interval=TRENDING_SNAPSHOT_INTERVAL)
@@ -0,0 +1,207 @@
+
+"""
+文章独立访客
+
+- 访客指纹：客户端 IP、User-Agent、Accept-Language 的带密钥 64 位哈希，不保存原始信息；明显的爬虫不计入
+- VisitorSketchBuffer：每篇文章每天一个 HyperLogLog 草图，先在内存中更新，由计数刷新线程
+  定期与数据库中的草图合并后写回（按寄存器取最大值，多个 worker 同时写回也不会重复计数）
+- 每个草图最多 2^UNIQUE_VISITORS_PRECISION 字节，与访客数量无关
+"""
+import logging
+import os
+import re
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Set, Tuple
+
+from fastapi import Request
+from sqlalchemy import and_, bindparam, delete, select
+from sqlalchemy.exc import IntegrityError
+
+from .counters import flusher
+from .database import SessionLocal
+from .models import Article, ArticleVisitorSketch
+from .sketches import HyperLogLog, hash64
+
+logger = logging.getLogger(__name__)
+
+# 配置
+UNIQUE_VISITORS_ENABLED = os.getenv("UNIQUE_VISITORS_ENABLED", "1") == "1"
+# 寄存器数为 2^precision：12 时每个草图 4 KiB，标准误差约 1.6%
+UNIQUE_VISITORS_PRECISION = int(os.getenv("UNIQUE_VISITORS_PRECISION", "12"))
+# 草图保留天数，过期的在写回时删除；设为 0 不清理
+UNIQUE_VISITORS_RETENTION_DAYS = int(os.getenv("UNIQUE_VISITORS_RETENTION_DAYS", "90"))
+# 指纹哈希的密钥，避免通过枚举 IP 反查；未设置时使用 SECRET_KEY
+VISITOR_FINGERPRINT_SALT = os.getenv(
+    "VISITOR_FINGERPRINT_SALT", os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
+)
+
+_BOT_RE = re.compile(r"bot|crawl|spider|slurp|headless|preview", re.IGNORECASE)
+_SALT = VISITOR_FINGERPRINT_SALT.encode()[:64]
+
+
+def visitor_fingerprint(request: Request) -> Optional[int]:
+    """访客的 64 位指纹；爬虫返回 None（只计浏览量，不计独立访客）"""
+    user_agent = request.headers.get("user-agent", "")
+    if _BOT_RE.search(user_agent):
+        return None
+    host = request.client.host if request.client else ""
+    raw = "\n".join((host, user_agent, request.headers.get("accept-language", "")))
+    return hash64(raw.encode(), _SALT)
+
+
+def utc_today() -> date:
+    return datetime.utcnow().date()
+
+
+class VisitorSketchBuffer:
+    """按 (文章, 日期) 缓冲的 HyperLogLog 草图，flush 时与数据库中的草图合并"""
+
+    def __init__(self, precision: int = UNIQUE_VISITORS_PRECISION, retention_days: int = UNIQUE_VISITORS_RETENTION_DAYS):
+        self.precision = precision
+        self.retention_days = retention_days
+        self._pending: Dict[Tuple[int, date], HyperLogLog] = {}
+        self._inflight: Dict[Tuple[int, date], HyperLogLog] = {}
+        # 本批交给 _write 之后被丢弃的文章：写回前再检查一次，不写入它们的草图
+        self._discarded: Set[int] = set()
+        self._pruned_on: Optional[date] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    @property
+    def sketch_bytes(self) -> int:
+        """一个草图（稠密形式）占用的字节数"""
+        return 1 << self.precision
+
+    def add(self, article_id: int, fingerprint: int, day: Optional[date] = None):
+        """记录一次访问"""
+        key = (article_id, day or utc_today())
+        with self._lock:
+            sketch = self._pending.get(key)
+            if sketch is None:
+                sketch = self._pending[key] = HyperLogLog(self.precision)
+            sketch.add(fingerprint)
+
+    def pending(self, article_id: int, start: date, end: date) -> Dict[date, HyperLogLog]:
+        """某篇文章在 [start, end] 内尚未写回的草图（副本）"""
+        result: Dict[date, HyperLogLog] = {}
+        with self._lock:
+            for buffer in (self._inflight, self._pending):
+                for (key_article, day), sketch in buffer.items():
+                    if key_article == article_id and start <= day <= end:
+                        if day in result:
+                            result[day].merge(sketch)
+                        else:
+                            result[day] = sketch.copy()
+        return result
+
+    def discard(self, article_id: int):
+        """丢弃某篇文章尚未写回的草图（文章被删除时）"""
+        with self._lock:
+            for key in [key for key in self._pending if key[0] == article_id]:
+                del self._pending[key]
+            # 正在写回的批次由 flush 持有：pending() 不再返回它，_write 和 _restore 跳过它
+            self._inflight = {key: sketch for key, sketch in self._inflight.items() if key[0] != article_id}
+            self._discarded.add(article_id)
+
+    def flush(self) -> int:
+        """把缓冲的草图与数据库中的合并后写回，返回写回的草图数"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+                self._discarded = set()
+            try:
+                if batch:
+                    self._write(batch)
+                self._prune()
+            except IntegrityError:
+                # 其他 worker 同时插入了同一行：并回缓冲区，下次刷新时与它写入的草图合并
+                logger.info("独立访客草图写回冲突，下次刷新重试")
+                self._restore(batch)
+                return 0
+            except Exception:
+                self._restore(batch)
+                raise
+            finally:
+                with self._lock:
+                    self._inflight = {}
+            return len(batch)
+
+    def _restore(self, batch: Dict[Tuple[int, date], HyperLogLog]):
+        """写回失败时把草图并回缓冲区（合并是幂等的）"""
+        with self._lock:
+            for key, sketch in batch.items():
+                if key[0] in self._discarded:
+                    continue
+                if key in self._pending:
+                    self._pending[key].merge(sketch)
+                else:
+                    self._pending[key] = sketch
+
+    def _write(self, batch: Dict[Tuple[int, date], HyperLogLog]):
+        table = ArticleVisitorSketch.__table__
+        article_ids = {article_id for article_id, _ in batch}
+        days = {day for _, day in batch}
+        db = SessionLocal()
+        try:
+            # 已删除文章的草图直接丢弃
+            alive = set(db.execute(select(Article.id).where(Article.id.in_(article_ids))).scalars())
+            # 写回期间已 discard 的文章不再写入；查询之后、discard 之前才删除的文章由外键约束拦下，
+            # 并回缓冲区后下次刷新时被上面的查询过滤
+            with self._lock:
+                alive -= self._discarded
+            # 锁住要合并的行：多个 worker 同时写回同一天的草图时，后者等前者提交后再读取合并
+            existing = {
+                (row.article_id, row.day): row.sketch
+                for row in db.execute(
+                    select(table.c.article_id, table.c.day, table.c.sketch)
+                    .where(table.c.article_id.in_(article_ids), table.c.day.in_(days))
+                    .with_for_update()
+                )
+            }
+            now = datetime.utcnow()
+            updates, inserts = [], []
+            for (article_id, day), sketch in batch.items():
+                if article_id not in alive:
+                    continue
+                stored = existing.get((article_id, day))
+                if stored is not None:
+                    merged = HyperLogLog.from_bytes(stored).merge(sketch)
+                    updates.append({"_article_id": article_id, "_day": day, "sketch": merged.to_bytes(), "updated_at": now})
+                else:
+                    inserts.append({"article_id": article_id, "day": day, "sketch": sketch.to_bytes(), "updated_at": now})
+            if updates:
+                db.execute(
+                    table.update().where(and_(
+                        table.c.article_id == bindparam("_article_id"), table.c.day == bindparam("_day")
+                    )),
+                    updates,
+                )
+            if inserts:
+                db.execute(table.insert(), inserts)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _prune(self):
+        """每天删除一次超过保留期的草图"""
+        today = utc_today()
+        if self.retention_days <= 0 or self._pruned_on == today:
+            return
+        db = SessionLocal()
+        try:
+            db.execute(delete(ArticleVisitorSketch).where(
+                ArticleVisitorSketch.day < today - timedelta(days=self.retention_days)
+            ))
+            db.commit()
+        finally:
+            db.close()
+        self._pruned_on = today
+
+
+# 全局实例
+visitor_sketches = flusher.register(VisitorSketchBuffer())